@@ -1,8 +1,24 @@
 # Main Flask Application
+import click
 from flask import Flask, jsonify
 from flask_cors import CORS
-from decimal import Decimal
-import json
+
+from models.database import cache_stats, pool_stats, replica_stats
+from models.rollups import find_rollup_drift, rebuild_rollups
+from models.customer_stats import evaluate_vip_tiers, recompute_customer_stats
+from models.migrations import migrate
+from models.explain_check import find_full_scans
+from models.report_scheduler import report_scheduler
+from models.customer_search import customer_search_index
+from models.events import event_bus
+from routes.pagination import PaginationError
+from routes.caching import apply_cache_policy, init_report_scheduler
+from routes.metrics import metrics_bp, init_instrumentation
+from routes.read_your_writes import init_read_your_writes
+from routes.json_provider import FastJSONProvider
+from routes.compression import init_compression
+from routes.static_assets import asset_store, init_static_assets
+from config import CACHE_CONTROL_POLICIES
 
 # Import Routes
 from routes.menu import menu_bp
@@ -11,18 +27,24 @@ from routes.reservations import reservations_bp
 from routes.orders import orders_bp
 from routes.reports import reports_bp
 from routes.feedback import feedback_bp
+from routes.sessions import sessions_bp
+from routes.dashboard import dashboard_bp
+from routes.images import images_bp
+from routes.stream import stream_bp
 
 app = Flask(__name__)
-CORS(app)  # Frontend'den API çağrıları için
+CORS(app, expose_headers=['X-Next-Cursor', 'Link', 'ETag', 'X-Query-Count', 'Server-Timing',
+                          'Age', 'X-Report-Generated-At', 'X-Report-Stale',
+                          'X-Report-Refresh-Interval', 'X-Report-Compute-Ms'])  # Frontend'den API çağrıları için
 
-# JSON Encoder - Decimal'ı float'a çevir
-class DecimalEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            return float(obj)
-        return super().default(obj)
+# JSON Provider - orjson (varsa), Decimal/datetime/date/timedelta desteği
+app.json = FastJSONProvider(app)
 
-app.json_encoder = DecimalEncoder
+# Blueprint başına Cache-Control (config.CACHE_CONTROL_POLICIES)
+for bp in (menu_bp, customers_bp, reservations_bp, orders_bp, reports_bp, feedback_bp, sessions_bp,
+           dashboard_bp):
+    if bp.name in CACHE_CONTROL_POLICIES:
+        apply_cache_policy(bp, CACHE_CONTROL_POLICIES[bp.name])
 
 # --- ROUTES REGISTER ---
 app.register_blueprint(menu_bp)
@@ -31,6 +53,24 @@ app.register_blueprint(reservations_bp)
 app.register_blueprint(orders_bp)
 app.register_blueprint(reports_bp)
 app.register_blueprint(feedback_bp)
+app.register_blueprint(sessions_bp)
+app.register_blueprint(dashboard_bp)
+app.register_blueprint(images_bp)
+app.register_blueprint(stream_bp)
+app.register_blueprint(metrics_bp)
+
+# İstek başına SQL ölçümleri (X-Query-Count, slow query log, /metrics)
+init_instrumentation(app)
+
+# Okumalar replica'lara; yazan istemcinin okumaları kısa süre primary'ye (DB_REPLICAS)
+init_read_your_writes(app)
+
+# Ağır raporların arka planda yenilenmesi (ilk istekte başlar)
+init_report_scheduler(app)
+
+# gzip/brotli yanıt sıkıştırma + frontend (/app, açılışta bir kez sıkıştırılır)
+init_compression(app)
+init_static_assets(app)
 
 # --- HOME ENDPOINT ---
 @app.route('/')
@@ -44,20 +84,90 @@ def home():
             "reservations": "/api/reservations",
             "orders": "/api/orders",
             "reports": "/api/reports",
-            "feedback": "/api/feedback"
+            "feedback": "/api/feedback",
+            "sessions": "/api/sessions",
+            "dashboard": "/api/dashboard",
+            "images": "/api/images",
+            "stream": "/api/stream",
+            "metrics": "/metrics",
+            "frontend": "/app/"
         }
     })
 
 @app.route('/health', methods=['GET'])
 def health_check():
-    """API sağlık kontrolü"""
-    return jsonify({"status": "healthy"}), 200
+    """API sağlık kontrolü + bağlantı havuzu, replica, query cache, rapor snapshot ve arama index istatistikleri"""
+    return jsonify({"status": "healthy", "pool": pool_stats(), "replicas": replica_stats(),
+                    "query_cache": cache_stats(), "reports": report_scheduler.stats(),
+                    "static_assets": asset_store.stats(),
+                    "customer_search": customer_search_index.stats(),
+                    "stream": event_bus.stats()}), 200
+
+# --- CLI COMMANDS ---
+@app.cli.command('rebuild-rollups')
+def rebuild_rollups_command():
+    """Rapor özet tablolarını (ROLLUP_*) tüm geçmişten yeniden hesapla"""
+    rebuild_rollups()
+    print("Rollup tabloları yeniden oluşturuldu.")
+
+@app.cli.command('check-rollups')
+def check_rollups_command():
+    """Ciro özetlerini (gün, masa, personel) canlı verilerle karşılaştır; fark varsa hata ver"""
+    drift = find_rollup_drift()
+    for table, key, expected, actual in drift:
+        print(f"DRIFT {table} [{key}] beklenen={expected} özet={actual}")
+    if drift:
+        raise SystemExit(1)
+    print("Rollup kontrolü başarılı: ciro özetleri güncel.")
+
+@app.cli.command('recompute-customer-stats')
+@click.option('--chunk-size', default=None, type=int, help='Transaction başına müşteri (CUSTOMER_STATS_CHUNK_SIZE)')
+@click.option('--restart', is_flag=True, help='Checkpoint\'i yok say, baştan başla')
+def recompute_customer_stats_command(chunk_size, restart):
+    """Müşteri LTV / ziyaret istatistiklerini session'lardan yeniden hesapla (kaldığı yerden devam eder)"""
+    kwargs = {'chunk_size': chunk_size} if chunk_size else {}
+    processed = recompute_customer_stats(restart=restart, **kwargs)
+    print(f"{processed} müşterinin istatistikleri yeniden hesaplandı.")
+
+@app.cli.command('evaluate-vip')
+@click.option('--threshold', default=None, type=float, help='LTV eşiği (varsayılan VIP_LTV_THRESHOLD)')
+@click.option('--demote', is_flag=True, help='Eşiğin altındaki VIP\'leri de düşür')
+def evaluate_vip_command(threshold, demote):
+    """VIP eşiğini tüm müşterilere uygula (eşik değiştikten sonra)"""
+    kwargs = {'threshold': threshold} if threshold is not None else {}
+    promoted, demoted = evaluate_vip_tiers(demote=demote, **kwargs)
+    print(f"VIP yapılan: {promoted}, VIP'liği kaldırılan: {demoted}")
+
+@app.cli.command('migrate')
+def migrate_command():
+    """database/migrations altındaki uygulanmamış migration'ları çalıştır"""
+    applied = migrate()
+    print(f"Uygulanan migration'lar: {', '.join(applied)}" if applied else "Şema güncel.")
+
+@app.cli.command('explain-check')
+@click.option('--min-rows', default=1000, show_default=True,
+              help='Bu tahmini satır sayısının altındaki full scan\'ler yok sayılır')
+def explain_check_command(min_rows):
+    """Tüm GET endpoint sorgularını EXPLAIN et; full table scan varsa hata ver"""
+    # Raporlar arka planda toplu hesaplanırsa sorgular yanlış endpoint'e yazılır
+    app.config['REPORT_SCHEDULER_ENABLED'] = False
+    problems = find_full_scans(app, min_rows=min_rows)
+    for endpoint, url, table, rows, query in problems:
+        print(f"FULL SCAN {table} (~{rows} satır) <- {endpoint} {url}")
+        print("    " + " ".join(query.split()))
+    if problems:
+        raise SystemExit(1)
+    print("EXPLAIN kontrolü başarılı: full table scan yok.")
 
 # --- ERROR HANDLERS ---
 @app.errorhandler(404)
 def not_found(error):
     return jsonify({"error": "Endpoint bulunamadı"}), 404
 
+@app.errorhandler(PaginationError)
+def bad_pagination(error):
+    return jsonify({"error": str(error)}), 400
+
 @app.errorhandler(500)
 def server_error(error):
     return jsonify({"error": "Sunucu hatası"}), 500
@@ -0,0 +1,152 @@
+# Customer Delete Benchmark
+# Eski N+1 silme yolu ile set-based transactional silmeyi karşılaştırır:
+# round trip (statement) sayısı, kullanılan bağlantı sayısı ve süre.
+#
+#   cd backend
+#   python -m benchmarks.bench_customer_delete --customers 5 --sessions 40 --orders 3 --items 4
+#
+# Not: Benchmark kendi sentetik müşterilerini oluşturur ve siler; yine de
+# üretim veritabanında değil, yerel bir test veritabanında çalıştırın.
+import argparse
+import statistics
+import time
+
+from models import database, rollups
+from models.database import pool_stats, transaction
+from routes.customers import delete_customers
+
+
+class StatementCounter:
+    """execute_query / execute_insert_update / transaction cursor çağrılarını say"""
+
+    def __init__(self):
+        self.count = 0
+        self._patched = []
+
+    def __enter__(self):
+        self.count = 0
+        self._wrap(database, 'execute_query')
+        self._wrap(database, 'execute_insert_update')
+        self._wrap(database._TrackingCursor, 'execute')
+        self._wrap(database._TrackingCursor, 'executemany')
+        return self
+
+    def _wrap(self, owner, name):
+        original = getattr(owner, name)
+        counter = self
+
+        def wrapped(*args, **kwargs):
+            counter.count += 1
+            return original(*args, **kwargs)
+
+        setattr(owner, name, wrapped)
+        self._patched.append((owner, name, original))
+
+    def __exit__(self, *exc):
+        for owner, name, original in reversed(self._patched):
+            setattr(owner, name, original)
+        self._patched.clear()
+        return False
+
+
+def legacy_delete_customer(customer_id):
+    """routes/customers.py içindeki eski silme yolu (karşılaştırma için birebir kopya)"""
+    exists = database.execute_query("SELECT customer_id FROM CUSTOMERS WHERE customer_id = %s", (customer_id,))
+    if not exists:
+        return False
+    with transaction() as cursor:
+        rollups.forget_customers(cursor, [customer_id])
+    database.execute_insert_update("DELETE FROM DIETARYRESTRICTIONS WHERE customer_id = %s", (customer_id,))
+    sessions = database.execute_query("""
+        SELECT ds.session_id FROM DININGSESSIONS ds
+        JOIN RESERVATIONS r ON ds.reservation_id = r.reservation_id
+        WHERE r.customer_id = %s
+    """, (customer_id,))
+    for s in sessions or []:
+        sid = s['session_id']
+        database.execute_insert_update("DELETE FROM FEEDBACK WHERE session_id = %s", (sid,))
+        orders = database.execute_query("SELECT order_id FROM ORDERS WHERE session_id = %s", (sid,))
+        if orders:
+            for o in orders:
+                database.execute_insert_update("DELETE FROM ORDERDETAILS WHERE order_id = %s", (o['order_id'],))
+            database.execute_insert_update("DELETE FROM ORDERS WHERE session_id = %s", (sid,))
+        database.execute_insert_update("DELETE FROM DININGSESSIONS WHERE session_id = %s", (sid,))
+    database.execute_insert_update("DELETE FROM RESERVATIONS WHERE customer_id = %s", (customer_id,))
+    return database.execute_insert_update("DELETE FROM CUSTOMERS WHERE customer_id = %s", (customer_id,))
+
+
+def create_regular(sessions, orders_per_session, items_per_order):
+    """Geçmişi olan sentetik bir müşteri oluştur; customer_id döndür"""
+    with transaction() as cursor:
+        cursor.execute("SELECT table_id FROM TABLES ORDER BY table_id LIMIT 1")
+        table_id = cursor.fetchone()['table_id']
+        cursor.execute("SELECT staff_id FROM STAFF ORDER BY staff_id LIMIT 1")
+        staff_id = cursor.fetchone()['staff_id']
+        cursor.execute("SELECT item_id FROM MENUITEMS ORDER BY item_id LIMIT 1")
+        item_id = cursor.fetchone()['item_id']
+
+        cursor.execute("INSERT INTO CUSTOMERS (full_name, phone, email) VALUES ('Bench Regular', NULL, NULL)")
+        customer_id = cursor.lastrowid
+        cursor.execute("INSERT INTO DIETARYRESTRICTIONS (customer_id, restriction_type) VALUES (%s, 'Vegan')",
+                       (customer_id,))
+        for i in range(sessions):
+            cursor.execute("""
+                INSERT INTO RESERVATIONS (customer_id, table_id, reservation_time, party_size, status)
+                VALUES (%s, %s, NOW() - INTERVAL %s DAY, 2, 'Completed')
+            """, (customer_id, table_id, i + 1))
+            cursor.execute("""
+                INSERT INTO DININGSESSIONS (reservation_id, start_time, end_time, total_amount)
+                VALUES (%s, NOW() - INTERVAL %s DAY, NOW() - INTERVAL %s DAY, 1000)
+            """, (cursor.lastrowid, i + 1, i + 1))
+            session_id = cursor.lastrowid
+            cursor.execute("INSERT INTO FEEDBACK (session_id, rating, comment) VALUES (%s, 5, 'bench')",
+                           (session_id,))
+            for _ in range(orders_per_session):
+                cursor.execute("INSERT INTO ORDERS (session_id, staff_id, order_time) VALUES (%s, %s, NOW())",
+                               (session_id, staff_id))
+                order_id = cursor.lastrowid
+                cursor.executemany(
+                    "INSERT INTO ORDERDETAILS (order_id, item_id, quantity) VALUES (%s, %s, 1)",
+                    [(order_id, item_id)] * items_per_order
+                )
+    return customer_id
+
+
+def measure(delete_fn, customer_ids):
+    timings, statements, checkouts = [], [], []
+    for customer_id in customer_ids:
+        before = pool_stats()['checkouts']
+        with StatementCounter() as counter:
+            start = time.perf_counter()
+            delete_fn(customer_id)
+            timings.append(time.perf_counter() - start)
+        statements.append(counter.count)
+        checkouts.append(pool_stats()['checkouts'] - before)
+    return timings, statements, checkouts
+
+
+def report(name, timings, statements, checkouts):
+    print(f"{name:<12} median {statistics.median(timings) * 1000:8.1f} ms   "
+          f"max {max(timings) * 1000:8.1f} ms   "
+          f"statements {statistics.mean(statements):7.1f}   "
+          f"connections {statistics.mean(checkouts):6.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--customers', type=int, default=5, help='Her yol için silinecek müşteri sayısı')
+    parser.add_argument('--sessions', type=int, default=40, help='Müşteri başına oturum sayısı')
+    parser.add_argument('--orders', type=int, default=3, help='Oturum başına sipariş sayısı')
+    parser.add_argument('--items', type=int, default=4, help='Sipariş başına kalem sayısı')
+    args = parser.parse_args()
+
+    print(f"{args.customers} müşteri x {args.sessions} oturum x {args.orders} sipariş x {args.items} kalem")
+    legacy_ids = [create_regular(args.sessions, args.orders, args.items) for _ in range(args.customers)]
+    new_ids = [create_regular(args.sessions, args.orders, args.items) for _ in range(args.customers)]
+
+    report("legacy N+1", *measure(legacy_delete_customer, legacy_ids))
+    report("set-based", *measure(lambda cid: delete_customers([cid]), new_ids))
+
+
+if __name__ == '__main__':
+    main()
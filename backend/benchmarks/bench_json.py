@@ -0,0 +1,101 @@
+# JSON Serialization Benchmark
+# Rapor/liste yanıtına benzeyen sentetik satırlar (Decimal, datetime, date, timedelta,
+# Türkçe metin) üzerinde serileştirme süresini ve payload boyutunu karşılaştırır:
+#   - flask default : Flask 2.3 DefaultJSONProvider (eski davranış)
+#   - stdlib        : FastJSONProvider, orjson olmadan
+#   - orjson        : FastJSONProvider, orjson ile (kuruluysa)
+# Her biri satır (list of objects) ve columnar ({columns, rows}) formatında ölçülür.
+# Veritabanı gerekmez.
+#
+#   cd backend
+#   python -m benchmarks.bench_json --rows 20000 --repeat 5
+import argparse
+import gzip
+import random
+import statistics
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from routes import json_provider
+from routes.json_provider import FastJSONProvider
+from routes.streaming import to_columnar
+
+NAMES = ['Ayşe Yılmaz', 'Mehmet Öztürk', 'Şule Çelik', 'Ali Kaya', 'Gülşen Demir', 'İsmail Şahin']
+
+
+def make_rows(count, seed=42):
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1, 12, 0)
+    rows = []
+    for i in range(count):
+        visit = start + timedelta(minutes=rng.randrange(0, 525600))
+        rows.append({
+            "customer_id": i + 1,
+            "full_name": rng.choice(NAMES),
+            "vip_status": rng.random() < 0.1,
+            "visit_count": rng.randrange(1, 60),
+            "total_spent": Decimal(rng.randrange(1000, 5000000)) / 100,
+            "avg_per_visit": Decimal(rng.randrange(1000, 50000)) / 100,
+            "start_time": visit,
+            "last_visit": visit.date(),
+            "shift_start": timedelta(hours=rng.randrange(8, 20)),
+        })
+    return rows
+
+
+def measure(dumps, payload, repeat):
+    timings = []
+    body = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = dumps(payload)
+        timings.append(time.perf_counter() - started)
+    if isinstance(body, str):
+        body = body.encode()
+    return statistics.median(timings), len(body), len(gzip.compress(body, 6))
+
+
+def report(name, fmt, median, size, gzipped, baseline):
+    speedup = f"{baseline / median:5.1f}x" if baseline else "    -"
+    print(f"{name:<14} {fmt:<9} {median * 1000:9.1f} ms  {speedup}   "
+          f"{size / 1024:9.1f} KiB   gzip {gzipped / 1024:8.1f} KiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='JSON serileştirme karşılaştırması')
+    parser.add_argument('--rows', type=int, default=20000, help='Satır sayısı')
+    parser.add_argument('--repeat', type=int, default=5, help='Ölçüm tekrarı (medyan alınır)')
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    columnar = to_columnar(rows)
+    app = Flask(__name__)
+    compact = {'separators': (',', ':')}   # jsonify'ın production ayarı
+
+    # Flask default provider timedelta'yı serileştiremez; string'e çevrilmiş kopya ile ölçülür
+    legacy_rows = [dict(row, shift_start=str(row['shift_start'])) for row in rows]
+    legacy_dumps = DefaultJSONProvider(app).dumps
+    legacy = measure(lambda obj: legacy_dumps(obj, **compact), legacy_rows, args.repeat)
+
+    # kwargs verilince FastJSONProvider stdlib json kullanır
+    fast = FastJSONProvider(app)
+    results = [('stdlib', fmt, measure(lambda obj: fast.dumps(obj, **compact), payload, args.repeat))
+               for fmt, payload in (('rows', rows), ('columnar', columnar))]
+    if json_provider.orjson is not None:
+        results += [('orjson', fmt, measure(fast.dumps, payload, args.repeat))
+                    for fmt, payload in (('rows', rows), ('columnar', columnar))]
+
+    print(f"{args.rows} satır, {args.repeat} tekrar (medyan)")
+    report('flask default', 'rows', *legacy, None)
+    for name, fmt, result in results:
+        report(name, fmt, *result, legacy[0])
+    if json_provider.orjson is None:
+        print("orjson kurulu değil: pip install orjson")
+
+
+if __name__ == '__main__':
+    main()
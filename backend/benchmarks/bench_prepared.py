@@ -0,0 +1,121 @@
+# Prepared Statement Benchmark
+# Sık çağrılan endpoint'leri prepared statement cache kapalı (her istekte SQL metni parse
+# edilir) ve açık (bağlantı başına LRU, DB_STATEMENT_CACHE_SIZE) olarak karşılaştırır:
+#   GET  /api/orders/<id>/details
+#   GET  /api/customers/dietary/<id>
+#   POST /api/feedback
+# Her mod için yeni bir bağlantı havuzu kurulur; ilk tur ısınma olarak sayılmaz.
+#
+#   cd backend
+#   python -m benchmarks.bench_prepared --requests 2000
+#
+# Not: POST /api/feedback gerçek kayıt oluşturur; benchmark sonunda bu kayıtlar silinir.
+# Yerel bir test veritabanında çalıştırın.
+import argparse
+import statistics
+import time
+
+from config import DB_CONFIG, DB_POOL_SIZE, DB_POOL_MAX_OVERFLOW, DB_STATEMENT_CACHE_SIZE
+from models import database, rollups
+from models.database import add_statement_observer, remove_statement_observer
+from models.pool import ConnectionPool
+
+
+class DbTimer:
+    """İstek başına veritabanında geçen süreyi topla (statement observer)"""
+
+    def __init__(self):
+        self.total = 0.0
+
+    def __call__(self, event):
+        self.total += event.duration
+
+
+def pick_ids():
+    order = database.execute_query("SELECT order_id FROM ORDERDETAILS ORDER BY order_id DESC LIMIT 1")
+    customer = database.execute_query("SELECT customer_id FROM DIETARYRESTRICTIONS LIMIT 1")
+    session = database.execute_query("SELECT session_id FROM DININGSESSIONS ORDER BY session_id DESC LIMIT 1")
+    if not order or not customer or not session:
+        raise SystemExit("Örnek veri bulunamadı (ORDERDETAILS, DIETARYRESTRICTIONS, DININGSESSIONS)")
+    return order[0]['order_id'], customer[0]['customer_id'], session[0]['session_id']
+
+
+def use_pool(cache_size):
+    old = database._pool
+    database._pool = ConnectionPool(DB_CONFIG, size=DB_POOL_SIZE, max_overflow=DB_POOL_MAX_OVERFLOW,
+                                    statement_cache_size=cache_size)
+    if old is not None:
+        old.dispose()
+
+
+def measure(client, requests, call):
+    timer = DbTimer()
+    call(client)   # ısınma: bağlantı açılır, statement prepare edilir
+    latencies, db_times = [], []
+    add_statement_observer(timer)
+    try:
+        for _ in range(requests):
+            timer.total = 0.0
+            started = time.perf_counter()
+            response = call(client)
+            latencies.append(time.perf_counter() - started)
+            db_times.append(timer.total)
+            if response.status_code >= 400:
+                raise SystemExit(f"İstek başarısız: {response.status_code} {response.get_data(as_text=True)}")
+    finally:
+        remove_statement_observer(timer)
+    latencies.sort()
+    return (statistics.median(latencies), latencies[int(len(latencies) * 0.95) - 1],
+            statistics.mean(db_times))
+
+
+def report(name, mode, median, p95, db_mean, baseline=None):
+    speedup = f"{baseline / median:5.2f}x" if baseline else "    -"
+    print(f"{name:<26} {mode:<9} p50 {median * 1000:7.3f} ms   p95 {p95 * 1000:7.3f} ms   "
+          f"db {db_mean * 1000:7.3f} ms   {speedup}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Prepared statement cache karşılaştırması')
+    parser.add_argument('--requests', type=int, default=2000, help='Endpoint başına istek sayısı')
+    args = parser.parse_args()
+
+    from app import app
+    app.config['REPORT_SCHEDULER_ENABLED'] = False
+    client = app.test_client()
+
+    order_id, customer_id, session_id = pick_ids()
+    before = database.execute_query("SELECT COALESCE(MAX(feedback_id), 0) AS max_id FROM FEEDBACK")[0]['max_id']
+    endpoints = [
+        ('GET orders/<id>/details', lambda c: c.get(f'/api/orders/{order_id}/details')),
+        ('GET customers/dietary/<id>', lambda c: c.get(f'/api/customers/dietary/{customer_id}')),
+        ('POST feedback', lambda c: c.post('/api/feedback', json={
+            'session_id': session_id, 'rating': 5, 'comment': 'benchmark'})),
+    ]
+
+    # Config'te kapalıysa da açık modu ölçebilmek için varsayılan boyut
+    cache_size = DB_STATEMENT_CACHE_SIZE or 64
+    print(f"{args.requests} istek / endpoint, cache boyutu {cache_size}")
+    try:
+        for name, call in endpoints:
+            use_pool(0)
+            baseline = measure(client, args.requests, call)
+            use_pool(cache_size)
+            prepared = measure(client, args.requests, call)
+            report(name, 'text', *baseline)
+            report(name, 'prepared', *prepared, baseline=baseline[0])
+        print("prepared statements:", database.pool_stats()["prepared_statements"])
+    finally:
+        # Puan sayaçlarından da düşülmeli (ROLLUP_FEEDBACK_RATINGS)
+        with database.transaction() as cursor:
+            cursor.execute(
+                "SELECT feedback_id FROM FEEDBACK WHERE feedback_id > %s AND session_id = %s AND comment = 'benchmark'",
+                (before, session_id))
+            ids = [row['feedback_id'] for row in cursor.fetchall()]
+            rollups.forget_feedback(cursor, ids)
+            if ids:
+                cursor.execute(f"DELETE FROM FEEDBACK WHERE feedback_id IN ({', '.join(['%s'] * len(ids))})", ids)
+
+
+if __name__ == '__main__':
+    main()
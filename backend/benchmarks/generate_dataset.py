@@ -0,0 +1,555 @@
+# Synthetic Dataset Generator
+# GastroMind şemasının tamamını (menü, masalar, personel + vardiyalar, müşteriler, rezervasyonlar,
+# oturumlar, siparişler, sipariş detayları, feedback) üretim hacminde sentetik veriyle doldurur.
+#
+#   cd backend
+#   python -m benchmarks.generate_dataset --scale medium --seed 42 --reset
+#   python -m benchmarks.generate_dataset --scale large --method infile --reset
+#
+# Ölçekler (yaklaşık sipariş satırı): small ~35 bin, medium ~1 milyon, large ~14 milyon,
+# xlarge ~45 milyon. --customers / --days / --sessions-per-day ile ayrı ayrı değiştirilebilir.
+#
+# Dağılımlar:
+#   - Öğle (13:00) ve akşam (20:00) yoğunluğu, hafta sonu artışı, yaz sezonu, zamanla büyüme
+#   - Müdavimler: ziyaretlerin ~%50'si müşterilerin %10'undan gelir
+#   - Popüler yemekler: kategori içinde Zipf dağılımı
+#   - Geçmiş rezervasyonlar Completed/Cancelled/No-Show, son --future-days gün Pending/Confirmed
+#   - total_amount sipariş satırlarından, total_ltv / visit_count / last_visit oturumlardan
+#     hesaplanır; LTV'si en yüksek %5 VIP olur
+#
+# Aynı --seed, ölçek ve --end ile her zaman aynı veri üretilir (id'ler dahil). Veri gün gün
+# üretilir ve parça parça yazılır; bellek kullanımı müşteri sayısıyla sınırlıdır.
+#   --method insert: executemany ile çok satırlı INSERT (--batch-size satır / statement)
+#   --method infile: TSV + LOAD DATA LOCAL INFILE (sunucuda local_infile=ON gerekir, en hızlısı)
+#
+# Not: --reset tüm veri tablolarını TRUNCATE eder. Yalnızca yerel bir test veritabanında kullanın.
+import argparse
+import math
+import os
+import random
+import tempfile
+import time
+from array import array
+from datetime import date, datetime, timedelta
+
+import mysql.connector
+from config import DB_CONFIG
+
+SCALES = {
+    'small': dict(customers=2_000, days=90, sessions_per_day=40),
+    'medium': dict(customers=50_000, days=365, sessions_per_day=300),
+    'large': dict(customers=500_000, days=3 * 365, sessions_per_day=1_500),
+    'xlarge': dict(customers=2_000_000, days=5 * 365, sessions_per_day=3_000),
+}
+
+COLUMNS = {
+    'CATEGORIES': ('category_id', 'category_name', 'target_margin'),
+    'MENUITEMS': ('item_id', 'category_id', 'name', 'price', 'prep_time_minutes'),
+    'TABLES': ('table_id', 'capacity', 'location_zone', 'is_combinable'),
+    'TABLECOMBINATIONS': ('parent_table_id', 'child_table_id'),
+    'STAFF': ('staff_id', 'name', 'role', 'hire_date'),
+    'SHIFTSCHEDULES': ('staff_id', 'day_of_week', 'start_time', 'end_time'),
+    'CUSTOMERS': ('customer_id', 'full_name', 'phone', 'email', 'total_ltv', 'vip_status',
+                  'visit_count', 'last_visit'),
+    'DIETARYRESTRICTIONS': ('customer_id', 'restriction_type'),
+    'RESERVATIONS': ('reservation_id', 'customer_id', 'table_id', 'reservation_time', 'party_size', 'status'),
+    'DININGSESSIONS': ('session_id', 'reservation_id', 'start_time', 'end_time', 'total_amount'),
+    'ORDERS': ('order_id', 'session_id', 'staff_id', 'order_time'),
+    'ORDERDETAILS': ('order_id', 'item_id', 'quantity', 'special_note'),
+    'FEEDBACK': ('session_id', 'rating', 'comment'),
+}
+
+ROLLUP_TABLES = ('ROLLUP_DAILY_REVENUE', 'ROLLUP_ITEM_SALES', 'ROLLUP_STAFF_SALES', 'ROLLUP_TABLE_STATS',
+                 'ROLLUP_FEEDBACK_RATINGS')
+
+# Kategori -> (hedef marj, [(ürün, min fiyat, max fiyat, hazırlık dk)]); listedeki sıra popülerlik değildir
+MENU = {
+    'Appetizers': (35.00, [
+        ('Beef Carpaccio', 380, 480, 10), ('Truffle Potatoes', 260, 340, 15), ('Hummus Trio', 180, 240, 5),
+        ('Grilled Halloumi', 220, 290, 10), ('Stuffed Vine Leaves', 190, 250, 5), ('Burrata Salad', 340, 420, 5),
+        ('Crispy Calamari', 310, 390, 12), ('Lentil Soup', 140, 180, 5), ('Muhammara', 170, 220, 5),
+        ('Tuna Tartare', 420, 520, 10), ('Smoked Eggplant', 200, 260, 8), ('Shrimp Casserole', 360, 440, 15),
+    ]),
+    'Main Course (Meat)': (25.00, [
+        ('Wagyu Burger', 850, 1000, 25), ('Lamb Rack (For 2)', 1600, 1900, 40), ('Adana Kebab', 520, 640, 20),
+        ('Beef Tenderloin', 1100, 1350, 30), ('Chicken Shish', 420, 520, 20), ('Iskender', 560, 680, 20),
+        ('Lamb Shank', 780, 920, 35), ('Ribeye Steak', 1250, 1500, 30), ('Kofte Platter', 460, 560, 18),
+        ('Duck Confit', 840, 980, 30), ('Veal Schnitzel', 690, 820, 20), ('Short Ribs', 980, 1150, 35),
+    ]),
+    'Main Course (Seafood)': (20.00, [
+        ('Grilled Sea Bass', 600, 700, 25), ('Jumbo Shrimp', 750, 880, 20), ('Salmon Fillet', 640, 760, 20),
+        ('Octopus Grill', 820, 960, 25), ('Sea Bream', 580, 680, 25), ('Lobster Tail', 1900, 2300, 30),
+        ('Fish & Chips', 460, 540, 18), ('Seafood Platter (For 2)', 1700, 2000, 35),
+        ('Turbot', 1100, 1300, 30), ('Mussels Marinara', 420, 500, 15),
+    ]),
+    'Pasta & Risotto': (45.00, [
+        ('Truffle Risotto', 500, 600, 25), ('Seafood Linguine', 560, 650, 20), ('Penne Arrabbiata', 320, 380, 15),
+        ('Mushroom Tagliatelle', 400, 470, 18), ('Lasagna', 420, 500, 20), ('Pesto Gnocchi', 380, 450, 18),
+        ('Spaghetti Carbonara', 390, 460, 15), ('Saffron Risotto', 480, 560, 25), ('Manti', 360, 430, 20),
+    ]),
+    'Desserts': (55.00, [
+        ('San Sebastian Cheesecake', 230, 270, 5), ('Chocolate Souffle', 260, 300, 15), ('Baklava', 220, 280, 5),
+        ('Kunefe', 250, 300, 12), ('Tiramisu', 220, 260, 5), ('Creme Brulee', 210, 250, 5),
+        ('Sutlac', 160, 200, 5), ('Ice Cream Selection', 150, 190, 3), ('Fruit Platter', 280, 340, 8),
+    ]),
+    'Beverages (Premium)': (65.00, [
+        ('Homemade Lemonade', 100, 130, 5), ('Turkish Tea', 40, 60, 2), ('Turkish Coffee', 90, 120, 5),
+        ('Ayran', 60, 80, 2), ('Sparkling Water', 70, 90, 1), ('Espresso', 90, 110, 3),
+        ('Fresh Orange Juice', 130, 160, 5), ('Craft Beer', 220, 280, 2), ('Raki (Double)', 380, 460, 2),
+        ('House Wine (Glass)', 320, 400, 2), ('Chateau Margaux (Bottle)', 11000, 13000, 5),
+        ('Champagne (Bottle)', 6500, 8000, 5),
+    ]),
+}
+MAIN_CATEGORIES = ('Main Course (Meat)', 'Main Course (Seafood)', 'Pasta & Risotto')
+
+ZONES = [('Window Side', 2, True), ('Main Hall', 4, True), ('Main Hall', 4, True), ('VIP Lounge', 6, False),
+         ('Terrace', 8, False), ('Bar', 2, False), ('Garden', 10, True), ('Garden', 4, True)]
+
+FIRST_NAMES = ('Ahmet', 'Mehmet', 'Mustafa', 'Ali', 'Huseyin', 'Hasan', 'Ibrahim', 'Emre', 'Burak', 'Can',
+               'Murat', 'Omer', 'Yusuf', 'Kerem', 'Arda', 'Baris', 'Cem', 'Deniz', 'Efe', 'Hakan',
+               'Ayse', 'Fatma', 'Zeynep', 'Elif', 'Emine', 'Merve', 'Selin', 'Ebru', 'Gizem', 'Derya',
+               'Seda', 'Buse', 'Ceren', 'Ozge', 'Irem', 'Ipek', 'Nur', 'Pinar', 'Tugba', 'Yasemin')
+LAST_NAMES = ('Yilmaz', 'Kaya', 'Demir', 'Sahin', 'Celik', 'Yildiz', 'Yildirim', 'Ozturk', 'Aydin', 'Ozdemir',
+              'Arslan', 'Dogan', 'Kilic', 'Aslan', 'Cetin', 'Kara', 'Koc', 'Kurt', 'Ozkan', 'Simsek',
+              'Polat', 'Erdogan', 'Korkmaz', 'Tekin', 'Aksoy', 'Gunes', 'Bulut', 'Keskin', 'Unal', 'Tas')
+EMAIL_DOMAINS = ('gmail.com', 'hotmail.com', 'outlook.com', 'yahoo.com', 'icloud.com')
+RESTRICTIONS = ('Vegan', 'Vegetarian', 'Gluten Free', 'Lactose Intolerant', 'Nut Allergy',
+                'Shellfish Allergy', 'Halal', 'Low Sodium')
+SPECIAL_NOTES = ('Well done', 'Medium rare', 'No onions', 'Extra spicy', 'Sauce on the side',
+                 'Gluten-free preparation', 'Shared for the table', 'No ice', 'Birthday candle', 'Vegan preparation')
+COMMENTS = {
+    5: ('Excellent food and service.', 'Best dinner we had this year.', 'Staff were very attentive.',
+        'Perfect evening, will come back.', 'Great atmosphere and wine selection.'),
+    4: ('Very good food, a bit slow at peak time.', 'Nice place, desserts were great.',
+        'Good service, the terrace was lovely.', 'Tasty mains, portions could be bigger.'),
+    3: ('Average experience.', 'Food was fine but service was slow.', 'Too noisy on a Saturday night.'),
+    2: ('Waited too long for our mains.', 'Order was wrong, staff fixed it eventually.'),
+    1: ('Very disappointing evening.', 'Cold food and long waits.'),
+}
+DAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+WEEKDAY_FACTOR = (0.80, 0.85, 0.90, 1.00, 1.30, 1.45, 1.20)
+
+PARTY_SIZES = (1, 2, 3, 4, 5, 6, 7, 8, 10)
+PARTY_WEIGHTS = (6, 42, 12, 22, 6, 6, 2, 3, 1)
+ORDER_COUNTS = (1, 2, 3, 4)
+ORDER_COUNT_WEIGHTS = (35, 40, 18, 7)
+RATINGS = (5, 4, 3, 2, 1)
+RATING_WEIGHTS = (45, 32, 13, 6, 4)
+VIP_PERCENTILE = 0.95
+LOYAL_CUSTOMERS = 0.10     # müşterilerin bu kadarı müdavim ...
+LOYAL_VISIT_SHARE = 0.45   # ... ve ziyaretlerin bu kadarı onlardan gelir (üstüne tüm müşterilerden rastgele)
+
+
+def _cents(value):
+    return f"{value // 100}.{value % 100:02d}"
+
+
+# --- YAZICILAR ---
+
+class InsertWriter:
+    """Tablo başına tampon; executemany çok satırlı tek INSERT statement'ına çevrilir"""
+
+    def __init__(self, conn, batch_size):
+        self.conn = conn
+        self.batch_size = batch_size
+        self.buffers = {table: [] for table in COLUMNS}
+        self.counts = dict.fromkeys(COLUMNS, 0)
+
+    def add(self, table, row):
+        buffer = self.buffers[table]
+        buffer.append(row)
+        if len(buffer) >= self.batch_size:
+            self.flush(table)
+
+    def flush(self, table):
+        rows = self.buffers[table]
+        if not rows:
+            return
+        columns = COLUMNS[table]
+        cursor = self.conn.cursor()
+        cursor.executemany(f"INSERT INTO {table} ({', '.join(columns)}) "
+                           f"VALUES ({', '.join(['%s'] * len(columns))})", rows)
+        cursor.close()
+        self.conn.commit()
+        self.counts[table] += len(rows)
+        rows.clear()
+
+    def close(self):
+        for table in COLUMNS:
+            self.flush(table)
+
+
+def _tsv(value):
+    if value is None:
+        return '\\N'
+    if value is True or value is False:
+        return '1' if value else '0'
+    text = str(value)
+    if '\\' in text or '\t' in text or '\n' in text:
+        text = text.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n')
+    return text
+
+
+class InfileWriter:
+    """Tablo başına TSV dosyası; chunk_rows satırda bir LOAD DATA LOCAL INFILE ile yüklenir"""
+
+    def __init__(self, conn, chunk_rows):
+        self.conn = conn
+        self.chunk_rows = chunk_rows
+        self.directory = tempfile.mkdtemp(prefix='gastromind-dataset-')
+        self.files = {}
+        self.pending = dict.fromkeys(COLUMNS, 0)
+        self.counts = dict.fromkeys(COLUMNS, 0)
+
+    def add(self, table, row):
+        f = self.files.get(table)
+        if f is None:
+            f = self.files[table] = open(os.path.join(self.directory, f"{table}.tsv"), 'w',
+                                         encoding='utf-8', newline='\n')
+        f.write('\t'.join(map(_tsv, row)) + '\n')
+        self.pending[table] += 1
+        if self.pending[table] >= self.chunk_rows:
+            self.flush(table)
+
+    def flush(self, table):
+        f = self.files.pop(table, None)
+        if f is None:
+            return
+        f.close()
+        cursor = self.conn.cursor()
+        cursor.execute(f"LOAD DATA LOCAL INFILE %s INTO TABLE {table} CHARACTER SET utf8mb4 "
+                       f"FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n' "
+                       f"({', '.join(COLUMNS[table])})", (f.name,))
+        cursor.close()
+        self.conn.commit()
+        os.remove(f.name)
+        self.counts[table] += self.pending[table]
+        self.pending[table] = 0
+
+    def close(self):
+        for table in COLUMNS:
+            self.flush(table)
+        os.rmdir(self.directory)
+
+
+# --- ÜRETİM ---
+
+class DatasetGenerator:
+    def __init__(self, writer, seed, customers, days, sessions_per_day, end, future_days):
+        self.out = writer
+        self.rng = random.Random(seed)
+        self.customers = customers
+        self.days = days
+        self.sessions_per_day = sessions_per_day
+        self.end = end
+        self.future_days = future_days
+        self.ltv = array('q', bytes(8 * (customers + 1)))   # müşteri başına kuruş
+        self.visits = array('i', bytes(4 * (customers + 1)))
+        self.last_visit = [None] * (customers + 1)           # günler sırayla üretilir: son atama en yenisi
+        self.loyal = max(1, int(customers * LOYAL_CUSTOMERS))
+        self.reservation_id = self.session_id = self.order_id = 0
+        # Müşteri seçimi için permütasyon adımı: sadakat id sırasına bağlı olmasın
+        self.customer_step = next(p for p in (1_000_003, 999_983, 7_919) if customers % p)
+
+    def run(self):
+        self.menu()
+        self.tables()
+        self.staff()
+        start = self.end - timedelta(days=self.days)
+        for offset in range(self.days + self.future_days):
+            day = start + timedelta(days=offset)
+            self.day(day, future=day >= self.end)
+            if offset and offset % 30 == 0:
+                print(f"  {day}: {self.session_id} oturum, {self.order_id} sipariş")
+        self.customer_rows()
+
+    # Sabit boyutlu tablolar
+
+    def menu(self):
+        rng = self.rng
+        self.items = {}        # kategori -> [(item_id, fiyat_kuruş)]
+        self.cum_weights = {}  # kategori -> Zipf kümülatif ağırlıklar (random.choices için)
+        item_id = 0
+        for category_id, (category, (margin, items)) in enumerate(MENU.items(), start=1):
+            self.out.add('CATEGORIES', (category_id, category, margin))
+            entries = []
+            for name, low, high, prep in items:
+                item_id += 1
+                price = rng.randint(low, high) * 100
+                self.out.add('MENUITEMS', (item_id, category_id, name, _cents(price), prep))
+                entries.append((item_id, price))
+            rng.shuffle(entries)   # popülerlik sırası; şişe şarap/şampanya hep en az satanlar
+            entries.sort(key=lambda entry: entry[1] >= 500_000)
+            total, cum = 0.0, []
+            for rank in range(1, len(entries) + 1):
+                total += 1 / rank ** 1.1
+                cum.append(total)
+            self.items[category] = entries
+            self.cum_weights[category] = cum
+
+    def tables(self):
+        # Masa başına günde ~3.5 oturum
+        count = max(len(ZONES), round(self.sessions_per_day / 3.5))
+        self.tables_by_capacity = {}
+        previous = None
+        for table_id in range(1, count + 1):
+            zone, capacity, combinable = ZONES[(table_id - 1) % len(ZONES)]
+            section = (table_id - 1) // len(ZONES) + 1
+            self.out.add('TABLES', (table_id, capacity, f"{zone} {section}", combinable))
+            self.tables_by_capacity.setdefault(capacity, []).append(table_id)
+            if combinable and previous and previous[1] == zone:
+                self.out.add('TABLECOMBINATIONS', (previous[0], table_id))
+            previous = (table_id, zone)
+        self.capacities = sorted(self.tables_by_capacity)
+        self.table_count = count
+
+    def staff(self):
+        rng = self.rng
+        waiters = max(6, self.table_count // 4)
+        roles = ([('Head Chef', 1), ('Chef', max(2, waiters // 3)), ('Host', max(1, waiters // 8)),
+                  ('Manager', max(1, waiters // 20)), ('Waiter', waiters)])
+        self.waiters = []
+        staff_id = 0
+        for role, count in roles:
+            for _ in range(count):
+                staff_id += 1
+                name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+                hired = self.end - timedelta(days=rng.randint(30, self.days + 3 * 365))
+                self.out.add('STAFF', (staff_id, name, role, hired))
+                if role == 'Waiter':
+                    self.waiters.append(staff_id)
+                # Haftada 5 gün; sabah veya akşam vardiyası
+                evening = rng.random() < 0.6
+                for day in rng.sample(DAYS, 5):
+                    self.out.add('SHIFTSCHEDULES', (staff_id, day, '16:00:00' if evening else '08:00:00',
+                                                    '23:59:00' if evening else '16:00:00'))
+
+    # Günlük hacim
+
+    def day(self, day, future):
+        rng = self.rng
+        elapsed = (day - (self.end - timedelta(days=self.days))).days / max(self.days, 1)
+        volume = (self.sessions_per_day * WEEKDAY_FACTOR[day.weekday()]
+                  * (1 + 0.15 * math.sin((day.timetuple().tm_yday - 100) / 365 * 2 * math.pi))  # yaz
+                  * (0.8 + 0.4 * elapsed)                                                       # büyüme
+                  * rng.gauss(1, 0.08))
+        if future:
+            # Uzak günler için henüz daha az rezervasyon var
+            volume *= max(0.1, 1 - (day - self.end).days / (self.future_days + 1))
+        busy = {}   # gelecek günlerde masa -> [başlangıç dakikaları] (double booking olmasın)
+        for _ in range(max(0, round(volume))):
+            self.reservation(day, future, busy)
+
+    def arrival_minute(self):
+        rng = self.rng
+        u = rng.random()
+        if u < 0.35:
+            minute = rng.gauss(13 * 60, 45)
+        elif u < 0.90:
+            minute = rng.gauss(20 * 60, 60)
+        else:
+            minute = rng.uniform(11 * 60, 23 * 60)
+        return int(min(max(minute, 11 * 60), 22 * 60 + 45)) // 15 * 15
+
+    def pick_table(self, party, minute, busy):
+        rng = self.rng
+        fitting = [c for c in self.capacities if c >= party] or self.capacities[-1:]
+        for _ in range(5):
+            capacity = fitting[0] if rng.random() < 0.7 else rng.choice(fitting)
+            table_id = rng.choice(self.tables_by_capacity[capacity])
+            if busy is None:
+                return table_id
+            starts = busy.setdefault(table_id, [])
+            if all(abs(minute - s) >= 120 for s in starts):
+                starts.append(minute)
+                return table_id
+        return None
+
+    def pick_customer(self):
+        rng = self.rng
+        if rng.random() < LOYAL_VISIT_SHARE:
+            # Müdavimler arasında da hafif çarpıklık: bazıları haftada birkaç kez gelir
+            idx = int(self.loyal * rng.random() ** 1.5)
+        else:
+            idx = rng.randrange(self.customers)
+        return (idx * self.customer_step) % self.customers + 1
+
+    def reservation(self, day, future, busy):
+        rng = self.rng
+        party = rng.choices(PARTY_SIZES, PARTY_WEIGHTS)[0]
+        minute = self.arrival_minute()
+        table_id = self.pick_table(party, minute, busy if future else None)
+        if table_id is None:
+            return
+        customer_id = self.pick_customer()
+        reserved_at = datetime(day.year, day.month, day.day) + timedelta(minutes=minute)
+
+        if future:
+            status = 'Confirmed' if rng.random() < 0.6 else 'Pending'
+        else:
+            u = rng.random()
+            status = 'Completed' if u < 0.86 else ('Cancelled' if u < 0.94 else 'No-Show')
+        self.reservation_id += 1
+        self.out.add('RESERVATIONS', (self.reservation_id, customer_id, table_id, reserved_at, party, status))
+        if status == 'Completed':
+            self.session(customer_id, party, reserved_at)
+
+    def session(self, customer_id, party, reserved_at):
+        rng = self.rng
+        self.session_id += 1
+        start = reserved_at + timedelta(minutes=max(-10, int(rng.gauss(5, 7))))
+        total = 0
+        order_time = start
+        waiter = rng.choice(self.waiters)
+        for course in range(rng.choices(ORDER_COUNTS, ORDER_COUNT_WEIGHTS)[0]):
+            order_time += timedelta(minutes=rng.randint(5, 15) if course == 0 else rng.randint(15, 40))
+            total += self.order(party, course, order_time, waiter)
+        duration = 45 + 8 * party + max(0, int(rng.gauss(0, 15)))
+        end = max(start + timedelta(minutes=duration), order_time + timedelta(minutes=20))
+        self.out.add('DININGSESSIONS', (self.session_id, self.reservation_id, start, end, _cents(total)))
+        self.ltv[customer_id] += total
+        self.visits[customer_id] += 1
+        self.last_visit[customer_id] = start
+
+        if rng.random() < 0.3:
+            rating = rng.choices(RATINGS, RATING_WEIGHTS)[0]
+            comment = rng.choice(COMMENTS[rating]) if rng.random() < 0.6 else None
+            self.out.add('FEEDBACK', (self.session_id, rating, comment))
+
+    def order(self, party, course, order_time, waiter):
+        rng = self.rng
+        self.order_id += 1
+        # Genelde masanın garsonu; yoğunlukta başka bir garson
+        staff_id = waiter if rng.random() < 0.85 else rng.choice(self.waiters)
+        self.out.add('ORDERS', (self.order_id, self.session_id, staff_id, order_time))
+
+        if course == 0:
+            picks = [('Beverages (Premium)', 0.7), ('Appetizers', 0.5), (None, 0.85)]
+        elif course == 1:
+            picks = [(None, 0.4), ('Desserts', 0.5), ('Beverages (Premium)', 0.4)]
+        else:
+            picks = [('Desserts', 0.4), ('Beverages (Premium)', 0.6)]
+        lines = {}
+        for category, chance in picks:
+            for _ in range(party):
+                if rng.random() >= chance:
+                    continue
+                chosen = category or rng.choice(MAIN_CATEGORIES)
+                item = rng.choices(self.items[chosen], cum_weights=self.cum_weights[chosen])[0]
+                lines[item] = lines.get(item, 0) + 1
+        if not lines:
+            chosen = 'Beverages (Premium)'
+            lines[rng.choices(self.items[chosen], cum_weights=self.cum_weights[chosen])[0]] = 1
+
+        total = 0
+        for (item_id, price), quantity in lines.items():
+            note = rng.choice(SPECIAL_NOTES) if rng.random() < 0.05 else None
+            self.out.add('ORDERDETAILS', (self.order_id, item_id, quantity, note))
+            total += price * quantity
+        return total
+
+    # Müşteriler en son: LTV ve VIP durumu oturumlardan hesaplanır
+
+    def customer_rows(self):
+        rng = self.rng
+        spending = sorted(self.ltv[1:])
+        vip_threshold = max(1, spending[int(len(spending) * VIP_PERCENTILE)]) if spending else 1
+        for customer_id in range(1, self.customers + 1):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            phone = f"5{rng.randint(30, 59)}-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}"
+            email = f"{first.lower()}.{last.lower()}{customer_id}@{rng.choice(EMAIL_DOMAINS)}"
+            ltv = self.ltv[customer_id]
+            self.out.add('CUSTOMERS', (customer_id, f"{first} {last}", phone, email, _cents(ltv),
+                                       ltv >= vip_threshold, self.visits[customer_id],
+                                       self.last_visit[customer_id]))
+            if rng.random() < 0.12:
+                for restriction in rng.sample(RESTRICTIONS, 1 if rng.random() < 0.8 else 2):
+                    self.out.add('DIETARYRESTRICTIONS', (customer_id, restriction))
+
+
+# --- VERİTABANI ---
+
+def reset_tables(conn):
+    cursor = conn.cursor()
+    cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+    for table in (*COLUMNS, *ROLLUP_TABLES):
+        cursor.execute(f"TRUNCATE TABLE {table}")
+    cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+    cursor.close()
+
+
+def is_empty(conn):
+    cursor = conn.cursor()
+    cursor.execute("SELECT EXISTS(SELECT 1 FROM CUSTOMERS) OR EXISTS(SELECT 1 FROM RESERVATIONS)")
+    (has_rows,) = cursor.fetchone()
+    cursor.close()
+    return not has_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='GastroMind sentetik veri üretici')
+    parser.add_argument('--scale', choices=SCALES, default='small')
+    parser.add_argument('--customers', type=int, help='Ölçeğin müşteri sayısını değiştir')
+    parser.add_argument('--days', type=int, help='Geçmiş gün sayısı')
+    parser.add_argument('--sessions-per-day', type=int, help='Ortalama günlük rezervasyon')
+    parser.add_argument('--future-days', type=int, default=14, help='Pending/Confirmed rezervasyon günleri')
+    parser.add_argument('--end', type=date.fromisoformat, default=date.today(),
+                        help='Geçmiş verinin bittiği gün (YYYY-MM-DD, varsayılan bugün)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--method', choices=('insert', 'infile'), default='insert')
+    parser.add_argument('--batch-size', type=int, default=5000, help='INSERT başına satır')
+    parser.add_argument('--chunk-rows', type=int, default=1_000_000, help='LOAD DATA başına satır')
+    parser.add_argument('--reset', action='store_true', help='Mevcut tüm veriyi sil (TRUNCATE)')
+    parser.add_argument('--skip-rollups', action='store_true', help='Rollup tablolarını yeniden hesaplama')
+    args = parser.parse_args()
+
+    scale = dict(SCALES[args.scale])
+    for key in scale:
+        if getattr(args, key) is not None:
+            scale[key] = getattr(args, key)
+
+    conn = mysql.connector.connect(**DB_CONFIG, allow_local_infile=args.method == 'infile')
+    try:
+        if args.reset:
+            reset_tables(conn)
+        elif not is_empty(conn):
+            raise SystemExit("Veritabanı boş değil; id'lerin tekrarlanabilir olması için --reset kullanın")
+
+        cursor = conn.cursor()
+        # Toplu yüklemede kontroller kapalı: id'ler ve FK'ler üretici tarafından tutarlı üretilir
+        cursor.execute("SET SESSION FOREIGN_KEY_CHECKS = 0, UNIQUE_CHECKS = 0")
+        cursor.close()
+        writer = (InfileWriter(conn, args.chunk_rows) if args.method == 'infile'
+                  else InsertWriter(conn, args.batch_size))
+
+        print(f"Üretiliyor: seed={args.seed} end={args.end} method={args.method} " +
+              " ".join(f"{k}={v}" for k, v in scale.items()))
+        started = time.perf_counter()
+        DatasetGenerator(writer, args.seed, scale['customers'], scale['days'], scale['sessions_per_day'],
+                         args.end, args.future_days).run()
+        writer.close()
+        elapsed = time.perf_counter() - started
+
+        cursor = conn.cursor()
+        cursor.execute("SET SESSION FOREIGN_KEY_CHECKS = 1, UNIQUE_CHECKS = 1")
+        for table in COLUMNS:
+            cursor.execute(f"ANALYZE TABLE {table}")
+            cursor.fetchall()
+        cursor.close()
+    finally:
+        conn.close()
+
+    total = sum(writer.counts.values())
+    for table, count in writer.counts.items():
+        print(f"  {table:<20} {count:>12,}")
+    print(f"{total:,} satır {elapsed:.1f} sn ({total / elapsed:,.0f} satır/sn)")
+
+    if not args.skip_rollups:
+        from models.rollups import rebuild_rollups
+        started = time.perf_counter()
+        rebuild_rollups()
+        print(f"Rollup tabloları yeniden hesaplandı ({time.perf_counter() - started:.1f} sn)")
+
+
+if __name__ == '__main__':
+    main()
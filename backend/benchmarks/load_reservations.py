@@ -0,0 +1,143 @@
+# Reservation Burst Load Test
+# Çok sayıda eşzamanlı POST /api/reservations isteğini aynı birkaç masa/saat için gönderir,
+# ardından aynı masada çakışan aktif rezervasyon (double booking) olup olmadığını kontrol eder.
+#
+#   cd backend
+#   python -m benchmarks.load_reservations --url http://localhost:5000 --threads 50 --requests 1000
+#
+# Eski endpoint ile karşılaştırmak için aynı komutu önceki sürümle çalışan bir sunucuya karşı
+# (farklı bir --date ile) çalıştırın. Script yalnızca HTTP kullanır; sunucu çok process'li
+# (gunicorn -w N) çalışabilir. Test verisi --cleanup ile Cancelled yapılır.
+import argparse
+import json
+import random
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from config import AVAILABILITY_ACTIVE_STATUSES, RESERVATION_DURATION_MINUTES
+
+
+def call(method, url, body=None):
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(url, data=data, method=method,
+                                 headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(req, timeout=30) as resp:
+            return resp.status, resp.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+    except urllib.error.URLError as e:
+        return 0, str(e).encode()
+
+
+def book(base_url, customer_id, table_id, start):
+    began = time.perf_counter()
+    status, body = call('POST', f"{base_url}/api/reservations", {
+        'customer_id': customer_id,
+        'table_id': table_id,
+        'reservation_time': start.strftime('%Y-%m-%d %H:%M:%S'),
+        'party_size': 2,
+    })
+    elapsed = time.perf_counter() - began
+    reservation_id = None
+    if status == 201:
+        try:
+            reservation_id = json.loads(body).get('reservation_id')
+        except ValueError:
+            pass
+    return status, elapsed, reservation_id
+
+
+def _parse_time(value):
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return datetime.strptime(value, '%a, %d %b %Y %H:%M:%S GMT')
+
+
+def find_double_bookings(base_url, day):
+    """Gün içindeki aktif rezervasyonlardan aynı masada çakışanları bul"""
+    url = (f"{base_url}/api/reservations?stream=1"
+           f"&from={day:%Y-%m-%d}&to={day + timedelta(days=1):%Y-%m-%d}")
+    status, body = call('GET', url)
+    if status != 200:
+        raise SystemExit(f"Rezervasyon listesi alınamadı: HTTP {status}")
+    by_table = {}
+    for line in body.decode().splitlines():
+        row = json.loads(line)
+        if row.get('status') not in AVAILABILITY_ACTIVE_STATUSES:
+            continue
+        start = _parse_time(row['reservation_time'])
+        by_table.setdefault(row['table_id'], []).append((start, row['reservation_id']))
+
+    duration = timedelta(minutes=RESERVATION_DURATION_MINUTES)
+    overlaps = []
+    for table_id, bookings in by_table.items():
+        bookings.sort()
+        for (a_start, a_id), (b_start, b_id) in zip(bookings, bookings[1:]):
+            if b_start - a_start < duration:
+                overlaps.append((table_id, a_id, b_id))
+    return overlaps
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Reservation burst load test')
+    parser.add_argument('--url', default='http://localhost:5000')
+    parser.add_argument('--threads', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--tables', default='1,2,3,4,7', help='Virgülle ayrılmış table_id listesi')
+    parser.add_argument('--slots', type=int, default=6, help='Denenecek başlangıç saati sayısı')
+    parser.add_argument('--date', default=None, help='YYYY-MM-DD (varsayılan: bir yıl sonrası)')
+    parser.add_argument('--customer-id', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--cleanup', action='store_true', help='Oluşturulan rezervasyonları iptal et')
+    args = parser.parse_args()
+
+    base_url = args.url.rstrip('/')
+    day = (datetime.strptime(args.date, '%Y-%m-%d') if args.date
+           else datetime.combine(datetime.now().date() + timedelta(days=365), datetime.min.time()))
+    tables = [int(t) for t in args.tables.split(',')]
+    # 30 dakika arayla başlayan saatler: birbirleriyle çakışan talepler
+    slots = [day.replace(hour=19) + timedelta(minutes=30 * i) for i in range(args.slots)]
+    rng = random.Random(args.seed)
+    jobs = [(rng.choice(tables), rng.choice(slots)) for _ in range(args.requests)]
+
+    print(f"{args.requests} istek, {args.threads} thread, {len(tables)} masa x {len(slots)} saat ({day:%Y-%m-%d})")
+    began = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        results = list(pool.map(lambda job: book(base_url, args.customer_id, *job), jobs))
+    wall = time.perf_counter() - began
+
+    statuses = {}
+    for status, _, _ in results:
+        statuses[status] = statuses.get(status, 0) + 1
+    latencies = sorted(elapsed for _, elapsed, _ in results)
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0
+    print(f"Süre {wall:.2f} s, {len(results) / wall:.1f} istek/s")
+    print(f"Gecikme p50 {statistics.median(latencies) * 1000:.1f} ms, p95 {p95 * 1000:.1f} ms")
+    print("HTTP durumları: " + ", ".join(f"{k}={v}" for k, v in sorted(statuses.items())))
+
+    overlaps = find_double_bookings(base_url, day)
+    if overlaps:
+        print(f"DOUBLE BOOKING: {len(overlaps)} çakışma")
+        for table_id, a_id, b_id in overlaps[:20]:
+            print(f"  masa {table_id}: rezervasyon {a_id} <-> {b_id}")
+    else:
+        print("Double booking yok.")
+
+    if args.cleanup:
+        created = [rid for _, _, rid in results if rid]
+        for rid in created:
+            call('PUT', f"{base_url}/api/reservations/{rid}", {'status': 'Cancelled'})
+        print(f"{len(created)} rezervasyon iptal edildi.")
+
+    if overlaps:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,526 @@
+# Endpoint Latency Benchmark Suite
+# menu, customers, reservations, orders, reports, feedback ve sessions blueprint'lerindeki
+# her route'u karışık bir iş yüküyle çalıştırır; route başına p50/p95/p99 gecikme, throughput (istek/sn),
+# istek başına SQL sayısı (X-Query-Count) ve veritabanı süresi (Server-Timing) raporlanır.
+#
+#   cd backend
+#   python -m benchmarks.suite --duration 60 --threads 8 --save baselines/main.json
+#   python -m benchmarks.suite --duration 60 --threads 8 --compare baselines/main.json
+#
+# --compare verilirse sonuçlar baseline ile karşılaştırılır; bir route'un --metric değeri
+# (varsayılan p95) --max-regression oranından fazla kötüleşirse veya istek başına SQL sayısı
+# artarsa çıkış kodu 1 olur. Tek tek route'lar için --route-margin reports.get_daily_revenue=0.5.
+#
+# İş yükleri: mixed (okuma ağırlıklı, gerçekçi oranlar), read (sadece GET), write (sadece yazma),
+# uniform (her route eşit). Varsayılan olarak uygulama process içinde (test client) çalışır;
+# --url ile çalışan bir sunucuya (ör. gunicorn -w 4) HTTP üzerinden yük verilir.
+#
+# Yazma senaryoları yalnızca benchmark müşterileri (@benchmark.invalid) üzerinde çalışır;
+# bunlar ve tüm geçmişleri sonunda silinir. Anlamlı sonuçlar için önce veri üretin:
+#   python -m benchmarks.generate_dataset --scale medium --reset
+import argparse
+import http.client
+import itertools
+import json
+import math
+import os
+import random
+import re
+import subprocess
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+
+from models import rollups
+from models.database import execute_query, transaction
+
+# 'stream' (SSE) yok: bağlantı açık kaldığı için istek gecikmesi ölçülemez
+BLUEPRINTS = ('menu', 'customers', 'reservations', 'orders', 'reports', 'feedback', 'sessions')
+BENCH_DOMAIN = 'benchmark.invalid'
+# Benchmark rezervasyonları gerçek verilerle çakışmasın diye uzak bir tarihte
+BENCH_DAY = datetime(2099, 1, 1)
+_DB_TIMING_RE = re.compile(r'db;dur=([\d.]+)')
+
+
+# --- İSTEMCİLER ---
+
+class InProcessClient:
+    """Flask test client (thread başına bir tane)"""
+
+    def __init__(self, app):
+        self._client = app.test_client()
+
+    def request(self, method, path, body=None):
+        response = self._client.open(path, method=method, json=body,
+                                     headers={'Accept': 'application/json'})
+        response.get_data()
+        return response.status_code, response.headers
+
+
+class HttpClient:
+    """Keep-alive HTTP bağlantısı (thread başına bir tane)"""
+
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        self._conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=60)
+
+    def request(self, method, path, body=None):
+        headers = {'Accept': 'application/json'}
+        data = None
+        if body is not None:
+            data = json.dumps(body)
+            headers['Content-Type'] = 'application/json'
+        try:
+            self._conn.request(method, path, body=data, headers=headers)
+            response = self._conn.getresponse()
+        except (http.client.HTTPException, OSError):
+            self._conn.close()   # bir sonraki istekte yeniden bağlanır
+            return 0, {}
+        response.read()
+        return response.status, response.headers
+
+
+# --- FIXTURE'LAR ---
+
+class Fixtures:
+    """Senaryoların kullandığı gerçek id'ler + benchmark müşterisi/oturumu"""
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.lock = threading.Lock()
+        self.slot = itertools.count()
+        self.status_toggle = itertools.count()
+        self.tag = uuid.uuid4().hex[:8]
+
+    def load(self):
+        def ids(query):
+            return [row[next(iter(row))] for row in execute_query(query) or []]
+
+        self.customer_ids = ids("SELECT customer_id FROM DIETARYRESTRICTIONS LIMIT 500") or [1]
+        self.category_ids = ids("SELECT category_id FROM CATEGORIES") or [1]
+        self.item_ids = ids("SELECT item_id FROM MENUITEMS") or [1]
+        self.table_ids = ids("SELECT table_id FROM TABLES")
+        self.staff_ids = ids("SELECT staff_id FROM STAFF LIMIT 50")
+        self.order_ids = ids("SELECT order_id FROM ORDERS ORDER BY order_id DESC LIMIT 2000") or [1]
+        latest = execute_query("SELECT MAX(start_time) AS latest FROM DININGSESSIONS")
+        self.latest = (latest[0]['latest'] if latest and latest[0]['latest'] else datetime.now())
+        if not self.table_ids or not self.staff_ids:
+            raise SystemExit("TABLES/STAFF boş: önce veri yükleyin (benchmarks.generate_dataset)")
+
+        # Yazma senaryoları için benchmark müşterisi, rezervasyonu ve oturumu
+        with transaction() as cursor:
+            cursor.execute("INSERT INTO CUSTOMERS (full_name, email, total_ltv, vip_status) "
+                           "VALUES (%s, %s, 0, FALSE)", ('Benchmark Runner', self.email()))
+            self.bench_customer = cursor.lastrowid
+            table_id = self.table_ids[0]
+            cursor.execute("INSERT INTO RESERVATIONS (customer_id, table_id, reservation_time, party_size, status) "
+                           "VALUES (%s, %s, %s, 2, 'Completed')", (self.bench_customer, table_id, self.latest))
+            rollups.on_reservation_created(cursor, table_id)
+            self.bench_completed = cursor.lastrowid
+            cursor.execute("INSERT INTO DININGSESSIONS (reservation_id, start_time) VALUES (%s, %s)",
+                           (self.bench_completed, self.latest))
+            self.bench_session = cursor.lastrowid
+            rollups.on_session_created(cursor, self.bench_session)
+            # Durum güncelleme senaryosu için uzak tarihli rezervasyon
+            cursor.execute("INSERT INTO RESERVATIONS (customer_id, table_id, reservation_time, party_size, status) "
+                           "VALUES (%s, %s, %s, 2, 'Pending')",
+                           (self.bench_customer, table_id, BENCH_DAY - timedelta(days=1)))
+            self.bench_reservation = cursor.lastrowid
+            rollups.on_reservation_created(cursor, table_id)
+
+    def email(self):
+        return f"bench-{self.tag}@{BENCH_DOMAIN}"
+
+    def pick(self, values):
+        with self.lock:
+            return self.rng.choice(values)
+
+    def next_slot(self):
+        """Çakışmayan (masa, zaman): günde masa başına 4 slot"""
+        k = next(self.slot)
+        table_id = self.table_ids[k % len(self.table_ids)]
+        k //= len(self.table_ids)
+        return table_id, BENCH_DAY + timedelta(days=k // 4, hours=11 + 3 * (k % 4))
+
+    def new_customers(self, count):
+        """Silme senaryoları için müşteri oluştur (zamanlamaya dahil değil)"""
+        ids = []
+        with transaction() as cursor:
+            for _ in range(count):
+                cursor.execute("INSERT INTO CUSTOMERS (full_name, email, total_ltv, vip_status) "
+                               "VALUES (%s, %s, 0, FALSE)", ('Benchmark Delete', self.email()))
+                ids.append(cursor.lastrowid)
+        return ids
+
+    def new_session(self):
+        """Kapatma senaryosu için açık session (zamanlamaya dahil değil)"""
+        with transaction() as cursor:
+            cursor.execute("INSERT INTO DININGSESSIONS (reservation_id, start_time) VALUES (%s, %s)",
+                           (self.bench_completed, self.latest))
+            session_id = cursor.lastrowid
+            rollups.on_session_created(cursor, session_id)
+        return session_id
+
+    def cleanup(self):
+        from routes.customers import delete_customers
+        rows = execute_query("SELECT customer_id FROM CUSTOMERS WHERE email LIKE %s",
+                             (f"%@{BENCH_DOMAIN}",), primary=True) or []
+        ids = [row['customer_id'] for row in rows]
+        for start in range(0, len(ids), 500):
+            delete_customers(ids[start:start + 500])
+        return len(ids)
+
+
+# --- SENARYOLAR ---
+
+class Scenario:
+    """
+    Bir route çağrısı. request(fx, prepared) -> (method, path, body); prepare(fx) zamanlamadan
+    önce çalışır ve sonucu request'e verilir (ör. silinecek müşteriyi oluşturmak).
+    """
+
+    def __init__(self, endpoint, weight, request, prepare=None, ok=(200,), write=False):
+        self.endpoint = endpoint
+        self.weight = weight
+        self.request = request
+        self.prepare = prepare
+        self.ok = ok
+        self.write = write
+
+
+def _get(path):
+    return lambda fx, _=None: ('GET', path(fx) if callable(path) else path, None)
+
+
+def _day(fx, days_back=7):
+    return (fx.latest - timedelta(days=days_back)).strftime('%Y-%m-%d')
+
+
+def _reservation(fx, _):
+    table_id, start = fx.next_slot()
+    return 'POST', '/api/reservations', {'customer_id': fx.bench_customer, 'table_id': table_id,
+                                         'reservation_time': start.isoformat(sep=' '), 'party_size': 2}
+
+
+def _order(fx, _):
+    items = [{'item_id': fx.pick(fx.item_ids), 'quantity': fx.pick((1, 1, 1, 2))} for _ in range(3)]
+    return 'POST', '/api/orders', {'session_id': fx.bench_session, 'staff_id': fx.pick(fx.staff_ids),
+                                   'items': items}
+
+
+def _status(fx, _):
+    status = 'Confirmed' if next(fx.status_toggle) % 2 == 0 else 'Pending'
+    return 'PUT', f'/api/reservations/{fx.bench_reservation}', {'status': status}
+
+
+# Host ekranı aramaları: ön ek, tam ad, yazım hatası, telefon parçası
+SEARCH_QUERIES = ('ahm', 'mehmet', 'ayse yil', 'mehmt', 'yilmz kaya', 'demir', '532', 'zeynep')
+FEEDBACK_QUERIES = ('service', 'slow', 'cold food', 'delicious', 'wait', 'noisy')
+
+SCENARIOS = [
+    Scenario('menu.get_menu', 12, _get('/api/menu')),
+    Scenario('menu.get_categories', 6, _get('/api/menu/categories')),
+    Scenario('menu.get_menu_by_category', 6, _get(lambda fx: f'/api/menu/category/{fx.pick(fx.category_ids)}')),
+    Scenario('customers.get_customers', 4, _get('/api/customers?limit=100')),
+    Scenario('customers.get_vip_customers', 3, _get('/api/customers/vip')),
+    Scenario('customers.get_customer_dietary_restrictions', 4,
+             _get(lambda fx: f'/api/customers/dietary/{fx.pick(fx.customer_ids)}')),
+    Scenario('customers.search_customers', 6,
+             _get(lambda fx: f'/api/customers/search?q={fx.pick(SEARCH_QUERIES)}')),
+    Scenario('customers.create_customer', 1,
+             lambda fx, _: ('POST', '/api/customers', {'full_name': 'Benchmark Create', 'email': fx.email()}),
+             ok=(201,), write=True),
+    Scenario('customers.delete_customer', 0.5,
+             lambda fx, ids: ('DELETE', f'/api/customers/{ids[0]}', None),
+             prepare=lambda fx: fx.new_customers(1), write=True),
+    Scenario('customers.bulk_delete_customers', 0.2,
+             lambda fx, ids: ('POST', '/api/customers/bulk-delete', {'customer_ids': ids}),
+             prepare=lambda fx: fx.new_customers(20), write=True),
+    Scenario('reservations.get_reservations', 4,
+             _get(lambda fx: f'/api/reservations?from={_day(fx)}&limit=100')),
+    Scenario('reservations.get_pending_reservations', 3, _get('/api/reservations/pending')),
+    Scenario('reservations.get_confirmed_reservations', 3, _get('/api/reservations/confirmed')),
+    Scenario('reservations.get_availability', 8,
+             _get(lambda fx: f'/api/reservations/availability?party_size={fx.pick((2, 2, 4, 6))}'
+                             f'&time={(datetime.now() + timedelta(days=fx.pick(range(1, 14)))):%Y-%m-%d} 20:00')),
+    Scenario('reservations.create_reservation', 2, _reservation, ok=(201,), write=True),
+    Scenario('reservations.update_reservation_status', 1, _status, write=True),
+    Scenario('orders.get_orders', 4, _get(lambda fx: f'/api/orders?from={_day(fx, 1)}&limit=100')),
+    Scenario('orders.get_order_details', 6, _get(lambda fx: f'/api/orders/{fx.pick(fx.order_ids)}/details')),
+    Scenario('orders.create_order', 3, _order, ok=(201,), write=True),
+    Scenario('sessions.close_session', 0.5,
+             lambda fx, session_id: ('POST', f'/api/sessions/{session_id}/close', None),
+             prepare=lambda fx: fx.new_session(), write=True),
+    Scenario('reports.get_top_customer_orders', 1, _get('/api/reports/top-customer-orders')),
+    Scenario('reports.get_customer_spending', 1, _get('/api/reports/customer-spending')),
+    Scenario('reports.classify_customers', 1, _get('/api/reports/customer-classification')),
+    Scenario('reports.get_table_performance', 1, _get('/api/reports/table-performance')),
+    Scenario('reports.get_customer_first_last_visit', 1, _get('/api/reports/customer-first-last-visit')),
+    Scenario('reports.get_top_menu_items', 1, _get('/api/reports/top-menu-items')),
+    Scenario('reports.get_staff_performance', 1, _get('/api/reports/staff-performance')),
+    Scenario('reports.get_daily_revenue', 1, _get('/api/reports/daily-revenue')),
+    Scenario('reports.get_reservation_status_analysis', 1, _get('/api/reports/reservation-status-analysis')),
+    Scenario('reports.get_peak_day_sessions', 1, _get('/api/reports/peak-day-sessions')),
+    Scenario('feedback.get_feedback', 3, _get('/api/feedback?limit=100')),
+    Scenario('feedback.get_rating_summary', 4, _get('/api/feedback/rating-summary')),
+    Scenario('feedback.get_ratings', 2,
+             _get(lambda fx: f"/api/feedback/ratings?window={fx.pick(('day', 'week', 'month'))}"
+                             f"&by={fx.pick(('all', 'table', 'staff'))}")),
+    Scenario('feedback.search_feedback', 2,
+             _get(lambda fx: f'/api/feedback/search?q={fx.pick(FEEDBACK_QUERIES)}')),
+    Scenario('feedback.create_feedback', 2,
+             lambda fx, _: ('POST', '/api/feedback', {'session_id': fx.bench_session,
+                                                      'rating': fx.pick((3, 4, 5)), 'comment': 'benchmark'}),
+             ok=(201,), write=True),
+]
+
+
+def workload(name):
+    if name == 'read':
+        return [s for s in SCENARIOS if not s.write]
+    if name == 'write':
+        return [s for s in SCENARIOS if s.write]
+    if name == 'uniform':
+        return [Scenario(s.endpoint, 1, s.request, s.prepare, s.ok, s.write) for s in SCENARIOS]
+    return SCENARIOS
+
+
+def check_coverage(app):
+    """Blueprint'lerdeki her route'un bir senaryosu olmalı (yeni route eklenince suite de güncellenir)"""
+    endpoints = {rule.endpoint for rule in app.url_map.iter_rules()
+                 if rule.endpoint.split('.')[0] in BLUEPRINTS}
+    covered = {s.endpoint for s in SCENARIOS}
+    missing = sorted(endpoints - covered)
+    if missing:
+        raise SystemExit(f"Senaryosu olmayan route'lar: {', '.join(missing)}")
+    unknown = sorted(covered - endpoints)
+    if unknown:
+        raise SystemExit(f"Bilinmeyen endpoint'ler: {', '.join(unknown)}")
+
+
+# --- ÇALIŞTIRMA ---
+
+class Sample:
+    __slots__ = ('endpoint', 'latency', 'ok', 'queries', 'db_ms')
+
+    def __init__(self, endpoint, latency, ok, queries, db_ms):
+        self.endpoint = endpoint
+        self.latency = latency
+        self.ok = ok
+        self.queries = queries
+        self.db_ms = db_ms
+
+
+def worker(client, fx, scenarios, weights, rng, warmup_until, stop_at, samples):
+    while True:
+        now = time.perf_counter()
+        if now >= stop_at:
+            return
+        scenario = rng.choices(scenarios, weights)[0]
+        prepared = scenario.prepare(fx) if scenario.prepare else None
+        method, path, body = scenario.request(fx, prepared)
+        started = time.perf_counter()
+        status, headers = client.request(method, path, body)
+        latency = time.perf_counter() - started
+        if started < warmup_until:
+            continue
+        queries = headers.get('X-Query-Count')
+        timing = _DB_TIMING_RE.search(headers.get('Server-Timing', '') or '')
+        samples.append(Sample(scenario.endpoint, latency, status in scenario.ok,
+                              int(queries) if queries is not None else None,
+                              float(timing.group(1)) if timing else None))
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile"""
+    if not sorted_values:
+        return None
+    return sorted_values[max(0, math.ceil(p * len(sorted_values)) - 1)]
+
+
+def summarize(samples, duration):
+    def stats(group):
+        latencies = sorted(s.latency * 1000 for s in group)
+        queries = [s.queries for s in group if s.queries is not None]
+        db_times = [s.db_ms for s in group if s.db_ms is not None]
+        return {
+            "count": len(group),
+            "rps": round(len(group) / duration, 2),
+            "errors": sum(1 for s in group if not s.ok),
+            "p50_ms": round(percentile(latencies, 0.50), 3),
+            "p95_ms": round(percentile(latencies, 0.95), 3),
+            "p99_ms": round(percentile(latencies, 0.99), 3),
+            "mean_ms": round(sum(latencies) / len(latencies), 3),
+            "queries_per_request": round(sum(queries) / len(queries), 2) if queries else None,
+            "db_ms": round(sum(db_times) / len(db_times), 3) if db_times else None,
+        }
+
+    by_endpoint = {}
+    for sample in samples:
+        by_endpoint.setdefault(sample.endpoint, []).append(sample)
+    return {
+        "total": stats(samples) if samples else None,
+        "routes": {endpoint: stats(group) for endpoint, group in sorted(by_endpoint.items())},
+    }
+
+
+def dataset_fingerprint():
+    """Baseline'lar yalnızca aynı hacimdeki veriyle karşılaştırılabilir"""
+    counts = {}
+    for table in ('CUSTOMERS', 'RESERVATIONS', 'DININGSESSIONS', 'ORDERS', 'ORDERDETAILS', 'FEEDBACK'):
+        rows = execute_query(f"SELECT COUNT(*) AS n FROM {table}")
+        counts[table] = rows[0]['n'] if rows else None
+    return counts
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def print_results(result):
+    print(f"\n{'route':<46} {'n':>6} {'rps':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'sql/req':>7} "
+          f"{'db ms':>7} {'err':>4}")
+    rows = list(result["routes"].items()) + [("TOTAL", result["total"])]
+    for endpoint, s in rows:
+        qpr = '-' if s["queries_per_request"] is None else f"{s['queries_per_request']:.2f}"
+        db = '-' if s["db_ms"] is None else f"{s['db_ms']:.2f}"
+        print(f"{endpoint:<46} {s['count']:>6} {s['rps']:>7.1f} {s['p50_ms']:>8.2f} {s['p95_ms']:>8.2f} "
+              f"{s['p99_ms']:>8.2f} {qpr:>7} {db:>7} {s['errors']:>4}")
+
+
+# --- BASELINE KARŞILAŞTIRMA ---
+
+def compare(result, baseline, metric, margin, route_margins, min_samples, min_delta_ms):
+    """Regresyon listesi: (route, açıklama)"""
+    if baseline.get("dataset") != result["dataset"]:
+        print(f"\n⚠️  Veri seti baseline'dan farklı: {baseline.get('dataset')} -> {result['dataset']}")
+
+    regressions = []
+    print(f"\n{'route':<46} {'base ' + metric:>12} {'now':>10} {'change':>8}  sql/req")
+    for endpoint, current in result["routes"].items():
+        base = baseline["routes"].get(endpoint)
+        if base is None or current["count"] < min_samples or base["count"] < min_samples:
+            continue
+        allowed = route_margins.get(endpoint, margin)
+        before, now = base[metric], current[metric]
+        change = now / before - 1 if before else 0.0
+        flag = ''
+        if change > allowed and now - before > min_delta_ms:
+            regressions.append((endpoint, f"{metric} {before:.2f} -> {now:.2f} ms (+{change:.0%}, "
+                                          f"izin verilen +{allowed:.0%})"))
+            flag = '  REGRESSION'
+        qb, qn = base.get("queries_per_request"), current.get("queries_per_request")
+        if qb is not None and qn is not None and qn > qb * (1 + allowed) + 0.5:
+            regressions.append((endpoint, f"sql/req {qb:.2f} -> {qn:.2f}"))
+            flag = '  REGRESSION'
+        if current["errors"] and not base["errors"]:
+            regressions.append((endpoint, f"{current['errors']} hatalı yanıt (baseline: 0)"))
+            flag = '  REGRESSION'
+        queries = f"{qb} -> {qn}" if qb != qn else f"{qn}"
+        print(f"{endpoint:<46} {before:>12.2f} {now:>10.2f} {change:>+8.0%}  {queries}{flag}")
+    return regressions
+
+
+def parse_route_margin(value):
+    endpoint, _, margin = value.partition('=')
+    try:
+        return endpoint, float(margin)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"route=oran bekleniyor: {value}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Endpoint gecikme benchmark suite')
+    parser.add_argument('--duration', type=float, default=30, help='Ölçüm süresi (saniye)')
+    parser.add_argument('--warmup', type=float, default=5, help='Ölçüme dahil edilmeyen ısınma (saniye)')
+    parser.add_argument('--threads', type=int, default=4, help='Eşzamanlı istemci sayısı')
+    parser.add_argument('--workload', choices=('mixed', 'read', 'write', 'uniform'), default='mixed')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--url', help='Çalışan sunucu (ör. http://localhost:5000); yoksa process içi')
+    parser.add_argument('--save', metavar='PATH', help='Sonuçları JSON baseline olarak yaz')
+    parser.add_argument('--compare', metavar='PATH', help='Baseline ile karşılaştır (regresyonda exit 1)')
+    parser.add_argument('--metric', choices=('p50_ms', 'p95_ms', 'p99_ms', 'mean_ms'), default='p95_ms')
+    parser.add_argument('--max-regression', type=float, default=0.15, help='İzin verilen kötüleşme (0.15 = %%15)')
+    parser.add_argument('--route-margin', type=parse_route_margin, action='append', default=[],
+                        metavar='ENDPOINT=ORAN', help='Route bazında izin verilen kötüleşme')
+    parser.add_argument('--min-samples', type=int, default=30, help='Daha az örneği olan route karşılaştırılmaz')
+    parser.add_argument('--min-delta-ms', type=float, default=1.0, help='Bu farkın altı gürültü sayılır')
+    args = parser.parse_args()
+
+    from app import app
+    check_coverage(app)
+    if args.url:
+        make_client = lambda: HttpClient(args.url)
+    else:
+        make_client = lambda: InProcessClient(app)
+
+    scenarios = workload(args.workload)
+    weights = [s.weight for s in scenarios]
+    fx = Fixtures(random.Random(args.seed))
+    fx.load()
+    dataset = dataset_fingerprint()
+
+    print(f"{args.workload}: {len(scenarios)} route, {args.threads} thread, "
+          f"{args.warmup:.0f}+{args.duration:.0f} sn, {'HTTP ' + args.url if args.url else 'process içi'}")
+    samples = []
+    started = time.perf_counter()
+    warmup_until = started + args.warmup
+    stop_at = warmup_until + args.duration
+    threads = [threading.Thread(target=worker, args=(make_client(), fx, scenarios, weights,
+                                                     random.Random(args.seed * 1000 + i),
+                                                     warmup_until, stop_at, samples))
+               for i in range(args.threads)]
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        removed = fx.cleanup()
+        print(f"Benchmark verisi silindi ({removed} müşteri)")
+
+    if not samples:
+        raise SystemExit("Ölçüm yok: --duration'ı artırın")
+    result = {
+        "created_at": datetime.now().isoformat(timespec='seconds'),
+        "git_revision": git_revision(),
+        "workload": args.workload,
+        "threads": args.threads,
+        "duration": args.duration,
+        "mode": "http" if args.url else "in-process",
+        "dataset": dataset,
+        **summarize(samples, args.duration),
+    }
+    print_results(result)
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        print(f"\nBaseline yazıldı: {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('dataset') != dataset:
+            print(f"\nUyarı: baseline farklı bir veri setiyle ölçülmüş ({baseline.get('dataset')})")
+        if baseline.get('workload') != args.workload or baseline.get('mode') != result['mode']:
+            print(f"Uyarı: baseline {baseline.get('workload')}/{baseline.get('mode')} ile ölçülmüş")
+        regressions = compare(result, baseline, args.metric, args.max_regression,
+                              dict(args.route_margin), args.min_samples, args.min_delta_ms)
+        if regressions:
+            print("\nRegresyonlar:")
+            for endpoint, reason in regressions:
+                print(f"  {endpoint}: {reason}")
+            raise SystemExit(1)
+        print("\nBaseline'a göre regresyon yok.")
+
+
+if __name__ == '__main__':
+    main()
@@ -8,6 +8,112 @@ DB_CONFIG = {
     'database': 'GastroMind_DB'
 }
 
+# Connection Pool
+DB_POOL_SIZE = 5            # Boşta tutulan kalıcı bağlantı sayısı
+DB_POOL_MAX_OVERFLOW = 10   # Yoğunlukta açılabilecek ek bağlantı sayısı
+DB_POOL_TIMEOUT = 10        # Havuz doluyken bekleme süresi (saniye)
+DB_POOL_RECYCLE = 3600      # Bu yaştan eski bağlantılar yenilenir (saniye)
+DB_POOL_PRE_PING = 30       # Bu süreden uzun boşta kalan bağlantı ping'lenir (saniye)
+DB_STATEMENT_CACHE_SIZE = 64  # Bağlantı başına server-side prepared statement (LRU, 0: kapalı)
+
+# Read replica'lar (models/replicas.py) - boşsa tüm sorgular primary'ye (DB_CONFIG) gider
+DB_REPLICAS = []                  # ör. [{'host': 'localhost', 'port': 3307}] (DB_CONFIG'in üzerine yazılır)
+DB_REPLICA_POOL_SIZE = 5          # Replica başına kalıcı bağlantı sayısı
+DB_REPLICA_CHECK_INTERVAL = 5     # Bağlantı + replikasyon gecikmesi kontrol aralığı (saniye)
+DB_REPLICA_MAX_LAG = 5            # Bundan fazla geride kalan replica kullanılmaz (saniye, None: kontrol yok)
+DB_READ_YOUR_WRITES_SECONDS = 10  # Yazan istemcinin okumaları bu süre primary'ye gider (>= MAX_LAG + CHECK_INTERVAL)
+
+# List endpoint'leri için keyset sayfalama
+PAGE_DEFAULT_LIMIT = 100    # limit parametresi verilmezse
+PAGE_MAX_LIMIT = 1000
+
+# NDJSON streaming (Accept: application/x-ndjson veya ?stream=1)
+STREAM_BATCH_SIZE = 500     # fetchmany() başına satır sayısı
+
+# Query result cache (execute_query(..., cached=True))
+QUERY_CACHE_MAX_BYTES = 32 * 1024 * 1024   # LRU bellek bütçesi
+QUERY_CACHE_DEFAULT_TTL = 300              # Kayıt ömrü (saniye)
+
+# POST /api/customers/bulk-delete
+BULK_DELETE_CHUNK_SIZE = 200   # Transaction başına müşteri sayısı
+BULK_DELETE_MAX_IDS = 10000    # İstek başına en fazla id
+
+# Rezervasyon müsaitlik index'i (models/availability.py)
+RESERVATION_DURATION_MINUTES = 120                # Bir rezervasyonun masayı kapladığı süre
+AVAILABILITY_ACTIVE_STATUSES = ('Pending', 'Confirmed')
+AVAILABILITY_RELOAD_SECONDS = 300                 # Diğer process'lerin yazmaları için tam yenileme
+
+# Müşteri arama index'i (models/customer_search.py, GET /api/customers/search)
+CUSTOMER_SEARCH_RELOAD_SECONDS = 300   # Diğer process'lerin yazmaları için tam yenileme
+CUSTOMER_SEARCH_MAX_LIMIT = 50         # ?limit üst sınırı (varsayılan 20)
+
+# GET /api/feedback/search (FULLTEXT, database/migrations/002_feedback_search.sql)
+FEEDBACK_SEARCH_MAX_LIMIT = 200   # ?limit üst sınırı (varsayılan 50)
+
+# Müşteri LTV / ziyaret istatistikleri (models/customer_stats.py)
+VIP_LTV_THRESHOLD = 10000          # Bu LTV'yi geçen müşteri otomatik VIP olur (None: kapalı)
+CUSTOMER_STATS_CHUNK_SIZE = 1000   # recompute-customer-stats transaction başına müşteri
+
+# Canlı değişiklik akışı (models/events.py, GET /api/stream)
+EVENT_BUFFER_SIZE = 1000        # Last-Event-ID ile tekrar oynatılabilecek son olay sayısı
+EVENT_MAX_SUBSCRIBERS = 200     # Process başına açık SSE bağlantısı (her biri bir thread tutar)
+EVENT_HEARTBEAT_SECONDS = 15    # Olay yoksa bu aralıkla keepalive yorumu gönderilir
+EVENT_RETRY_MS = 2000           # EventSource yeniden bağlanma gecikmesi
+
+# GET /api/dashboard
+DASHBOARD_MAX_WORKERS = 4   # Paralel widget sayısı (DB_POOL_SIZE'ı aşmamalı)
+DASHBOARD_TIMEOUT = 10      # Bu sürede bitmeyen widget'lar hata olarak döner (saniye)
+
+# Arka planda önceden hesaplanan raporlar (models/report_scheduler.py)
+REPORT_SCHEDULER_ENABLED = True   # False: periyodik yenileme yok, raporlar ilk istekte hesaplanır
+REPORT_REFRESH_WORKERS = 2        # Aynı anda hesaplanabilecek rapor sayısı
+REPORT_FIRST_LOAD_TIMEOUT = 30    # Henüz snapshot yokken isteğin bekleyeceği süre (saniye)
+REPORT_DEFAULT_REFRESH = 300      # Aşağıda olmayan raporlar için yenileme aralığı (saniye)
+REPORT_MIN_REFRESH = 60           # Okunan tablolara yazılınca yenileme için snapshot'ın en az yaşı (saniye)
+REPORT_REFRESH_INTERVALS = {      # Rapor adı -> yenileme aralığı (saniye)
+    'top-customer-orders': 300,
+    'customer-spending': 300,
+    'customer-classification': 600,
+    'table-performance': 120,
+    'customer-first-last-visit': 600,
+    'reservation-status-analysis': 120,
+    'peak-day-sessions': 300,
+}
+
+# Yanıt sıkıştırma (routes/compression.py) + frontend statik dosyaları (/app)
+COMPRESS_MIN_SIZE = 1024          # Bu boyuttan küçük yanıtlar sıkıştırılmaz (byte)
+COMPRESS_GZIP_LEVEL = 6
+COMPRESS_BROTLI_QUALITY = 5       # Dinamik yanıtlar; statik dosyalar açılışta en yüksek seviyede sıkıştırılır
+COMPRESS_MIMETYPES = ('application/json', 'application/x-ndjson', 'text/plain', 'text/html',
+                      'text/css', 'application/javascript', 'image/svg+xml')
+FRONTEND_DIR = '../frontend'      # backend/ klasörüne göre
+STATIC_MAX_AGE = 31536000         # ?v=<hash>'li css/js (immutable, 1 yıl)
+STATIC_FILE_MAX_AGE = 86400       # Resimler vb. (saniye)
+
+# Resim varyantları (routes/images.py, /img/...)
+IMAGE_VARIANTS = {'thumb': 160, 'card': 640, 'full': 1600}   # Varyant -> en fazla genişlik (px)
+IMAGE_WEBP_QUALITY = 80
+IMAGE_CACHE_DIR = '.image_cache'  # backend/ klasörüne göre
+IMAGE_WORKERS = 2                 # Aynı anda üretilebilecek varyant sayısı
+IMAGE_TIMEOUT = 20                # Varyant üretimini bekleme süresi (saniye)
+
+# SQL instrumentation + GET /metrics
+SLOW_QUERY_MS = 200         # Bu süreyi aşan statement'lar loglanır (milisaniye)
+SQL_REPEAT_WARN = 10        # Aynı statement bir istekte bu kadar çalışırsa N+1 uyarısı
+
+# HTTP caching (ETag + Cache-Control)
+ETAG_MAX_AGE = 300          # ETag'ler en fazla bu kadar saniye geçerli (diğer process'lerin yazmaları için)
+CACHE_CONTROL_POLICIES = {  # Blueprint adı -> Cache-Control
+    'menu': 'public, max-age=60',
+    'reports': 'private, no-cache',
+    'customers': 'private, no-cache',
+    'reservations': 'private, no-cache',
+    'orders': 'private, no-cache',
+    'feedback': 'private, no-cache',
+    'sessions': 'private, no-cache',
+    'dashboard': 'private, no-cache',
+}
+
 # Flask Config
 FLASK_ENV = 'development'
 DEBUG = True
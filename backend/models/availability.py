@@ -0,0 +1,305 @@
+# Reservation Availability Index
+# Aktif (Pending/Confirmed) rezervasyonların masa başına sıralı başlangıç zamanları bellekte
+# tutulur. Her rezervasyon [reservation_time, reservation_time + RESERVATION_DURATION) aralığını
+# kaplar; süre sabit olduğu için çakışma kontrolü tek bir bisect ile yapılır (O(log n)).
+#
+# Birleştirilmiş masalar: TABLECOMBINATIONS (parent, child) çiftinde iki masa da is_combinable
+# ise birlikte satılabilir. Parent masaya, kapasitesini aşan bir grup için yapılan rezervasyon
+# child masayı da kaplar.
+#
+# Index rezervasyon yazma yollarından güncellenir (reservation_added / refresh_reservation).
+# Başka bir yoldan (ör. müşteri silme cascade'i, başka process) RESERVATIONS, TABLES veya
+# TABLECOMBINATIONS değişirse tablo versiyonları (models/query_cache.py) farklılaşır ve
+# sonraki okumada index veritabanından yeniden yüklenir. AVAILABILITY_RELOAD_SECONDS
+# diğer process'lerin yazmaları için üst sınırdır.
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+
+from config import (RESERVATION_DURATION_MINUTES, AVAILABILITY_ACTIVE_STATUSES,
+                    AVAILABILITY_RELOAD_SECONDS)
+from models.database import execute_query, table_versions, versions_after_write
+
+DURATION = timedelta(minutes=RESERVATION_DURATION_MINUTES)
+_WATCHED_TABLES = ('RESERVATIONS', 'TABLES', 'TABLECOMBINATIONS')
+
+
+class AvailabilityError(Exception):
+    """Index veritabanından yüklenemedi"""
+
+
+class _Table:
+    __slots__ = ('table_id', 'capacity', 'location_zone', 'is_combinable', 'partners', 'starts', 'ids')
+
+    def __init__(self, table_id, capacity, location_zone, is_combinable):
+        self.table_id = table_id
+        self.capacity = capacity or 0
+        self.location_zone = location_zone
+        self.is_combinable = bool(is_combinable)
+        self.partners = []   # bu masa parent iken birleştirilebilen child masalar
+        self.starts = []     # sıralı reservation_time listesi
+        self.ids = []        # starts ile aynı sırada reservation_id
+
+    def conflicts(self, start):
+        """start'ta başlayacak bir rezervasyonla çakışan reservation_id'ler"""
+        # Çakışma: |s - start| < DURATION  <=>  start - DURATION < s < start + DURATION
+        i = bisect_right(self.starts, start - DURATION)
+        found = []
+        while i < len(self.starts) and self.starts[i] < start + DURATION:
+            found.append(self.ids[i])
+            i += 1
+        return found
+
+    def is_free(self, start):
+        i = bisect_right(self.starts, start - DURATION)
+        return i >= len(self.starts) or self.starts[i] >= start + DURATION
+
+    def add(self, start, reservation_id):
+        i = bisect_right(self.starts, start)
+        self.starts.insert(i, start)
+        self.ids.insert(i, reservation_id)
+
+    def remove(self, start, reservation_id):
+        i = bisect_left(self.starts, start)
+        while i < len(self.starts) and self.starts[i] == start:
+            if self.ids[i] == reservation_id:
+                del self.starts[i]
+                del self.ids[i]
+                return
+            i += 1
+
+
+class AvailabilityIndex:
+    """Thread-safe, masa başına aralık index'i"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._tables = {}
+        self._reservations = {}   # reservation_id -> (start, occupied table_id'leri)
+        self._versions = None
+        self._loaded_at = 0.0
+        self._stale = True
+
+    # --- YÜKLEME ---
+
+    def invalidate(self):
+        with self._lock:
+            self._stale = True
+
+    def _ensure_fresh(self):
+        if (self._stale or self._versions != table_versions(_WATCHED_TABLES)
+                or time.monotonic() - self._loaded_at > AVAILABILITY_RELOAD_SECONDS):
+            self._load()
+
+    def _load(self):
+        versions = table_versions(_WATCHED_TABLES)
+        # Index yazmalarla senkron tutulur: replica gecikmesi çakışma kontrolünü bozmasın
+        tables = execute_query("SELECT table_id, capacity, location_zone, is_combinable FROM TABLES",
+                               primary=True)
+        combinations = execute_query("SELECT parent_table_id, child_table_id FROM TABLECOMBINATIONS",
+                                     primary=True)
+        placeholders = ", ".join(["%s"] * len(AVAILABILITY_ACTIVE_STATUSES))
+        # idx_reservations_status_time; bitmiş rezervasyonlar çakışma yaratmaz
+        reservations = execute_query(f"""
+            SELECT reservation_id, table_id, reservation_time, party_size
+            FROM RESERVATIONS
+            WHERE status IN ({placeholders}) AND reservation_time > %s
+        """, (*AVAILABILITY_ACTIVE_STATUSES, datetime.now() - DURATION), primary=True)
+        if tables is None or combinations is None or reservations is None:
+            raise AvailabilityError("Müsaitlik bilgisi yüklenemedi")
+
+        self._tables = {
+            row['table_id']: _Table(row['table_id'], row['capacity'], row['location_zone'],
+                                    row['is_combinable'])
+            for row in tables
+        }
+        for row in combinations:
+            parent = self._tables.get(row['parent_table_id'])
+            child = self._tables.get(row['child_table_id'])
+            if parent and child and parent.is_combinable and child.is_combinable:
+                parent.partners.append(child)
+        self._reservations = {}
+        for row in reservations:
+            self._add(row['reservation_id'], row['table_id'], row['party_size'], row['reservation_time'])
+
+        self._versions = versions
+        self._loaded_at = time.monotonic()
+        self._stale = False
+
+    # --- YARDIMCILAR ---
+
+    def _occupied(self, table_id, party_size):
+        """Rezervasyonun kapladığı masalar: kapasite aşılırsa ilk uygun partner de dahil"""
+        table = self._tables.get(table_id)
+        if table is None:
+            return []
+        if party_size and party_size > table.capacity:
+            for partner in table.partners:
+                if table.capacity + partner.capacity >= party_size:
+                    return [table, partner]
+        return [table]
+
+    def _add(self, reservation_id, table_id, party_size, start):
+        # Yeniden yükleme ile senkronizasyon çağrısı yarışabilir; aynı id iki kez eklenmesin
+        self._remove(reservation_id)
+        occupied = self._occupied(table_id, party_size)
+        for table in occupied:
+            table.add(start, reservation_id)
+        self._reservations[reservation_id] = (start, [t.table_id for t in occupied])
+
+    def _remove(self, reservation_id):
+        entry = self._reservations.pop(reservation_id, None)
+        if entry is None:
+            return
+        start, table_ids = entry
+        for table_id in table_ids:
+            table = self._tables.get(table_id)
+            if table is not None:
+                table.remove(start, reservation_id)
+
+    # --- SORGULAR ---
+
+    def conflicts(self, table_id, start, party_size=None):
+        """
+        Bu masaya start zamanında party_size kişilik rezervasyon yapılırsa çakışan
+        reservation_id'ler. Masa yoksa None.
+        """
+        with self._lock:
+            self._ensure_fresh()
+            occupied = self._occupied(table_id, party_size)
+            if not occupied:
+                return None
+            found = []
+            for table in occupied:
+                found.extend(r for r in table.conflicts(start) if r not in found)
+            return found
+
+    def capacity_for(self, table_id, party_size):
+        """Rezervasyonun kapladığı masaların toplam kapasitesi (masa yoksa None)"""
+        with self._lock:
+            self._ensure_fresh()
+            occupied = self._occupied(table_id, party_size)
+            return sum(t.capacity for t in occupied) if occupied else None
+
+    def free_tables(self, party_size, start):
+        """
+        start zamanında party_size kişi için boş seçenekler.
+        (tek masalar, birleştirilmiş masalar) - ikisi de en az boş koltuk kalacak şekilde sıralı.
+        """
+        with self._lock:
+            self._ensure_fresh()
+            singles = [
+                {"table_id": t.table_id, "capacity": t.capacity, "location_zone": t.location_zone}
+                for t in self._tables.values()
+                if t.capacity >= party_size and t.is_free(start)
+            ]
+            combined = []
+            for parent in self._tables.values():
+                if parent.capacity >= party_size or not parent.is_free(start):
+                    continue
+                for child in parent.partners:
+                    capacity = parent.capacity + child.capacity
+                    if capacity >= party_size and child.is_free(start):
+                        combined.append({
+                            "table_id": parent.table_id,
+                            "table_ids": [parent.table_id, child.table_id],
+                            "capacity": capacity,
+                            "location_zone": parent.location_zone,
+                        })
+        singles.sort(key=lambda t: (t["capacity"], t["table_id"]))
+        combined.sort(key=lambda t: (t["capacity"], t["table_id"]))
+        return singles, combined
+
+    # --- TRANSACTION İÇİNDE KESİN KONTROL ---
+
+    def claim(self, cursor, table_id, start, party_size, reservation_id=None):
+        """
+        Rezervasyonun kaplayacağı masaların TABLES satırlarını FOR UPDATE ile kilitler ve
+        veritabanındaki aktif rezervasyonlarla çakışmaları döndürür (masa yoksa None).
+        Aynı masayı isteyen eşzamanlı transaction'lar commit/rollback'e kadar bekler;
+        farklı masalara yapılan rezervasyonlar birbirini beklemez.
+        """
+        with self._lock:
+            self._ensure_fresh()
+            occupied = {t.table_id for t in self._occupied(table_id, party_size)}
+            if not occupied:
+                return None
+            # Birleşik rezervasyonlar parent masaya yazılır; child masayı kaplayan
+            # parent rezervasyonları da okunmalı
+            candidates = occupied | {
+                t.table_id for t in self._tables.values()
+                if any(p.table_id in occupied for p in t.partners)
+            }
+
+        # Kilitler table_id sırasıyla alınır (deadlock olmaması için)
+        locked = sorted(occupied)
+        placeholders = ", ".join(["%s"] * len(locked))
+        cursor.execute(
+            f"SELECT table_id FROM TABLES WHERE table_id IN ({placeholders}) ORDER BY table_id FOR UPDATE",
+            locked
+        )
+        cursor.fetchall()
+
+        tables = sorted(candidates)
+        table_placeholders = ", ".join(["%s"] * len(tables))
+        status_placeholders = ", ".join(["%s"] * len(AVAILABILITY_ACTIVE_STATUSES))
+        # idx_reservations_table_time; locking read snapshot yerine son commit edilmiş
+        # satırları okur (kilidi bizden önce tutan transaction'ın eklediği rezervasyon dahil)
+        cursor.execute(f"""
+            SELECT reservation_id, table_id, party_size FROM RESERVATIONS
+            WHERE table_id IN ({table_placeholders})
+              AND reservation_time > %s AND reservation_time < %s
+              AND status IN ({status_placeholders})
+            LOCK IN SHARE MODE
+        """, (*tables, start - DURATION, start + DURATION, *AVAILABILITY_ACTIVE_STATUSES))
+        conflicts = []
+        with self._lock:
+            for row in cursor.fetchall():
+                if row['reservation_id'] == reservation_id:
+                    continue
+                taken = {t.table_id for t in self._occupied(row['table_id'], row['party_size'])}
+                if taken & occupied:
+                    conflicts.append(row['reservation_id'])
+        return conflicts
+
+    # --- SENKRONİZASYON ---
+
+    def reservation_added(self, reservation_id, table_id, party_size, start):
+        """Yeni rezervasyon commit edildikten sonra çağrılır"""
+        with self._lock:
+            if self._stale:
+                return
+            self._add(reservation_id, table_id, party_size, start)
+            self._absorb_write()
+
+    def refresh_reservation(self, reservation_id):
+        """Rezervasyonun durumu değişti: satırı tekrar oku, index'e ekle veya çıkar"""
+        rows = execute_query("""
+            SELECT reservation_id, table_id, reservation_time, party_size, status
+            FROM RESERVATIONS WHERE reservation_id = %s
+        """, (reservation_id,), primary=True)
+        with self._lock:
+            if self._stale or rows is None:
+                self._stale = True
+                return
+            self._remove(reservation_id)
+            if rows and rows[0]['status'] in AVAILABILITY_ACTIVE_STATUSES:
+                row = rows[0]
+                self._add(row['reservation_id'], row['table_id'], row['party_size'], row['reservation_time'])
+            self._absorb_write()
+
+    def _absorb_write(self):
+        """
+        Kendi RESERVATIONS yazmamızın versiyonunu kaydet. Araya başka bir yazma girdiyse
+        (ör. müşteri silme cascade'i, başka thread'de durum değişikliği) index yeniden yüklenir;
+        tüm snapshot'ı üzerine yazmak o yazmayı görülmüş sayardı.
+        """
+        versions = versions_after_write(self._versions, _WATCHED_TABLES, {'RESERVATIONS'})
+        if versions is None:
+            self._stale = True
+        else:
+            self._versions = versions
+
+
+availability_index = AvailabilityIndex()
@@ -0,0 +1,346 @@
+# Customer Search Index
+# Host ekranındaki müşteri araması (GET /api/customers/search) için full_name, email ve
+# phone alanları bellekte index'lenir; arama veritabanına gitmez.
+#   - Metin Türkçe kurallarıyla küçültülür ve aksanlardan arındırılır ('IŞIK' -> 'isik'),
+#     böylece 'sukru' ile 'Şükrü' eşleşir
+#   - Her sorgu kelimesi bir token ile tam (exact), token başı (prefix) veya yazım hatası
+#     toleranslı (fuzzy) eşleşir; tüm kelimeler eşleşmelidir (AND)
+#   - Fuzzy adaylar token bigram'larından seçilir, ardından edit mesafesi ile doğrulanır
+#   - Rakamlardan oluşan sorgular telefon numarası içinde aranır (trigram index, ülke
+#     kodu / baştaki 0 yok sayılır)
+#
+# Index create_customer / delete_customers yollarından artımlı güncellenir
+# (customer_added / customers_removed); sipariş ve session kapanışındaki LTV/VIP
+# değişiklikleri customer_updated ile yansıtılır. CUSTOMERS başka bir yoldan değişirse tablo
+# versiyonu (models/query_cache.py) farklılaşır ve sonraki aramada index yeniden yüklenir.
+# CUSTOMER_SEARCH_RELOAD_SECONDS diğer process'lerin yazmaları için üst sınırdır.
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+
+from config import CUSTOMER_SEARCH_RELOAD_SECONDS
+from models.database import execute_query, table_versions, versions_after_write
+
+_WATCHED_TABLES = ('CUSTOMERS',)
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+_PHONE_QUERY_RE = re.compile(r'[\d\s()+\-./]+')
+_FOLD = str.maketrans({'ı': 'i', 'ş': 's', 'ğ': 'g', 'ü': 'u', 'ö': 'o', 'ç': 'c'})
+
+# Eşleşme türü puanları (kelime başına)
+EXACT, PREFIX, FUZZY = 3, 2, 1
+
+
+class CustomerSearchError(Exception):
+    """Index veritabanından yüklenemedi"""
+
+
+def fold(text):
+    """Türkçe kurallarıyla küçült ve aksanları kaldır: 'İLKAY IŞIK' -> 'ilkay isik'"""
+    # str.lower() 'I'yı 'i', 'İ'yi 'i̇' yapar; önce Türkçe karşılıkları
+    text = (text or '').replace('I', 'ı').replace('İ', 'i').lower().translate(_FOLD)
+    return ''.join(ch for ch in unicodedata.normalize('NFKD', text) if not unicodedata.combining(ch))
+
+
+def tokenize(text):
+    return _TOKEN_RE.findall(fold(text))
+
+
+def phone_key(phone):
+    """Karşılaştırma için numaranın son 10 hanesi (+90 / 0 öneki olmadan)"""
+    digits = re.sub(r'\D', '', phone or '')
+    return digits[-10:] if len(digits) > 10 else digits.lstrip('0')
+
+
+def max_typos(term):
+    """Kelime uzunluğuna göre izin verilen hata sayısı"""
+    if len(term) < 4:
+        return 0
+    return 1 if len(term) < 8 else 2
+
+
+def _bigrams(token):
+    # Baş tarafı işaretli: prefix'in bigram'ları token'ın bigram'larının alt kümesidir
+    padded = '^' + token
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+
+def _trigrams(digits):
+    return {digits[i:i + 3] for i in range(len(digits) - 2)}
+
+
+def edit_distance(a, b, limit):
+    """Optimal string alignment mesafesi (yer değiştirme = 1); limit'i aşarsa limit + 1"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous, current = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        before, previous, current = previous, current, [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], before[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+    return current[-1]
+
+
+class _Customer:
+    __slots__ = ('customer_id', 'full_name', 'phone', 'email', 'vip_status', 'total_ltv',
+                 'tokens', 'phone_key')
+
+    def __init__(self, row):
+        self.customer_id = row['customer_id']
+        self.full_name = row['full_name'] or ''
+        self.phone = row.get('phone') or ''
+        self.email = row.get('email') or ''
+        self.vip_status = bool(row.get('vip_status'))
+        self.total_ltv = row.get('total_ltv') or 0
+        self.tokens = set(tokenize(self.full_name)) | set(tokenize(self.email))
+        self.phone_key = phone_key(self.phone)
+
+    def to_dict(self, score):
+        return {
+            "customer_id": self.customer_id,
+            "full_name": self.full_name,
+            "phone": self.phone,
+            "email": self.email,
+            "vip_status": self.vip_status,
+            "total_ltv": self.total_ltv,
+            "score": score,
+        }
+
+
+class CustomerSearchIndex:
+    """Thread-safe, token + n-gram tabanlı müşteri index'i"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._customers = {}                 # customer_id -> _Customer
+        self._postings = defaultdict(set)    # token -> customer_id'ler
+        self._tokens = []                    # sıralı token listesi (prefix aralığı için)
+        self._grams = defaultdict(set)       # bigram -> token'lar (fuzzy adaylar)
+        self._phone_grams = defaultdict(set) # telefon trigram'ı -> customer_id'ler
+        self._versions = None
+        self._loaded_at = 0.0
+        self._stale = True
+
+    # --- YÜKLEME ---
+
+    def invalidate(self):
+        with self._lock:
+            self._stale = True
+
+    def _ensure_fresh(self):
+        if (self._stale or self._versions != table_versions(_WATCHED_TABLES)
+                or time.monotonic() - self._loaded_at > CUSTOMER_SEARCH_RELOAD_SECONDS):
+            self._load()
+
+    def _load(self):
+        versions = table_versions(_WATCHED_TABLES)
+        # Index yazmalarla senkron tutulur: replica gecikmesi yeni müşteriyi gizlemesin
+        rows = execute_query("""
+            SELECT customer_id, full_name, phone, email, vip_status, total_ltv
+            FROM CUSTOMERS
+        """, primary=True)
+        if rows is None:
+            raise CustomerSearchError("Müşteri listesi yüklenemedi")
+
+        self._customers = {}
+        self._postings = defaultdict(set)
+        self._grams = defaultdict(set)
+        self._phone_grams = defaultdict(set)
+        for row in rows:
+            self._add(_Customer(row), keep_sorted=False)
+        self._tokens = sorted(self._postings)
+
+        self._versions = versions
+        self._loaded_at = time.monotonic()
+        self._stale = False
+
+    # --- YARDIMCILAR ---
+
+    def _add(self, customer, keep_sorted=True):
+        # Yeniden yükleme ile senkronizasyon çağrısı yarışabilir; aynı id iki kez eklenmesin
+        self._remove(customer.customer_id)
+        self._customers[customer.customer_id] = customer
+        for token in customer.tokens:
+            ids = self._postings[token]
+            if not ids:
+                for gram in _bigrams(token):
+                    self._grams[gram].add(token)
+                if keep_sorted:
+                    self._tokens.insert(bisect_left(self._tokens, token), token)
+            ids.add(customer.customer_id)
+        for gram in _trigrams(customer.phone_key):
+            self._phone_grams[gram].add(customer.customer_id)
+
+    def _remove(self, customer_id):
+        customer = self._customers.pop(customer_id, None)
+        if customer is None:
+            return
+        for token in customer.tokens:
+            ids = self._postings.get(token)
+            if ids is None:
+                continue
+            ids.discard(customer_id)
+            if not ids:
+                del self._postings[token]
+                for gram in _bigrams(token):
+                    self._grams[gram].discard(token)
+                i = bisect_left(self._tokens, token)
+                if i < len(self._tokens) and self._tokens[i] == token:
+                    del self._tokens[i]
+        for gram in _trigrams(customer.phone_key):
+            self._phone_grams[gram].discard(customer_id)
+
+    def _prefixed(self, term):
+        """term ile başlayan token'lar (sıralı listede bisect aralığı)"""
+        i = bisect_left(self._tokens, term)
+        while i < len(self._tokens) and self._tokens[i].startswith(term):
+            yield self._tokens[i]
+            i += 1
+
+    def _fuzzy(self, term, limit):
+        """term'e (veya term uzunluğundaki başına) en fazla limit hata mesafesindeki token'lar"""
+        grams = _bigrams(term)
+        # Her düzenleme en fazla 3 bigram'ı bozar (yer değiştirme dahil; q-gram lemması)
+        needed = len(grams) - 3 * limit
+        counts = defaultdict(int)
+        for gram in grams:
+            for token in self._grams.get(gram, ()):
+                counts[token] += 1
+        for token, shared in counts.items():
+            if shared < needed:
+                continue
+            # Yazılmakta olan kelime: token'ın term uzunluğu civarındaki başı da eşleşebilir
+            distance = min(edit_distance(term, token[:n], limit)
+                           for n in range(max(1, len(term) - limit), len(term) + limit + 1))
+            if distance <= limit:
+                yield token
+
+    def _match_term(self, term):
+        """customer_id -> bu kelime için en iyi puan"""
+        scores = {}
+        for customer_id in self._postings.get(term, ()):
+            scores[customer_id] = EXACT
+        for token in self._prefixed(term):
+            for customer_id in self._postings[token]:
+                scores.setdefault(customer_id, PREFIX)
+        limit = max_typos(term)
+        if limit:
+            for token in self._fuzzy(term, limit):
+                for customer_id in self._postings[token]:
+                    scores.setdefault(customer_id, FUZZY)
+        if term.isdigit() and len(term) >= 3:
+            for customer_id, score in self._match_phone(term).items():
+                scores[customer_id] = max(scores.get(customer_id, 0), score)
+        return scores
+
+    def _match_phone(self, digits):
+        key = phone_key(digits)
+        if len(key) < 3:
+            return {}
+        candidates = None
+        for gram in _trigrams(key):
+            ids = self._phone_grams.get(gram, set())
+            candidates = ids if candidates is None else candidates & ids
+            if not candidates:
+                return {}
+        scores = {}
+        for customer_id in candidates:
+            number = self._customers[customer_id].phone_key
+            if number == key:
+                scores[customer_id] = EXACT
+            elif number.startswith(key):
+                scores[customer_id] = PREFIX
+            elif key in number:
+                scores[customer_id] = FUZZY
+        return scores
+
+    # --- SORGULAR ---
+
+    def search(self, query, limit=20):
+        """
+        En iyi eşleşen müşteriler: puan (kelime başına exact 3 / prefix 2 / fuzzy 1)
+        azalan, eşitlikte VIP'ler ve LTV'si yüksek olanlar önce.
+        """
+        if _PHONE_QUERY_RE.fullmatch(query) and sum(ch.isdigit() for ch in query) >= 3:
+            # '0532 123 45 67' tek bir telefon numarası olarak aranır
+            terms = [re.sub(r'\D', '', query)]
+        else:
+            terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+
+        with self._lock:
+            self._ensure_fresh()
+            matched = None
+            for term in terms:
+                scores = self._match_term(term)
+                if matched is None:
+                    matched = scores
+                else:
+                    matched = {cid: total + scores[cid] for cid, total in matched.items() if cid in scores}
+                if not matched:
+                    return []
+            customers = [(self._customers[cid], score) for cid, score in matched.items()]
+
+        customers.sort(key=lambda item: (-item[1], not item[0].vip_status, -item[0].total_ltv,
+                                         item[0].customer_id))
+        return [customer.to_dict(score) for customer, score in customers[:limit]]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "customers": len(self._customers),
+                "tokens": len(self._postings),
+                "loaded": not self._stale,
+            }
+
+    # --- SENKRONİZASYON ---
+
+    def customer_added(self, row):
+        """Yeni müşteri commit edildikten sonra çağrılır"""
+        with self._lock:
+            if self._stale:
+                return
+            self._add(_Customer(row))
+            self._absorb_write()
+
+    def customer_updated(self, row):
+        """LTV / VIP değişti (sipariş, session kapanışı): aranan alanlar aynı, yeniden index'leme yok"""
+        with self._lock:
+            if self._stale:
+                return
+            customer = self._customers.get(row['customer_id'])
+            if customer is not None:
+                customer.total_ltv = row['total_ltv'] or 0
+                customer.vip_status = bool(row['vip_status'])
+            self._absorb_write()
+
+    def customers_removed(self, customer_ids):
+        """Müşteriler (cascade ile) silindikten sonra çağrılır"""
+        with self._lock:
+            if self._stale:
+                return
+            for customer_id in customer_ids:
+                self._remove(customer_id)
+            self._absorb_write()
+
+    def _absorb_write(self):
+        """
+        Kendi CUSTOMERS yazmamızın versiyonunu kaydet; araya başka bir yazma girdiyse
+        (başka thread'in siparişi, silme) index sonraki aramada yeniden yüklenir.
+        """
+        versions = versions_after_write(self._versions, _WATCHED_TABLES, {'CUSTOMERS'})
+        if versions is None:
+            self._stale = True
+        else:
+            self._versions = versions
+
+
+customer_search_index = CustomerSearchIndex()
@@ -0,0 +1,194 @@
+# Customer Lifetime Stats
+# CUSTOMERS.total_ltv, visit_count ve last_visit müşterinin dining session'larından türetilir:
+#   total_ltv   = SUM(total_amount)           (açık session'lar dahil; her siparişte artar)
+#   visit_count = kapanmış session sayısı      (end_time dolu)
+#   last_visit  = en son kapanmış session'ın başlangıcı
+#
+# Yazma yolları aynı transaction içinde buradaki on_* fonksiyonlarını çağırır (rollups.py ile
+# aynı desen); her biri tek müşteri satırını primary key ile günceller. Veri onarımından sonra
+# recompute_customer_stats() tüm müşterileri id aralıkları halinde yeniden hesaplar; kaldığı
+# yer JOB_CHECKPOINTS'e yazıldığı için yarıda kalırsa devam eder.
+#
+# VIP: total_ltv VIP_LTV_THRESHOLD'u geçen müşteri otomatik VIP olur (None: otomatik VIP yok).
+# Otomatik düşürme yoktur; eşik değişince evaluate_vip_tiers() index aralığı ile çalışır.
+import time
+
+import mysql.connector
+from config import VIP_LTV_THRESHOLD, CUSTOMER_STATS_CHUNK_SIZE
+from models.database import transaction
+
+RECOMPUTE_JOB = 'customer-stats'
+_ER_LOCK_DEADLOCK = 1213
+_ER_LOCK_WAIT_TIMEOUT = 1205
+
+
+def _session_customer(cursor, session_id):
+    cursor.execute("""
+        SELECT r.customer_id, ds.start_time
+        FROM DININGSESSIONS ds
+        JOIN RESERVATIONS r ON ds.reservation_id = r.reservation_id
+        WHERE ds.session_id = %s
+    """, (session_id,))
+    row = cursor.fetchone()
+    return row if row and row['customer_id'] is not None else None
+
+
+def _stats(cursor, customer_id):
+    cursor.execute("""
+        SELECT customer_id, total_ltv, vip_status, visit_count, last_visit
+        FROM CUSTOMERS WHERE customer_id = %s
+    """, (customer_id,))
+    return cursor.fetchone()
+
+
+# --- ARTIMLI GÜNCELLEMELER ---
+# Hepsi çağıranın transaction cursor'ını alır ve müşterinin yeni değerlerini döndürür
+# (session bir müşteriye bağlı değilse None). Dönen satır commit sonrası müşteri arama
+# index'ine verilir (customer_search_index.customer_updated).
+
+def on_session_amount_changed(cursor, session_id, delta):
+    """Session tutarı delta kadar değişti (ör. yeni sipariş): LTV'yi güncelle, VIP eşiğini kontrol et"""
+    row = _session_customer(cursor, session_id) if delta else None
+    if row is None:
+        return None
+    if VIP_LTV_THRESHOLD is None:
+        cursor.execute("UPDATE CUSTOMERS SET total_ltv = total_ltv + %s WHERE customer_id = %s",
+                       (delta, row['customer_id']))
+    else:
+        # Tek tablolu UPDATE'te atamalar soldan sağa: vip_status yeni total_ltv'yi görür
+        cursor.execute("""
+            UPDATE CUSTOMERS
+            SET total_ltv = total_ltv + %s,
+                vip_status = vip_status OR total_ltv >= %s
+            WHERE customer_id = %s
+        """, (delta, VIP_LTV_THRESHOLD, row['customer_id']))
+    return _stats(cursor, row['customer_id'])
+
+
+def on_session_closed(cursor, session_id):
+    """Session kapandı (end_time yazıldı): ziyaret sayısı +1, son ziyaret tarihi"""
+    row = _session_customer(cursor, session_id)
+    if row is None:
+        return None
+    cursor.execute("""
+        UPDATE CUSTOMERS
+        SET visit_count = visit_count + 1,
+            last_visit = GREATEST(COALESCE(last_visit, %s), %s)
+        WHERE customer_id = %s
+    """, (row['start_time'], row['start_time'], row['customer_id']))
+    return _stats(cursor, row['customer_id'])
+
+
+# --- VIP EŞİĞİ ---
+
+def evaluate_vip_tiers(threshold=VIP_LTV_THRESHOLD, demote=False):
+    """
+    Eşiği geçen müşterileri VIP yap (demote=True: eşiğin altındaki VIP'leri düşür).
+    (promoted, demoted) döndürür. idx_customers_ltv / idx_customers_vip_ltv aralık
+    okuması kullanır; CUSTOMERS taranmaz.
+    """
+    if threshold is None:
+        return 0, 0
+    with transaction() as cursor:
+        cursor.execute("""
+            UPDATE CUSTOMERS SET vip_status = TRUE
+            WHERE total_ltv >= %s AND vip_status = FALSE
+        """, (threshold,))
+        promoted = cursor.rowcount
+        demoted = 0
+        if demote:
+            cursor.execute("""
+                UPDATE CUSTOMERS SET vip_status = FALSE
+                WHERE vip_status = TRUE AND total_ltv < %s
+            """, (threshold,))
+            demoted = cursor.rowcount
+    return promoted, demoted
+
+
+# --- TOPLU YENİDEN HESAPLAMA ---
+
+_RECOMPUTE_CHUNK_SQL = """
+    UPDATE CUSTOMERS c
+    LEFT JOIN (
+        SELECT r.customer_id,
+               SUM(COALESCE(ds.total_amount, 0)) AS ltv,
+               COUNT(ds.end_time) AS visits,
+               MAX(CASE WHEN ds.end_time IS NOT NULL THEN ds.start_time END) AS last_visit
+        FROM RESERVATIONS r
+        JOIN DININGSESSIONS ds ON ds.reservation_id = r.reservation_id
+        WHERE r.customer_id BETWEEN %s AND %s
+        GROUP BY r.customer_id
+    ) x ON x.customer_id = c.customer_id
+    SET c.total_ltv = COALESCE(x.ltv, 0),
+        c.visit_count = COALESCE(x.visits, 0),
+        c.last_visit = x.last_visit
+    WHERE c.customer_id BETWEEN %s AND %s
+"""
+
+
+def _checkpoint(cursor):
+    cursor.execute("SELECT last_id, started_at FROM JOB_CHECKPOINTS WHERE job = %s", (RECOMPUTE_JOB,))
+    return cursor.fetchone()
+
+
+def _recompute_chunk(after_id, chunk_size):
+    """Bir id aralığını yeniden hesapla ve checkpoint'i aynı transaction'da ilerlet"""
+    with transaction() as cursor:
+        cursor.execute("""
+            SELECT customer_id FROM CUSTOMERS
+            WHERE customer_id > %s ORDER BY customer_id LIMIT %s
+        """, (after_id, chunk_size))
+        ids = [row['customer_id'] for row in cursor.fetchall()]
+        if not ids:
+            return None
+        first, last = ids[0], ids[-1]
+        # idx_reservations_customer_time: müşteri aralığının rezervasyonları
+        cursor.execute(_RECOMPUTE_CHUNK_SQL, (first, last, first, last))
+        if VIP_LTV_THRESHOLD is not None:
+            cursor.execute("""
+                UPDATE CUSTOMERS SET vip_status = TRUE
+                WHERE customer_id BETWEEN %s AND %s AND total_ltv >= %s AND vip_status = FALSE
+            """, (first, last, VIP_LTV_THRESHOLD))
+        cursor.execute("""
+            INSERT INTO JOB_CHECKPOINTS (job, last_id) VALUES (%s, %s)
+            ON DUPLICATE KEY UPDATE last_id = VALUES(last_id)
+        """, (RECOMPUTE_JOB, last))
+    return last, len(ids)
+
+
+def recompute_customer_stats(chunk_size=CUSTOMER_STATS_CHUNK_SIZE, restart=False, retries=3):
+    """
+    Tüm müşterilerin LTV / ziyaret istatistiklerini session'lardan yeniden hesapla.
+    Her parça (chunk_size müşteri) kendi transaction'ında commit edilir; kesilirse bir sonraki
+    çağrı JOB_CHECKPOINTS'teki son id'den devam eder (restart=True: baştan başla).
+    Eşzamanlı siparişlerle deadlock olursa parça tekrar denenir. İşlenen müşteri sayısını döndürür.
+    """
+    with transaction() as cursor:
+        if restart:
+            cursor.execute("DELETE FROM JOB_CHECKPOINTS WHERE job = %s", (RECOMPUTE_JOB,))
+        checkpoint = _checkpoint(cursor)
+    after_id = checkpoint['last_id'] if checkpoint else 0
+    if after_id:
+        print(f"customer_id > {after_id} kaldığı yerden devam ediliyor "
+              f"(başlangıç: {checkpoint['started_at']})")
+
+    processed = 0
+    started = time.monotonic()
+    while True:
+        for attempt in range(retries + 1):
+            try:
+                result = _recompute_chunk(after_id, chunk_size)
+                break
+            except mysql.connector.Error as err:
+                if err.errno not in (_ER_LOCK_DEADLOCK, _ER_LOCK_WAIT_TIMEOUT) or attempt == retries:
+                    raise
+                time.sleep(0.1 * (attempt + 1))
+        if result is None:
+            break
+        after_id, count = result
+        processed += count
+        print(f"  customer_id <= {after_id}: {processed} müşteri ({time.monotonic() - started:.1f} sn)")
+
+    with transaction() as cursor:
+        cursor.execute("DELETE FROM JOB_CHECKPOINTS WHERE job = %s", (RECOMPUTE_JOB,))
+    return processed
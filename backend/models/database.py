@@ -1,52 +1,482 @@
 # Database Connection Module
+# Yazmalar ve transaction'lar primary'ye (DB_CONFIG), okumalar DB_REPLICAS tanımlıysa
+# replica'lara gider (models/replicas.py). Aynı istek içinde yazmadan sonraki okumalar ve
+# read_from_primary() blokları primary'den okur (read-your-writes).
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
 import mysql.connector
-from config import DB_CONFIG
+from config import (DB_CONFIG, DB_POOL_SIZE, DB_POOL_MAX_OVERFLOW, DB_POOL_TIMEOUT,
+                    DB_POOL_RECYCLE, DB_POOL_PRE_PING, DB_STATEMENT_CACHE_SIZE, STREAM_BATCH_SIZE,
+                    QUERY_CACHE_MAX_BYTES, QUERY_CACHE_DEFAULT_TTL, DB_REPLICAS, DB_REPLICA_POOL_SIZE,
+                    DB_REPLICA_CHECK_INTERVAL, DB_REPLICA_MAX_LAG)
+from models.pool import ConnectionPool, PoolTimeoutError
+from models.query_cache import QueryCache, make_key, tables_read, tables_written
+from models.replicas import ReplicaSet
+
+_pool = None
+_pool_lock = threading.Lock()
+_replicas = None
+
+query_cache = QueryCache(QUERY_CACHE_MAX_BYTES, QUERY_CACHE_DEFAULT_TTL)
+
+# SELECT sorgularını dinleyen callback'ler: fn(query, params) (ör. EXPLAIN kontrolü)
+_statement_listeners = []
+
+
+def add_statement_listener(listener):
+    _statement_listeners.append(listener)
+
+
+def remove_statement_listener(listener):
+    _statement_listeners.remove(listener)
+
+
+def _notify_listeners(query, params):
+    for listener in list(_statement_listeners):
+        listener(query, params)
+
+
+# Çalışan her statement'tan sonra çağrılan gözlemciler: fn(event) (ör. /metrics, slow query log)
+_statement_observers = []
+
+
+class StatementEvent:
+    """Tamamlanan bir statement'ın ölçümleri (süreler saniye cinsinden)"""
+    __slots__ = ('query', 'params', 'duration', 'rows', 'wait_time', 'cached', 'failed')
+
+    def __init__(self, query, params, duration, rows, wait_time=0.0, cached=False, failed=False):
+        self.query = query
+        self.params = params
+        self.duration = duration
+        self.rows = rows
+        self.wait_time = wait_time
+        self.cached = cached
+        self.failed = failed
+
+
+def add_statement_observer(observer):
+    _statement_observers.append(observer)
+
+
+def remove_statement_observer(observer):
+    _statement_observers.remove(observer)
+
+
+def _observe(query, params, duration, rows, wait_time=0.0, cached=False, failed=False):
+    if not _statement_observers:
+        return
+    event = StatementEvent(query, params, duration, rows, wait_time, cached, failed)
+    for observer in list(_statement_observers):
+        try:
+            observer(event)
+        except Exception as err:
+            # Ölçüm hatası sorguyu bozmamalı
+            print(f"Statement observer hatası: {err}")
+
+
+def get_pool():
+    """Uygulama genelindeki bağlantı havuzunu döndür (ilk çağrıda oluşturulur)"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    DB_CONFIG,
+                    size=DB_POOL_SIZE,
+                    max_overflow=DB_POOL_MAX_OVERFLOW,
+                    timeout=DB_POOL_TIMEOUT,
+                    recycle=DB_POOL_RECYCLE,
+                    pre_ping=DB_POOL_PRE_PING,
+                    statement_cache_size=DB_STATEMENT_CACHE_SIZE,
+                )
+    return _pool
+
+
+def get_replicas():
+    """Read replica seti (DB_REPLICAS boşsa boş set: okumalar primary'ye gider)"""
+    global _replicas
+    if _replicas is None:
+        with _pool_lock:
+            if _replicas is None:
+                _replicas = ReplicaSet(
+                    DB_CONFIG,
+                    DB_REPLICAS,
+                    dict(size=DB_REPLICA_POOL_SIZE, max_overflow=DB_POOL_MAX_OVERFLOW,
+                         timeout=DB_POOL_TIMEOUT, recycle=DB_POOL_RECYCLE,
+                         pre_ping=DB_POOL_PRE_PING, statement_cache_size=DB_STATEMENT_CACHE_SIZE),
+                    check_interval=DB_REPLICA_CHECK_INTERVAL,
+                    max_lag=DB_REPLICA_MAX_LAG,
+                )
+    return _replicas
+
+
+def pool_stats():
+    """Havuz istatistikleri (havuz henüz oluşturulmadıysa None)"""
+    return _pool.stats() if _pool is not None else None
+
+
+def replica_stats():
+    """Replica durumu (replica tanımlı değilse None)"""
+    return get_replicas().stats() if DB_REPLICAS else None
+
+
+def cache_stats():
+    return query_cache.stats()
+
+
+def table_versions(tables):
+    """Tabloların yazma sayaçları (ETag hesaplamak için, veritabanına gitmez)"""
+    return query_cache.table_versions(tables)
+
+
+def versions_after_write(known, tables, written):
+    """
+    Bellek içi index'ler için: known, index'in yansıttığı table_versions(tables); written, az önce
+    commit edilen kendi transaction'ının yazdığı tablolar (commit başına tablo başına +1).
+    Aradaki tek yazma bizimkiyse (veya index o yazmadan sonra zaten yeniden yüklendiyse) güncel
+    versiyonları, araya başka bir yazma girdiyse None döndürür: o yazma index'e yansımadı,
+    index yeniden yüklenmeli.
+    """
+    current = table_versions(tables)
+    if known is None:
+        return None
+    expected = tuple(v + (t in written) for t, v in zip(sorted(tables), known))
+    return current if current in (expected, known) else None
+
+
+def invalidate_tables(tables):
+    """Yazılan tablolara bağlı cache kayıtlarını düşür"""
+    if tables:
+        query_cache.invalidate_tables(tables)
+
+
+# --- OKUMA YÖNLENDİRMESİ (read-your-writes) ---
+
+class _ReadRouting:
+    """Bir istek (context) boyunca okumaların nereye gideceği"""
+    __slots__ = ('primary', 'wrote')
+
+    def __init__(self, primary=False):
+        self.primary = primary
+        self.wrote = False
+
+
+_read_routing = ContextVar('read_routing', default=None)
+
+
+def begin_read_routing(primary=False):
+    """İstek başında çağrılır; primary=True ise tüm okumalar primary'ye gider"""
+    _read_routing.set(_ReadRouting(primary))
+
+
+def end_read_routing():
+    _read_routing.set(None)
+
+
+def reads_from_primary():
+    state = _read_routing.get()
+    return state is not None and state.primary
+
+
+def wrote_in_context():
+    """Bu istekte primary'ye yazıldı mı (read-your-writes cookie'si için)"""
+    state = _read_routing.get()
+    return state is not None and state.wrote
+
+
+@contextmanager
+def read_from_primary(enabled=True):
+    """Blok içindeki okumaları primary'ye yönlendir (ör. yazmadan hemen sonra okuma)"""
+    state = _read_routing.get()
+    if not enabled:
+        yield
+    elif state is None:
+        _read_routing.set(_ReadRouting(primary=True))
+        try:
+            yield
+        finally:
+            _read_routing.set(None)
+    else:
+        previous, state.primary = state.primary, True
+        try:
+            yield
+        finally:
+            state.primary = previous
+
+
+def _note_write():
+    # Bu istekteki sonraki okumalar replica gecikmesinden etkilenmesin
+    state = _read_routing.get()
+    if state is not None:
+        state.wrote = True
+        state.primary = True
+
+
+def _read_connection(primary=False):
+    """
+    Okuma bağlantısı: (conn, replica). Replica yoksa, primary istenmişse veya uygun
+    replica bulunamazsa primary havuzundan alınır (replica None).
+    """
+    if DB_REPLICAS and not primary and not reads_from_primary():
+        replicas = get_replicas()
+        replica = replicas.choose()
+        if replica is not None:
+            try:
+                return replica.pool.acquire(), replica
+            except PoolTimeoutError:
+                pass   # replica meşgul ama sağlıklı: bu okuma primary'den
+            except mysql.connector.Error as err:
+                replicas.mark_down(replica, err)
+    return get_db_connection(), None
+
+
+def _replica_failed(replica, err):
+    """Bağlantı seviyesindeki hatada replica'yı devre dışı bırak (True: primary'de tekrar dene)"""
+    if replica is None or not isinstance(err, (mysql.connector.errors.OperationalError,
+                                               mysql.connector.errors.InterfaceError)):
+        return False
+    get_replicas().mark_down(replica, err)
+    return True
+
 
 def get_db_connection():
-    """Database bağlantısı oluştur"""
+    """Havuzdan database bağlantısı al (close() bağlantıyı havuza geri verir)"""
     try:
-        conn = mysql.connector.connect(**DB_CONFIG)
-        return conn
+        return get_pool().acquire()
     except mysql.connector.Error as err:
         print(f"Veritabanı Hatası: {err}")
         return None
 
-def execute_query(query, params=None):
-    """Query'yi execute et ve sonuç döndür"""
-    conn = get_db_connection()
+
+def _handle_error(conn, err):
+    # Kopmuş bağlantılar havuza geri konmaz
+    if isinstance(err, (mysql.connector.errors.OperationalError,
+                        mysql.connector.errors.InterfaceError)):
+        conn.invalidate()
+
+
+# Prepared statement protokolünün desteklemediği SQL metinleri (ER_UNSUPPORTED_PS)
+_UNPREPARABLE = set()
+_ER_UNSUPPORTED_PS = 1295
+
+
+def _run_statement(conn, query, params, fetch):
+    """
+    Statement'ı bağlantının prepared statement cache'i üzerinden çalıştır (cache kapalıysa
+    veya SQL desteklenmiyorsa normal cursor). (rows veya None, rowcount) döndürür.
+    """
+    statements = conn.statements
+    if statements is not None and query not in _UNPREPARABLE:
+        cursor, sql = statements.get(query)
+        try:
+            cursor.execute(sql, params or ())
+            rows = cursor.fetchall() if fetch else None
+            return rows, cursor.rowcount
+        except mysql.connector.Error as err:
+            # Cursor/statement durumu belirsiz: bir sonraki kullanımda yeniden prepare edilsin
+            statements.discard(query)
+            if err.errno != _ER_UNSUPPORTED_PS:
+                raise
+            _UNPREPARABLE.add(query)
+
+    cursor = conn.cursor(dictionary=True)
+    try:
+        if params:
+            cursor.execute(query, params)
+        else:
+            cursor.execute(query)
+        rows = cursor.fetchall() if fetch else None
+        return rows, cursor.rowcount
+    finally:
+        cursor.close()
+
+
+def execute_query(query, params=None, cached=False, ttl=None, primary=False):
+    """
+    Query'yi execute et ve sonuç döndür.
+    cached=True: sonuç query cache'ten okunur/yazılır (ttl verilmezse QUERY_CACHE_DEFAULT_TTL).
+    Okunan tablolara yazıldığında kayıt otomatik olarak geçersiz olur.
+    primary=True: replica'lar yerine primary'den oku. Cache'e yazılacak sonuçlar da primary'den
+    okunur; aksi halde invalidation sonrası gecikmeli bir replica eski satırları cache'leyebilir.
+    """
+    _notify_listeners(query, params)
+    started = time.perf_counter()
+
+    if cached:
+        key = make_key(query, params)
+        found, rows = query_cache.get(key)
+        if found:
+            _observe(query, params, time.perf_counter() - started, len(rows), cached=True)
+            return rows
+        tables = tables_read(query)
+        versions = query_cache.table_versions(tables)
+
+    conn, replica = _read_connection(primary or cached)
     if not conn:
         return None
-    
+
+    # duration bağlantı bekleme süresini içermez (wait_time ayrı raporlanır)
+    wait_time = conn.wait_time
+    started = time.perf_counter()
+    result = None
+    try:
+        result, _ = _run_statement(conn, query, params, fetch=True)
+    except mysql.connector.Error as err:
+        print(f"Query Hatası: {err}")
+        _handle_error(conn, err)
+        _observe(query, params, time.perf_counter() - started, 0, wait_time, failed=True)
+        if not _replica_failed(replica, err):
+            return None
+    finally:
+        conn.close()
+
+    if result is None:
+        # Replica bağlantısı koptu: okuma primary'de tekrarlanır
+        return execute_query(query, params, primary=True)
+
+    _observe(query, params, time.perf_counter() - started, len(result), wait_time)
+
+    if cached:
+        query_cache.put(key, result, tables, versions, ttl)
+    return result
+
+def stream_query(query, params=None, batch_size=STREAM_BATCH_SIZE, primary=False):
+    """
+    Sonucu fetchall() yerine fetchmany() ile parça parça oku (generator).
+    Unbuffered cursor kullanıldığı için satırlar sunucudan geldikçe işlenir;
+    bellek kullanımı batch_size ile sınırlıdır. Her adımda bir satır listesi yield eder.
+    Replica tanımlıysa replica'dan okunur (yarıda kopan stream tekrar denenmez).
+    """
+    _notify_listeners(query, params)
+    conn, replica = _read_connection(primary)
+    if not conn:
+        raise mysql.connector.errors.PoolError("No database connection available")
+
+    # Süreye yalnızca veritabanında geçen zaman sayılır (istemcinin okuma hızı değil)
+    db_time = 0.0
+    row_count = 0
+    cursor = None
+    finished = False
+    failed = False
     try:
+        started = time.perf_counter()
         cursor = conn.cursor(dictionary=True)
         if params:
             cursor.execute(query, params)
         else:
             cursor.execute(query)
-        
-        result = cursor.fetchall()
-        conn.close()
-        return result
+
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            db_time += time.perf_counter() - started
+            if not rows:
+                break
+            row_count += len(rows)
+            yield rows
+            started = time.perf_counter()
+        finished = True
     except mysql.connector.Error as err:
-        print(f"Query Hatası: {err}")
-        return None
+        print(f"Stream Hatası: {err}")
+        _handle_error(conn, err)
+        _replica_failed(replica, err)
+        failed = True
+        raise
+    finally:
+        _observe(query, params, db_time, row_count, conn.wait_time, failed=failed)
+        if not finished:
+            # Okunmamış satırlar kalan bağlantı tekrar kullanılamaz
+            conn.invalidate()
+        elif cursor is not None:
+            cursor.close()
+        conn.close()
 
 def execute_insert_update(query, params=None):
     """INSERT/UPDATE/DELETE işlemleri için"""
     conn = get_db_connection()
     if not conn:
         return False
-    
+
+    # duration bağlantı bekleme süresini içermez (wait_time ayrı raporlanır)
+    wait_time = conn.wait_time
+    started = time.perf_counter()
     try:
-        cursor = conn.cursor()
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        
+        _note_write()
+        _, rows = _run_statement(conn, query, params, fetch=False)
         conn.commit()
-        conn.close()
-        return True
     except mysql.connector.Error as err:
         print(f"Insert/Update Hatası: {err}")
+        _handle_error(conn, err)
+        _observe(query, params, time.perf_counter() - started, 0, wait_time, failed=True)
         return False
+    finally:
+        conn.close()
+
+    _observe(query, params, time.perf_counter() - started, rows, wait_time)
+
+    invalidate_tables(tables_written(query))
+    return True
+
+class _TrackingCursor:
+    """
+    Transaction cursor'ı; yazılan tabloları commit sonrası cache invalidation için toplar
+    ve her statement'ı gözlemcilere bildirir (bağlantı bekleme süresi ilk statement'a yazılır).
+    """
+
+    def __init__(self, cursor, wait_time=0.0):
+        self._cursor = cursor
+        self._wait_time = wait_time
+        self.written = set()
+
+    def _run(self, method, query, params):
+        self.written |= tables_written(query)
+        started = time.perf_counter()
+        wait_time, self._wait_time = self._wait_time, 0.0
+        try:
+            result = method(query, params)
+        except mysql.connector.Error:
+            _observe(query, params, time.perf_counter() - started, 0, wait_time, failed=True)
+            raise
+        _observe(query, params, time.perf_counter() - started, max(self._cursor.rowcount, 0), wait_time)
+        return result
+
+    def execute(self, query, params=None):
+        return self._run(self._cursor.execute, query, params)
+
+    def executemany(self, query, seq_params):
+        return self._run(self._cursor.executemany, query, seq_params)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+@contextmanager
+def transaction():
+    """
+    Birden fazla statement'ı tek bağlantı + tek transaction içinde çalıştır.
+    Blok hatasız biterse commit, exception olursa rollback edilir (exception yukarı iletilir).
+
+        with transaction() as cursor:
+            cursor.execute(...)
+    """
+    conn = get_pool().acquire()
+    cursor = _TrackingCursor(conn.cursor(dictionary=True, buffered=True), conn.wait_time)
+    _note_write()
+    try:
+        yield cursor
+        conn.commit()
+        invalidate_tables(cursor.written)
+    except Exception as err:
+        try:
+            conn.rollback()
+        except mysql.connector.Error:
+            conn.invalidate()
+        if isinstance(err, mysql.connector.Error):
+            print(f"Transaction Hatası: {err}")
+            _handle_error(conn, err)
+        raise
+    finally:
+        cursor.close()
+        conn.close()
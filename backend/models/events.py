@@ -0,0 +1,152 @@
+# In-Process Event Bus (GET /api/stream)
+# Yazma yolları commit'ten sonra publish() çağırır; olay bir kez SSE çerçevesine
+# ("id: ...\nevent: ...\ndata: {...}\n\n") çevrilip EVENT_BUFFER_SIZE uzunluğunda bir halka
+# buffer'a eklenir. Aboneler kendi kuyruklarını tutmaz: her abone buffer'da en son gördüğü
+# sıra numarasını bilir ve yeni olay gelince (Condition) buffer'dan okur. Bu yüzden yayın
+# maliyeti abone sayısından bağımsızdır ve Last-Event-ID ile tekrar oynatma aynı yoldan yapılır.
+#
+# Olay id'si "<boot>-<seq>": boot process'in başlangıç zamanıdır. İstemcinin Last-Event-ID'si
+# başka bir process'e (yeniden başlatma) aitse ya da buffer'dan düşmüşse abone önce bir
+# "reset" olayı alır; istemci ekranı REST endpoint'lerinden yeniden yüklemelidir.
+#
+# Bus process içidir: gunicorn -w N ile her worker yalnızca kendi yazmalarını yayınlar.
+import threading
+import time
+from collections import deque
+from itertools import islice
+
+from config import EVENT_BUFFER_SIZE, EVENT_MAX_SUBSCRIBERS
+
+TOPICS = ('orders', 'reservations', 'feedback', 'sessions')
+
+
+class StreamFullError(Exception):
+    """EVENT_MAX_SUBSCRIBERS aşıldı"""
+
+
+class _Event:
+    __slots__ = ('seq', 'topic', 'frame')
+
+    def __init__(self, seq, topic, frame):
+        self.seq = seq
+        self.topic = topic
+        self.frame = frame
+
+
+class Subscription:
+    """Bir SSE bağlantısı: topics filtresi ve buffer'daki okuma konumu"""
+
+    def __init__(self, bus, topics, after_seq):
+        self.bus = bus
+        self.topics = frozenset(topics)
+        self.after_seq = after_seq
+
+    def wait(self, timeout):
+        """
+        Yeni olayların SSE çerçevelerini döndür; timeout içinde olay yoksa boş liste.
+        Abone buffer'ın gerisinde kaldıysa başa bir reset çerçevesi eklenir.
+        """
+        return self.bus._read(self, timeout)
+
+    def close(self):
+        self.bus._unsubscribe(self)
+
+
+class EventBus:
+    def __init__(self, size=EVENT_BUFFER_SIZE, max_subscribers=EVENT_MAX_SUBSCRIBERS):
+        self.boot = format(int(time.time() * 1000), 'x')
+        self._buffer = deque(maxlen=size)
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._subscribers = set()
+        self._max_subscribers = max_subscribers
+        self._published = 0
+        self._resets = 0
+
+    def event_id(self, seq):
+        return f"{self.boot}-{seq}"
+
+    def publish(self, topic, event_type, data, dumps):
+        """
+        Olayı yayınla. data JSON'a bir kez çevrilir (dumps: current_app.json.dumps);
+        commit'ten SONRA çağrılmalı, aksi halde istemci henüz görünmeyen bir satırı okuyabilir.
+        """
+        if topic not in TOPICS:
+            raise ValueError(f"Bilinmeyen topic: {topic}")
+        payload = dumps(data)
+        with self._cond:
+            self._seq += 1
+            frame = f"id: {self.event_id(self._seq)}\nevent: {event_type}\ndata: {payload}\n\n"
+            self._buffer.append(_Event(self._seq, topic, frame))
+            self._published += 1
+            self._cond.notify_all()
+
+    def last_event_id(self):
+        with self._cond:
+            return self.event_id(self._seq)
+
+    def check_capacity(self):
+        """Yeni abone için yer yoksa StreamFullError (kesin kontrol subscribe'da)"""
+        with self._cond:
+            self._check_capacity()
+
+    def _check_capacity(self):
+        if self._max_subscribers and len(self._subscribers) >= self._max_subscribers:
+            raise StreamFullError(f"{len(self._subscribers)} aktif abone")
+
+    def subscribe(self, topics=TOPICS, last_event_id=None):
+        """
+        Abone ol. last_event_id verilirse sonrasındaki olaylar tekrar oynatılır;
+        verilmezse yalnızca bundan sonraki olaylar gönderilir.
+        """
+        with self._cond:
+            self._check_capacity()
+            sub = Subscription(self, topics, self._resume_seq(last_event_id))
+            self._subscribers.add(sub)
+        return sub
+
+    def _resume_seq(self, last_event_id):
+        """Last-Event-ID -> okunacak ilk olaydan önceki seq (-1: reset gerekli)"""
+        if not last_event_id:
+            return self._seq
+        boot, _, seq = last_event_id.partition('-')
+        if boot != self.boot or not seq.isdigit() or int(seq) > self._seq:
+            return -1
+        return int(seq)
+
+    def _read(self, sub, timeout):
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                frames = self._pending(sub)
+                remaining = deadline - time.monotonic()
+                if frames or remaining <= 0:
+                    return frames
+                # Başka topic'lerin olayları aboneyi boşuna uyandırır; süre dolana kadar beklemeye devam
+                self._cond.wait(remaining)
+
+    def _pending(self, sub):
+        """sub.after_seq'ten sonraki, aboneyi ilgilendiren çerçeveler (lock altında çağrılır)"""
+        oldest = self._buffer[0].seq if self._buffer else self._seq + 1
+        if sub.after_seq < 0 or sub.after_seq + 1 < oldest:
+            # Kaçırılan olaylar buffer'dan düştü (ya da başka bir process'in id'si)
+            self._resets += 1
+            sub.after_seq = self._seq
+            return [f"id: {self.event_id(self._seq)}\nevent: reset\ndata: {{}}\n\n"]
+        frames = [event.frame for event in islice(self._buffer, sub.after_seq + 1 - oldest, None)
+                  if event.topic in sub.topics]
+        sub.after_seq = self._seq
+        return frames
+
+    def _unsubscribe(self, sub):
+        with self._cond:
+            self._subscribers.discard(sub)
+
+    def stats(self):
+        with self._cond:
+            return {"subscribers": len(self._subscribers), "published": self._published,
+                    "buffered": len(self._buffer), "last_event_id": self.event_id(self._seq),
+                    "resets": self._resets}
+
+
+event_bus = EventBus()
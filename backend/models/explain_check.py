@@ -0,0 +1,143 @@
+# EXPLAIN Regression Check
+# routes/ altındaki tüm GET endpoint'lerini test client ile çağırır, çalışan her SELECT'i
+# yakalar ve EXPLAIN eder. Büyük bir tabloda full table scan (type=ALL) varsa hata verir.
+#
+#   cd backend && flask --app app explain-check [--min-rows 1000]
+#
+# Optimizer küçük tablolarda index yerine ALL seçebildiği için gerçekçi boyutta bir
+# veri setiyle çalıştırılmalıdır; --min-rows altındaki tahmini satır sayıları yok sayılır.
+import re
+from urllib.parse import urlencode
+
+from flask import url_for
+from models.database import add_statement_listener, get_db_connection, remove_statement_listener
+
+# Boyutu işlem hacmiyle büyümeyen tablolar (katalog/özet); tam okunmaları sorun değil
+SMALL_TABLES = {
+    'CATEGORIES', 'MENUITEMS', 'TABLES', 'TABLECOMBINATIONS', 'STAFF', 'SHIFTSCHEDULES',
+    'ROLLUP_DAILY_REVENUE', 'ROLLUP_ITEM_SALES', 'ROLLUP_STAFF_SALES', 'ROLLUP_TABLE_STATS',
+}
+
+# Tüm geçmiş üzerinde toplama yapan raporlar; full scan bilinçli olarak kabul ediliyor
+AGGREGATE_ENDPOINTS = {
+    'reports.get_customer_spending',
+    'reports.classify_customers',
+    'reports.get_customer_first_last_visit',
+    'reports.get_reservation_status_analysis',
+}
+
+# Veritabanına sorgu atmayan, kapanmayan yanıtlar (SSE); test client ile çağrılmaz
+SKIP_ENDPOINTS = {'stream.stream_events'}
+
+# Filtre kombinasyonları: URL kuralından türetilemeyen query parametreleri
+EXTRA_REQUESTS = [
+    ('orders.get_orders', {'date': '2025-12-15'}),
+    ('orders.get_orders', {'from': '2025-12-01', 'to': '2026-01-01'}),
+    ('orders.get_orders', {'customer_id': 1}),
+    ('orders.get_orders', {'staff_id': 4}),
+    ('reservations.get_reservations', {'status': 'Pending'}),
+    ('reservations.get_reservations', {'from': '2025-12-01', 'to': '2026-01-01'}),
+    ('reservations.get_reservations', {'customer_id': 1}),
+    ('reservations.get_reservations', {'table_id': 1}),
+    ('feedback.get_feedback', {'from': '2025-12-01', 'to': '2026-01-01'}),
+    ('feedback.get_feedback', {'customer_id': 1}),
+    ('customers.get_customers', {'vip': 'true'}),
+    ('feedback.search_feedback', {'q': 'service'}),
+    ('feedback.search_feedback', {'q': 'slow', 'max_rating': 2, 'table_id': 1}),
+    ('feedback.get_ratings', {'window': 'week', 'by': 'table'}),
+    ('feedback.get_ratings', {'window': 'month', 'by': 'staff', 'id': 1}),
+    ('feedback.get_rating_summary', {'staff_id': 1}),
+]
+
+_TABLE_REF_RE = re.compile(r'\b(?:FROM|JOIN)\s+([A-Z_][A-Z0-9_]*)(?:\s+(?:AS\s+)?([a-z_][a-z0-9_]*))?')
+
+
+def _alias_map(query):
+    """EXPLAIN 'table' kolonu alias döndürür; alias -> tablo adı eşlemesi"""
+    aliases = {}
+    for table, alias in _TABLE_REF_RE.findall(query):
+        aliases[table] = table
+        if alias:
+            aliases[alias] = table
+    return aliases
+
+
+def _sample_requests(app):
+    """(endpoint, url) listesi: her GET kuralı + EXTRA_REQUESTS"""
+    requests = []
+    with app.test_request_context():
+        for rule in app.url_map.iter_rules():
+            if ('GET' not in rule.methods or not rule.rule.startswith('/api/')
+                    or rule.endpoint in SKIP_ENDPOINTS):
+                continue
+            values = {arg: 1 for arg in rule.arguments}
+            requests.append((rule.endpoint, url_for(rule.endpoint, **values)))
+        for endpoint, args in EXTRA_REQUESTS:
+            requests.append((endpoint, url_for(endpoint, **args)))
+    return requests
+
+
+def collect_statements(app):
+    """Endpoint'leri çağırıp çalışan SELECT'leri topla: [(endpoint, url, query, params)]"""
+    statements = []
+    seen = set()
+    current = {}
+
+    def listener(query, params):
+        key = (query, tuple(params or ()))
+        if key not in seen:
+            seen.add(key)
+            statements.append((current['endpoint'], current['url'], query, params))
+
+    add_statement_listener(listener)
+    try:
+        client = app.test_client()
+        for endpoint, url in _sample_requests(app):
+            current.update(endpoint=endpoint, url=url)
+            response = client.get(url)
+            next_cursor = response.headers.get('X-Next-Cursor')
+            if next_cursor:
+                # Cursor'lı (ikinci) sayfanın sorgusu da kontrol edilsin
+                separator = '&' if '?' in url else '?'
+                current['url'] = url + separator + urlencode({'cursor': next_cursor})
+                client.get(current['url'])
+    finally:
+        remove_statement_listener(listener)
+    return statements
+
+
+def explain(query, params=None):
+    conn = get_db_connection()
+    if not conn:
+        raise RuntimeError("Veritabanı bağlantısı kurulamadı")
+    try:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("EXPLAIN " + query.strip().rstrip(';'), params or ())
+        rows = cursor.fetchall()
+        cursor.close()
+        return rows
+    finally:
+        conn.close()
+
+
+def find_full_scans(app, min_rows=1000):
+    """Problemli plan satırlarını döndür: [(endpoint, url, tablo, tahmini_satır, query)]"""
+    problems = []
+    for endpoint, url, query, params in collect_statements(app):
+        if endpoint in AGGREGATE_ENDPOINTS:
+            continue
+        aliases = _alias_map(query)
+        for row in explain(query, params):
+            if row.get('type') != 'ALL':
+                continue
+            alias = row.get('table') or ''
+            if alias.startswith('<'):
+                # <derivedN>, <subqueryN>: kaynak tablolar ayrı satırlarda kontrol ediliyor
+                continue
+            table = aliases.get(alias, alias)
+            if table.upper() in SMALL_TABLES:
+                continue
+            if (row.get('rows') or 0) < min_rows:
+                continue
+            problems.append((endpoint, url, table, row.get('rows'), query))
+    return problems
@@ -0,0 +1,58 @@
+# Schema Migrations
+# database/migrations/NNN_aciklama.sql dosyaları sırayla uygulanır;
+# uygulananlar SCHEMA_MIGRATIONS tablosunda tutulur.
+import os
+import re
+
+from models.database import transaction
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                              '..', '..', 'database', 'migrations')
+
+_FILENAME_RE = re.compile(r'^(\d+)_([\w-]+)\.sql$')
+
+
+def discover_migrations(directory=MIGRATIONS_DIR):
+    """[(version, name, path), ...] - versiyona göre sıralı"""
+    found = []
+    for filename in os.listdir(directory):
+        match = _FILENAME_RE.match(filename)
+        if match:
+            found.append((match.group(1), match.group(2), os.path.join(directory, filename)))
+    return sorted(found)
+
+
+def split_statements(sql):
+    """SQL dosyasını statement'lara böl ('--' yorum satırları atlanır)"""
+    lines = [line for line in sql.splitlines() if not line.strip().startswith('--')]
+    return [stmt.strip() for stmt in "\n".join(lines).split(';') if stmt.strip()]
+
+
+def migrate():
+    """Uygulanmamış migration'ları çalıştır; uygulanan versiyonların listesini döndür"""
+    with transaction() as cursor:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS SCHEMA_MIGRATIONS (
+                version VARCHAR(10) PRIMARY KEY,
+                name VARCHAR(100) NOT NULL,
+                applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        cursor.execute("SELECT version FROM SCHEMA_MIGRATIONS")
+        applied = {row['version'] for row in cursor.fetchall()}
+
+    newly_applied = []
+    for version, name, path in discover_migrations():
+        if version in applied:
+            continue
+        with open(path, encoding='utf-8') as f:
+            statements = split_statements(f.read())
+        # DDL implicit commit yapar; migration'lar tekrar çalıştırılabilir değilse
+        # yarıda kalan bir migration elle düzeltilmelidir
+        with transaction() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+            cursor.execute("INSERT INTO SCHEMA_MIGRATIONS (version, name) VALUES (%s, %s)",
+                           (version, name))
+        newly_applied.append(version)
+    return newly_applied
@@ -0,0 +1,328 @@
+# Connection Pool Module
+# Thread-safe MySQL bağlantı havuzu (size + overflow + timeout + liveness check)
+# Her bağlantı kendi server-side prepared statement cache'ini taşır (StatementCache);
+# bağlantı recycle/invalidate edilince statement'ları da kapatılır.
+import threading
+import time
+from collections import OrderedDict, deque
+
+import mysql.connector
+from mysql.connector import errors
+
+
+class PoolTimeoutError(errors.PoolError):
+    """Checkout timeout içinde boş bağlantı bulunamadı"""
+
+
+class StatementCache:
+    """
+    Bağlantı başına prepared statement LRU'su: SQL metni -> (prepared cursor, SQL).
+    mysql-connector bir prepared cursor'da statement'ı yalnızca execute'a *aynı string
+    nesnesi* verilirse yeniden kullanır; bu yüzden cursor ilk çalıştırılan string ile saklanır.
+    Kapasite aşılınca en eski statement server'da da kapatılır (DEALLOCATE).
+    """
+    _totals = {"hits": 0, "misses": 0, "evictions": 0}
+    _totals_lock = threading.Lock()
+
+    def __init__(self, raw, capacity):
+        self._raw = raw
+        self.capacity = capacity
+        self._entries = OrderedDict()
+
+    @classmethod
+    def _count(cls, name):
+        with cls._totals_lock:
+            cls._totals[name] += 1
+
+    @classmethod
+    def totals(cls):
+        with cls._totals_lock:
+            return dict(cls._totals)
+
+    def get(self, query):
+        """(cursor, sql): cursor.execute(sql, params) statement'ı tekrar prepare etmez"""
+        entry = self._entries.get(query)
+        if entry is not None:
+            self._entries.move_to_end(query)
+            self._count("hits")
+            return entry
+        self._count("misses")
+        entry = (self._raw.cursor(prepared=True, dictionary=True), query)
+        self._entries[query] = entry
+        if len(self._entries) > self.capacity:
+            _, (cursor, _) = self._entries.popitem(last=False)
+            self._close_cursor(cursor)
+            self._count("evictions")
+        return entry
+
+    def discard(self, query):
+        """Hata sonrası durumu belirsiz statement'ı at"""
+        entry = self._entries.pop(query, None)
+        if entry is not None:
+            self._close_cursor(entry[0])
+
+    def close(self):
+        entries = list(self._entries.values())
+        self._entries.clear()
+        for cursor, _ in entries:
+            self._close_cursor(cursor)
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def _close_cursor(cursor):
+        try:
+            cursor.close()
+        except Exception:
+            pass
+
+
+class _Entry:
+    """Havuzdaki ham bağlantı, prepared statement cache'i ve zaman bilgileri"""
+    __slots__ = ('raw', 'statements', 'created_at', 'last_used')
+
+    def __init__(self, raw, statements=None):
+        now = time.monotonic()
+        self.raw = raw
+        self.statements = statements
+        self.created_at = now
+        self.last_used = now
+
+
+class PooledConnection:
+    """Havuzdan alınan bağlantı; close() bağlantıyı kapatmaz, havuza geri verir"""
+
+    def __init__(self, pool, entry):
+        self._pool = pool
+        self._entry = entry
+        self._discard = False
+
+    def __getattr__(self, name):
+        entry = self.__dict__.get('_entry')
+        if entry is None:
+            raise errors.InterfaceError("Connection already returned to the pool")
+        return getattr(entry.raw, name)
+
+    @property
+    def statements(self):
+        """Bağlantının prepared statement cache'i (kapalıysa None)"""
+        return self._entry.statements
+
+    def invalidate(self):
+        """Bağlantıyı bozuk işaretle; close() sırasında havuza dönmeden kapatılır"""
+        self._discard = True
+
+    def close(self):
+        if self._entry is None:
+            return
+        entry, self._entry = self._entry, None
+        self._pool._release(entry, discard=self._discard)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None and issubclass(exc_type, (errors.OperationalError, errors.InterfaceError)):
+            self.invalidate()
+        self.close()
+        return False
+
+
+class ConnectionPool:
+    """
+    Sabit boyutlu havuz + geçici overflow bağlantıları.
+
+    - size: boşta tutulan kalıcı bağlantı sayısı
+    - max_overflow: yoğunlukta size'ın üstüne açılabilecek ek bağlantı sayısı
+    - timeout: havuz doluyken checkout için beklenecek maksimum süre (saniye)
+    - recycle: bu yaştan eski bağlantılar checkout sırasında yenilenir (saniye)
+    - pre_ping: bu süreden uzun boşta kalan bağlantılar kullanılmadan önce ping'lenir
+    - statement_cache_size: bağlantı başına prepared statement sayısı (0: kapalı)
+    """
+
+    def __init__(self, config, size=5, max_overflow=10, timeout=10.0,
+                 recycle=3600, pre_ping=30.0, statement_cache_size=0):
+        self._config = dict(config)
+        self.size = size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.recycle = recycle
+        self.pre_ping = pre_ping
+        self.statement_cache_size = statement_cache_size
+
+        self._idle = deque()
+        self._cond = threading.Condition()
+        self._opened = 0
+        self._in_use = 0
+        self._waiters = 0
+
+        # İstatistikler
+        self._checkouts = 0
+        self._timeouts = 0
+        self._connects = 0
+        self._recycled = 0
+        self._invalidated = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    # --- CHECKOUT / RETURN ---
+    def acquire(self):
+        """Havuzdan bağlantı al; gerekirse timeout süresince bekle"""
+        start = time.monotonic()
+        deadline = start + self.timeout
+        entry = None
+
+        with self._cond:
+            while True:
+                if self._idle:
+                    entry = self._idle.pop()
+                    break
+                if self._opened < self.size + self.max_overflow:
+                    self._opened += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeoutError(
+                        f"Connection pool exhausted (size={self.size}, "
+                        f"overflow={self.max_overflow}, timeout={self.timeout}s)"
+                    )
+                self._waiters += 1
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiters -= 1
+
+            self._in_use += 1
+            waited = time.monotonic() - start
+            self._checkouts += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+
+        try:
+            entry = self._prepare(entry)
+        except Exception:
+            with self._cond:
+                self._opened -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+        conn = PooledConnection(self, entry)
+        conn.wait_time = waited
+        return conn
+
+    def _prepare(self, entry):
+        """Yeni bağlantı aç veya boştaki bağlantının canlı olduğunu doğrula"""
+        if entry is None:
+            return self._connect()
+
+        now = time.monotonic()
+        if self.recycle and now - entry.created_at > self.recycle:
+            self._close_entry(entry)
+            with self._cond:
+                self._recycled += 1
+            return self._connect()
+
+        if self.pre_ping is not None and now - entry.last_used > self.pre_ping:
+            try:
+                entry.raw.ping(reconnect=False)
+            except mysql.connector.Error:
+                self._close_entry(entry)
+                with self._cond:
+                    self._invalidated += 1
+                return self._connect()
+
+        return entry
+
+    def _connect(self):
+        raw = mysql.connector.connect(**self._config)
+        with self._cond:
+            self._connects += 1
+        statements = StatementCache(raw, self.statement_cache_size) if self.statement_cache_size else None
+        return _Entry(raw, statements)
+
+    def _release(self, entry, discard=False):
+        """Bağlantıyı havuza geri ver (açık transaction rollback edilir)"""
+        if not discard:
+            try:
+                # Okuma sorguları da REPEATABLE READ snapshot'ı açık bırakır
+                entry.raw.rollback()
+            except mysql.connector.Error:
+                discard = True
+
+        with self._cond:
+            self._in_use -= 1
+            if discard or len(self._idle) >= self.size:
+                self._opened -= 1
+                if discard:
+                    self._invalidated += 1
+                close = True
+            else:
+                entry.last_used = time.monotonic()
+                self._idle.append(entry)
+                close = False
+            self._cond.notify()
+
+        if close:
+            self._close_entry(entry)
+
+    @staticmethod
+    def _close_entry(entry):
+        if entry.statements is not None:
+            # Bağlantı hâlâ açıksa statement'lar server'da da serbest bırakılır
+            entry.statements.close()
+        try:
+            entry.raw.close()
+        except Exception:
+            pass
+
+    # --- YÖNETİM ---
+    @property
+    def in_use(self):
+        """Şu an kullanımda olan bağlantı sayısı (kilitsiz okuma; yük dağıtımı için)"""
+        return self._in_use
+
+    def dispose(self):
+        """Boştaki tüm bağlantıları kapat"""
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._opened -= len(idle)
+        for entry in idle:
+            self._close_entry(entry)
+
+    def stats(self):
+        """/health için havuz istatistikleri"""
+        with self._cond:
+            return {
+                "size": self.size,
+                "max_overflow": self.max_overflow,
+                "opened": self._opened,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "overflow": max(0, self._opened - self.size),
+                "waiters": self._waiters,
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "connects": self._connects,
+                "recycled": self._recycled,
+                "invalidated": self._invalidated,
+                "wait_time_total_ms": round(self._wait_total * 1000, 2),
+                "wait_time_avg_ms": round(self._wait_total * 1000 / self._checkouts, 3) if self._checkouts else 0,
+                "wait_time_max_ms": round(self._wait_max * 1000, 2),
+                "prepared_statements": self._statement_stats(),
+            }
+
+    def _statement_stats(self):
+        if not self.statement_cache_size:
+            return None
+        totals = StatementCache.totals()
+        lookups = totals["hits"] + totals["misses"]
+        return {
+            "per_connection": self.statement_cache_size,
+            "cached_idle": sum(len(e.statements) for e in self._idle if e.statements is not None),
+            **totals,
+            "hit_ratio": round(totals["hits"] / lookups, 3) if lookups else 0,
+        }
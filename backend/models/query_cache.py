@@ -0,0 +1,193 @@
+# Query Result Cache
+# execute_query(..., cached=True) sonuçlarını SQL metni + parametrelere göre bellekte tutar.
+# Her kayıt okuduğu tabloları bilir; execute_insert_update/transaction bir tabloya yazdığında
+# o tabloya bağlı tüm kayıtlar silinir. LRU + bellek bütçesi + kayıt başına TTL.
+#
+# Not: Cache process içindedir. Birden fazla worker process varsa, başka bir process'in
+# yazdığı veri en fazla TTL kadar gecikmeyle görülür.
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+_READ_TABLES_RE = re.compile(r'\b(?:FROM|JOIN)\s+`?([A-Za-z_][A-Za-z0-9_]*)`?', re.IGNORECASE)
+_WRITE_TABLE_RE = re.compile(
+    r'^\s*(?:INSERT\s+(?:IGNORE\s+)?INTO|REPLACE\s+INTO|UPDATE|DELETE\s+FROM|TRUNCATE(?:\s+TABLE)?|ALTER\s+TABLE|DROP\s+TABLE(?:\s+IF\s+EXISTS)?)\s+`?([A-Za-z_][A-Za-z0-9_]*)`?',
+    re.IGNORECASE,
+)
+_DELETE_RE = re.compile(r'^\s*(?:DELETE|TRUNCATE|DROP)\b', re.IGNORECASE)
+
+# ON DELETE CASCADE ilişkileri (database/gastromind.sql): parent silinince child'lar da değişir
+CASCADES = {
+    'CUSTOMERS': ('DIETARYRESTRICTIONS', 'RESERVATIONS'),
+    'RESERVATIONS': ('DININGSESSIONS',),
+    'DININGSESSIONS': ('ORDERS', 'FEEDBACK'),
+    'ORDERS': ('ORDERDETAILS',),
+    'STAFF': ('SHIFTSCHEDULES', 'ROLLUP_STAFF_SALES'),
+    'MENUITEMS': ('ROLLUP_ITEM_SALES',),
+    'TABLES': ('ROLLUP_TABLE_STATS',),
+}
+
+# SQL anahtar kelimeleri tablo adı sanılmasın (ör. "FROM (SELECT", "EXTRACT(DAY FROM x)")
+_NOT_TABLES = {'SELECT', 'DUAL', 'LATERAL'}
+
+
+def tables_read(query):
+    """SELECT'in okuduğu tablolar (büyük harf)"""
+    return frozenset(
+        name.upper() for name in _READ_TABLES_RE.findall(query)
+        if name.upper() not in _NOT_TABLES
+    )
+
+
+def tables_written(query):
+    """Yazma statement'ının değiştirdiği tablolar (DELETE için cascade dahil)"""
+    match = _WRITE_TABLE_RE.match(query)
+    if not match:
+        return set()
+    written = {match.group(1).upper()}
+    if _DELETE_RE.match(query):
+        pending = list(written)
+        while pending:
+            for child in CASCADES.get(pending.pop(), ()):
+                if child not in written:
+                    written.add(child)
+                    pending.append(child)
+    # UPDATE a JOIN b ... gibi çok tablolu yazmalarda okunan tablolar da temkinli olarak dahil
+    if re.match(r'^\s*UPDATE\b', query, re.IGNORECASE):
+        written |= tables_read(query)
+    return written
+
+
+def make_key(query, params):
+    if params is None:
+        return (query, None)
+    if isinstance(params, dict):
+        return (query, tuple(sorted(params.items())))
+    return (query, tuple(params))
+
+
+def _estimate_size(rows):
+    """Sonucun yaklaşık bellek boyutu (byte)"""
+    size = sys.getsizeof(rows)
+    for row in rows:
+        size += sys.getsizeof(row)
+        for key, value in row.items():
+            size += sys.getsizeof(key) + sys.getsizeof(value)
+    return size
+
+
+class _Entry:
+    __slots__ = ('rows', 'size', 'expires_at', 'tables')
+
+    def __init__(self, rows, size, expires_at, tables):
+        self.rows = rows
+        self.size = size
+        self.expires_at = expires_at
+        self.tables = tables
+
+
+class QueryCache:
+    """Thread-safe, tablo bağımlılıklı LRU sonuç cache'i"""
+
+    def __init__(self, max_bytes, default_ttl):
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()
+        self._by_table = defaultdict(set)
+        self._versions = defaultdict(int)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    def table_versions(self, tables):
+        """Okuma başlamadan önce alınır; put() sırasında değişmişse sonuç saklanmaz"""
+        with self._lock:
+            return tuple(self._versions[t] for t in sorted(tables))
+
+    def get(self, key):
+        """(bulundu_mu, satırlar) - satırlar kopya olarak döner"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return False, None
+            if entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self._expirations += 1
+                self._misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            rows = entry.rows
+        return True, [dict(row) for row in rows]
+
+    def put(self, key, rows, tables, versions, ttl=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        size = _estimate_size(rows)
+        if size > self.max_bytes:
+            return
+        rows = [dict(row) for row in rows]
+        with self._lock:
+            # Okuma sırasında bu tablolardan birine yazıldıysa sonuç eski olabilir
+            if tuple(self._versions[t] for t in sorted(tables)) != versions:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(rows, size, time.monotonic() + ttl, tables)
+            self._bytes += size
+            for table in tables:
+                self._by_table[table].add(key)
+            while self._bytes > self.max_bytes and self._entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._evictions += 1
+
+    def invalidate_tables(self, tables):
+        """Bu tablolara bağlı tüm kayıtları sil ve tablo versiyonlarını artır"""
+        with self._lock:
+            for table in tables:
+                self._versions[table] += 1
+                for key in list(self._by_table.pop(table, ())):
+                    if key in self._entries:
+                        self._remove(key)
+                        self._invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_table.clear()
+            self._bytes = 0
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        for table in entry.tables:
+            keys = self._by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_table[table]
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 3) if lookups else 0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+            }
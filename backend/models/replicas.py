@@ -0,0 +1,176 @@
+# Read Replicas
+# Okuma sorguları (execute_query, stream_query) DB_REPLICAS'taki replica'lara dağıtılır;
+# yazmalar ve transaction'lar her zaman primary'ye (DB_CONFIG) gider.
+#   - Her replica'nın kendi bağlantı havuzu vardır; en az meşgul (in_use) replica seçilir,
+#     eşitlikte sırayla (round robin)
+#   - Arka plandaki health check her DB_REPLICA_CHECK_INTERVAL saniyede bir bağlantıyı ve
+#     replikasyon gecikmesini (SHOW REPLICA STATUS -> Seconds_Behind_Source) kontrol eder
+#   - Gecikmesi DB_REPLICA_MAX_LAG'i aşan, replikasyonu durmuş veya bağlantı hatası veren
+#     replica bir sonraki başarılı kontrole kadar kullanılmaz
+#   - Uygun replica yoksa okumalar primary'ye düşer
+import threading
+import time
+
+import mysql.connector
+from models.pool import ConnectionPool
+
+_ER_PARSE_ERROR = 1064   # MySQL < 8.0.22: SHOW REPLICA STATUS yok
+
+
+class Replica:
+    """Tek bir replica: havuzu ve son health check sonucu"""
+
+    def __init__(self, name, pool):
+        self.name = name
+        self.pool = pool
+        self.healthy = True
+        self.lag = None          # saniye; replikasyon yapılandırılmamışsa None
+        self.error = None
+        self.checked_at = None
+        self.reads = 0
+        self.failures = 0
+        self._legacy_status = False
+
+
+class ReplicaSet:
+    """
+    Replica havuzları + health check + yük dağıtımı.
+
+    - configs: DB_CONFIG üzerine yazılacak bağlantı ayarları (host, port, ...)
+    - check_interval: health check aralığı (saniye)
+    - max_lag: bu gecikmeyi aşan replica'lar kullanılmaz (None: gecikme kontrolü yok)
+    """
+
+    def __init__(self, base_config, configs, pool_options, check_interval=5, max_lag=None):
+        self.check_interval = check_interval
+        self.max_lag = max_lag
+        self.replicas = []
+        for config in configs:
+            merged = {**base_config, **config}
+            name = f"{merged.get('host', 'localhost')}:{merged.get('port', 3306)}"
+            self.replicas.append(Replica(name, ConnectionPool(merged, **pool_options)))
+        self._lock = threading.Lock()
+        self._next = 0
+        self._thread = None
+        self._fallbacks = 0
+
+    def __bool__(self):
+        return bool(self.replicas)
+
+    # --- SEÇİM ---
+
+    def choose(self):
+        """Okuma için replica (uygun replica yoksa None -> primary)"""
+        self._start()
+        candidates = [r for r in self.replicas if r.healthy]
+        if not candidates:
+            with self._lock:
+                self._fallbacks += 1
+            return None
+        with self._lock:
+            self._next += 1
+            offset = self._next % len(candidates)
+            # min() eşitlikte ilk elemanı seçer: başlangıç noktası her çağrıda kayar
+            replica = min(candidates[offset:] + candidates[:offset], key=lambda r: r.pool.in_use)
+            replica.reads += 1
+        return replica
+
+    def mark_down(self, replica, err):
+        """Sorgu sırasında bağlantı hatası: bir sonraki health check'e kadar kullanma"""
+        replica.healthy = False
+        replica.error = str(err)
+        replica.failures += 1
+        print(f"Replica devre dışı ({replica.name}): {err}")
+
+    # --- HEALTH CHECK ---
+
+    def _start(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            # İlk kontrol senkron: gecikmesi bilinmeyen replica'ya okuma gönderilmesin
+            self.check()
+            self._thread = threading.Thread(target=self._loop, name='replica-health', daemon=True)
+            self._thread.start()
+
+    def _loop(self):
+        while True:
+            time.sleep(self.check_interval)
+            self.check()
+
+    def check(self):
+        for replica in self.replicas:
+            try:
+                lag = self._replication_lag(replica)
+            except mysql.connector.Error as err:
+                healthy, lag, error = False, None, str(err)
+            else:
+                if lag is False:
+                    healthy, lag, error = False, None, "Replikasyon durmuş"
+                elif self.max_lag is not None and lag is not None and lag > self.max_lag:
+                    healthy, error = False, f"Gecikme {lag}s > {self.max_lag}s"
+                else:
+                    healthy, error = True, None
+            if healthy != replica.healthy:
+                print(f"Replica {replica.name}: {'aktif' if healthy else 'devre dışı'}"
+                      + (f" ({error})" if error else ""))
+            replica.healthy, replica.lag, replica.error = healthy, lag, error
+            replica.checked_at = time.time()
+
+    def _replication_lag(self, replica):
+        """Saniye cinsinden gecikme; replikasyon yoksa None, thread'ler durmuşsa False"""
+        conn = replica.pool.acquire()
+        try:
+            cursor = conn.cursor(dictionary=True)
+            try:
+                if not replica._legacy_status:
+                    try:
+                        cursor.execute("SHOW REPLICA STATUS")
+                    except mysql.connector.Error as err:
+                        if err.errno != _ER_PARSE_ERROR:
+                            raise
+                        replica._legacy_status = True
+                if replica._legacy_status:
+                    cursor.execute("SHOW SLAVE STATUS")
+                rows = cursor.fetchall()
+            finally:
+                cursor.close()
+        except mysql.connector.Error:
+            conn.invalidate()
+            raise
+        finally:
+            conn.close()
+
+        if not rows:
+            # Replikasyon yapılandırılmamış (ör. yerel test instance'ı): gecikme bilinmiyor
+            return None
+        # Çok kaynaklı replikasyonda en geride kalan kanal belirleyicidir
+        lags = [row.get('Seconds_Behind_Source', row.get('Seconds_Behind_Master')) for row in rows]
+        return False if None in lags else max(lags)
+
+    # --- YÖNETİM ---
+
+    def dispose(self):
+        for replica in self.replicas:
+            replica.pool.dispose()
+
+    def stats(self):
+        return {
+            "max_lag": self.max_lag,
+            "fallbacks_to_primary": self._fallbacks,
+            "replicas": [
+                {
+                    "name": r.name,
+                    "healthy": r.healthy,
+                    "lag_seconds": r.lag,
+                    "error": r.error,
+                    "reads": r.reads,
+                    "failures": r.failures,
+                    "checked_at": r.checked_at,
+                    "pool": r.pool.stats(),
+                }
+                for r in self.replicas
+            ],
+        }
@@ -0,0 +1,175 @@
+# Background Report Refresher (stale-while-revalidate)
+# Ağır raporlar istek thread'inde hesaplanmak yerine arka planda periyodik olarak hesaplanır
+# ve son sonuç (snapshot) bellekte tutulur. İstek her zaman eldeki snapshot'ı hemen alır;
+# snapshot eskimişse (süresi dolmuş veya okuduğu tablolara yazılmış) yenileme arka planda
+# başlatılır, istek beklemez. Sadece hiç snapshot yokken (ilk istek) hesaplama beklenir.
+# Tablo yazmaları snapshot'ı ancak en az min_refresh saniyelik olduğunda eskitir; yoğun
+# saatlerde her yazmada tüm geçmiş yeniden hesaplanmasın.
+#
+# Snapshot'lar process içindedir; her worker process kendi raporlarını hesaplar.
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import REPORT_MIN_REFRESH, REPORT_REFRESH_WORKERS
+from models.database import execute_query, table_versions
+
+
+class _Report:
+    __slots__ = ('name', 'compute', 'query', 'interval', 'min_refresh', 'tables')
+
+    def __init__(self, name, compute, query, interval, min_refresh, tables):
+        self.name = name
+        self.compute = compute
+        self.query = query
+        self.interval = interval
+        self.min_refresh = min_refresh
+        self.tables = tables
+
+
+class Snapshot:
+    """Bir raporun hesaplanmış sonucu"""
+    __slots__ = ('rows', 'computed_at', 'duration', 'versions')
+
+    def __init__(self, rows, computed_at, duration, versions):
+        self.rows = rows
+        self.computed_at = computed_at   # time.time()
+        self.duration = duration         # hesaplama süresi (saniye)
+        self.versions = versions         # hesaplama başındaki tablo versiyonları
+
+    @property
+    def age(self):
+        return max(0.0, time.time() - self.computed_at)
+
+
+class ReportScheduler:
+    def __init__(self, workers=2, tick=5.0):
+        self._reports = {}
+        self._snapshots = {}
+        self._inflight = {}   # rapor adı -> threading.Event (yenileme bitince set edilir)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='report-refresh')
+        self._tick = tick
+        self._thread = None
+        self._stop = threading.Event()
+
+    def register(self, name, query_or_compute, interval, tables=(), min_refresh=REPORT_MIN_REFRESH):
+        """
+        query_or_compute: SQL metni veya satır listesi döndüren fonksiyon (hata olursa None).
+        interval: saniye; bu yaştan eski snapshot'lar yenilenir.
+        tables: rapor bu tablolara yazıldığında da eskimiş sayılır (snapshot en az
+        min_refresh saniyelikse; interval'dan büyükse interval kullanılır).
+        """
+        if callable(query_or_compute):
+            compute, query = query_or_compute, None
+        else:
+            query = query_or_compute
+            compute = lambda: execute_query(query)
+        self._reports[name] = _Report(name, compute, query, interval, min(min_refresh, interval),
+                                      tuple(sorted(t.upper() for t in tables)))
+
+    def report(self, name):
+        return self._reports[name]
+
+    # --- ARKA PLAN ---
+
+    def start(self):
+        """Tüm raporları hemen hesaplamaya başla ve periyodik yenileme thread'ini çalıştır"""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._loop, name='report-scheduler', daemon=True)
+            self._thread.start()
+        for name in self._reports:
+            self._schedule(name)
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        while not self._stop.wait(self._tick):
+            for name in list(self._reports):
+                if self.is_stale(name):
+                    self._schedule(name)
+
+    def _schedule(self, name):
+        """Yenileme başlat (zaten çalışıyorsa aynı yenilemenin Event'ini döndür)"""
+        with self._lock:
+            event = self._inflight.get(name)
+            if event is not None:
+                return event
+            event = self._inflight[name] = threading.Event()
+        self._executor.submit(self._refresh, name, event)
+        return event
+
+    def _refresh(self, name, event):
+        report = self._reports[name]
+        try:
+            versions = table_versions(report.tables)
+            started = time.perf_counter()
+            rows = report.compute()
+            duration = time.perf_counter() - started
+            if rows is None:
+                # Hata: eski snapshot (varsa) sunulmaya devam eder
+                print(f"Rapor yenilenemedi: {name}")
+                return
+            with self._lock:
+                self._snapshots[name] = Snapshot(rows, time.time(), duration, versions)
+        except Exception as e:
+            print(f"Rapor yenileme hatası ({name}): {e}")
+        finally:
+            with self._lock:
+                self._inflight.pop(name, None)
+            event.set()
+
+    # --- OKUMA ---
+
+    def is_stale(self, name):
+        report = self._reports[name]
+        snapshot = self._snapshots.get(name)
+        if snapshot is None:
+            return True
+        age = snapshot.age
+        if age >= report.interval:
+            return True
+        return age >= report.min_refresh and snapshot.versions != table_versions(report.tables)
+
+    def is_refreshing(self, name):
+        with self._lock:
+            return name in self._inflight
+
+    def get(self, name, wait_timeout=30.0):
+        """
+        (snapshot, stale) döndür. Snapshot eskiyse arka planda yenileme başlatılır ve
+        eski snapshot döner. Hiç snapshot yoksa ilk hesaplama en fazla wait_timeout beklenir;
+        hâlâ yoksa (None, True).
+        """
+        snapshot = self._snapshots.get(name)
+        if snapshot is None:
+            self._schedule(name).wait(wait_timeout)
+            snapshot = self._snapshots.get(name)
+            if snapshot is None:
+                return None, True
+        stale = self.is_stale(name)
+        if stale:
+            self._schedule(name)
+        return snapshot, stale
+
+    def stats(self):
+        with self._lock:
+            snapshots = dict(self._snapshots)
+            inflight = set(self._inflight)
+        return {
+            name: {
+                "interval": report.interval,
+                "age": round(snapshots[name].age, 1) if name in snapshots else None,
+                "compute_ms": round(snapshots[name].duration * 1000, 1) if name in snapshots else None,
+                "refreshing": name in inflight,
+            }
+            for name, report in self._reports.items()
+        }
+
+
+report_scheduler = ReportScheduler(workers=REPORT_REFRESH_WORKERS)
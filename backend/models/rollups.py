@@ -0,0 +1,420 @@
+# Report Rollup Tables
+# Rapor endpoint'leri her istekte tüm geçmişi yeniden toplamak yerine bu özet tablolardan okur.
+# Yazma yolları (sipariş, sipariş detayı, oturum, rezervasyon) aynı transaction içinde
+# buradaki on_* fonksiyonlarını çağırarak özetleri artımlı olarak günceller.
+#
+#   ROLLUP_DAILY_REVENUE  -> /api/reports/daily-revenue      (gün başına)
+#   ROLLUP_ITEM_SALES     -> /api/reports/top-menu-items     (ürün başına)
+#   ROLLUP_STAFF_SALES    -> /api/reports/staff-performance  (personel başına)
+#   ROLLUP_TABLE_STATS    -> /api/reports/table-performance  (masa başına)
+#   ROLLUP_FEEDBACK_RATINGS -> /api/feedback/rating-summary, /api/feedback/ratings
+#                            (gün x {tümü, masa, personel} başına puan dağılımı)
+#
+# NULL total_amount değerleri 0 olarak sayılır.
+from models.database import transaction
+
+ROLLUP_TABLES_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS ROLLUP_DAILY_REVENUE (
+        day DATE PRIMARY KEY,
+        total_sessions INT NOT NULL DEFAULT 0,
+        daily_revenue DECIMAL(14, 2) NOT NULL DEFAULT 0.00
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS ROLLUP_ITEM_SALES (
+        item_id INT PRIMARY KEY,
+        total_quantity INT NOT NULL DEFAULT 0,
+        order_count INT NOT NULL DEFAULT 0,
+        FOREIGN KEY (item_id) REFERENCES MENUITEMS(item_id) ON DELETE CASCADE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS ROLLUP_STAFF_SALES (
+        staff_id INT PRIMARY KEY,
+        total_orders INT NOT NULL DEFAULT 0,
+        total_revenue DECIMAL(14, 2) NOT NULL DEFAULT 0.00,
+        FOREIGN KEY (staff_id) REFERENCES STAFF(staff_id) ON DELETE CASCADE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS ROLLUP_TABLE_STATS (
+        table_id INT PRIMARY KEY,
+        total_bookings INT NOT NULL DEFAULT 0,
+        completed_sessions INT NOT NULL DEFAULT 0,
+        total_revenue DECIMAL(14, 2) NOT NULL DEFAULT 0.00,
+        FOREIGN KEY (table_id) REFERENCES TABLES(table_id) ON DELETE CASCADE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS ROLLUP_FEEDBACK_RATINGS (
+        dimension VARCHAR(8) NOT NULL,
+        dimension_id INT NOT NULL,
+        day DATE NOT NULL,
+        feedback_count INT NOT NULL DEFAULT 0,
+        rating_sum INT NOT NULL DEFAULT 0,
+        one_star INT NOT NULL DEFAULT 0,
+        two_star INT NOT NULL DEFAULT 0,
+        three_star INT NOT NULL DEFAULT 0,
+        four_star INT NOT NULL DEFAULT 0,
+        five_star INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (dimension, dimension_id, day)
+    )
+    """,
+]
+
+# Feedback -> (dimension, dimension_id, day, rating) satırları. Gün session başlangıcıdır;
+# 'all' tüm restoran (dimension_id 0), 'table' rezervasyonun masası, 'staff' session'da
+# sipariş alan her personel (personel başına bir kez; STAFF küçük, ORDERS session_id index'i ile
+# yoklanır). {where} her dala uygulanır, parametreler dal sayısı (3) kadar tekrarlanmalıdır.
+_FEEDBACK_BUCKETS = """
+    SELECT 'all' AS dimension, 0 AS dimension_id, DATE(ds.start_time) AS day, f.rating
+    FROM FEEDBACK f
+    JOIN DININGSESSIONS ds ON f.session_id = ds.session_id
+    LEFT JOIN RESERVATIONS r ON ds.reservation_id = r.reservation_id
+    WHERE f.rating IS NOT NULL AND ds.start_time IS NOT NULL AND {where}
+    UNION ALL
+    SELECT 'table', r.table_id, DATE(ds.start_time), f.rating
+    FROM FEEDBACK f
+    JOIN DININGSESSIONS ds ON f.session_id = ds.session_id
+    JOIN RESERVATIONS r ON ds.reservation_id = r.reservation_id
+    WHERE f.rating IS NOT NULL AND ds.start_time IS NOT NULL AND r.table_id IS NOT NULL AND {where}
+    UNION ALL
+    SELECT 'staff', s.staff_id, DATE(ds.start_time), f.rating
+    FROM FEEDBACK f
+    JOIN DININGSESSIONS ds ON f.session_id = ds.session_id
+    LEFT JOIN RESERVATIONS r ON ds.reservation_id = r.reservation_id
+    JOIN STAFF s ON EXISTS (SELECT 1 FROM ORDERS o
+                            WHERE o.session_id = f.session_id AND o.staff_id = s.staff_id)
+    WHERE f.rating IS NOT NULL AND ds.start_time IS NOT NULL AND {where}
+"""
+
+_FEEDBACK_COUNTS = """
+    SELECT b.dimension, b.dimension_id, b.day, COUNT(*) AS n, SUM(b.rating) AS rating_sum,
+           SUM(b.rating = 1) AS one_star, SUM(b.rating = 2) AS two_star,
+           SUM(b.rating = 3) AS three_star, SUM(b.rating = 4) AS four_star,
+           SUM(b.rating = 5) AS five_star
+    FROM ({buckets}) b
+    GROUP BY b.dimension, b.dimension_id, b.day
+"""
+
+
+def _feedback_counts(where):
+    return _FEEDBACK_COUNTS.format(buckets=_FEEDBACK_BUCKETS.format(where=where))
+
+# Tam yeniden hesaplama (backfill). DELETE kullanılıyor: TRUNCATE implicit commit yapar,
+# DELETE ile okuyucular rebuild süresince eski özetleri görmeye devam eder.
+REBUILD_SQL = [
+    "DELETE FROM ROLLUP_DAILY_REVENUE",
+    """
+    INSERT INTO ROLLUP_DAILY_REVENUE (day, total_sessions, daily_revenue)
+    SELECT DATE(ds.start_time), COUNT(*), COALESCE(SUM(ds.total_amount), 0)
+    FROM DININGSESSIONS ds
+    WHERE ds.start_time IS NOT NULL
+    GROUP BY DATE(ds.start_time)
+    """,
+    "DELETE FROM ROLLUP_ITEM_SALES",
+    """
+    INSERT INTO ROLLUP_ITEM_SALES (item_id, total_quantity, order_count)
+    SELECT od.item_id, COALESCE(SUM(od.quantity), 0), COUNT(DISTINCT od.order_id)
+    FROM ORDERDETAILS od
+    WHERE od.item_id IS NOT NULL AND od.order_id IS NOT NULL
+    GROUP BY od.item_id
+    """,
+    "DELETE FROM ROLLUP_STAFF_SALES",
+    """
+    INSERT INTO ROLLUP_STAFF_SALES (staff_id, total_orders, total_revenue)
+    SELECT o.staff_id, COUNT(*), COALESCE(SUM(ds.total_amount), 0)
+    FROM ORDERS o
+    LEFT JOIN DININGSESSIONS ds ON o.session_id = ds.session_id
+    WHERE o.staff_id IS NOT NULL
+    GROUP BY o.staff_id
+    """,
+    "DELETE FROM ROLLUP_TABLE_STATS",
+    """
+    INSERT INTO ROLLUP_TABLE_STATS (table_id, total_bookings, completed_sessions, total_revenue)
+    SELECT r.table_id, COUNT(DISTINCT r.reservation_id), COUNT(ds.session_id),
+           COALESCE(SUM(ds.total_amount), 0)
+    FROM RESERVATIONS r
+    LEFT JOIN DININGSESSIONS ds ON r.reservation_id = ds.reservation_id
+    WHERE r.table_id IS NOT NULL
+    GROUP BY r.table_id
+    """,
+    "DELETE FROM ROLLUP_FEEDBACK_RATINGS",
+    """
+    INSERT INTO ROLLUP_FEEDBACK_RATINGS (dimension, dimension_id, day, feedback_count, rating_sum,
+                                         one_star, two_star, three_star, four_star, five_star)
+    """ + _feedback_counts("TRUE"),
+]
+
+
+def rebuild_rollups():
+    """Özet tabloları oluştur (yoksa) ve tüm geçmişten yeniden hesapla"""
+    with transaction() as cursor:
+        for ddl in ROLLUP_TABLES_DDL:
+            cursor.execute(ddl)
+    with transaction() as cursor:
+        for statement in REBUILD_SQL:
+            cursor.execute(statement)
+
+
+# Özet tablo ile canlı toplamın farklı olduğu satırlar (flask check-rollups).
+# Tam geçmiş üzerinde toplama yapar; artımlı güncellemelerin kaçırdığı yazmaları bulmak içindir.
+DRIFT_SQL = {
+    'ROLLUP_DAILY_REVENUE': """
+        SELECT x.day AS id, x.revenue AS expected, rd.daily_revenue AS actual
+        FROM (SELECT DATE(start_time) AS day, COALESCE(SUM(total_amount), 0) AS revenue
+              FROM DININGSESSIONS WHERE start_time IS NOT NULL
+              GROUP BY DATE(start_time)) x
+        LEFT JOIN ROLLUP_DAILY_REVENUE rd ON rd.day = x.day
+        WHERE rd.day IS NULL OR rd.daily_revenue <> x.revenue
+    """,
+    'ROLLUP_TABLE_STATS': """
+        SELECT x.table_id AS id, x.revenue AS expected, rt.total_revenue AS actual
+        FROM (SELECT r.table_id, COALESCE(SUM(ds.total_amount), 0) AS revenue
+              FROM RESERVATIONS r JOIN DININGSESSIONS ds ON r.reservation_id = ds.reservation_id
+              WHERE r.table_id IS NOT NULL
+              GROUP BY r.table_id) x
+        LEFT JOIN ROLLUP_TABLE_STATS rt ON rt.table_id = x.table_id
+        WHERE rt.table_id IS NULL OR rt.total_revenue <> x.revenue
+    """,
+    'ROLLUP_STAFF_SALES': """
+        SELECT x.staff_id AS id, x.revenue AS expected, rs.total_revenue AS actual
+        FROM (SELECT o.staff_id, COALESCE(SUM(ds.total_amount), 0) AS revenue
+              FROM ORDERS o LEFT JOIN DININGSESSIONS ds ON o.session_id = ds.session_id
+              WHERE o.staff_id IS NOT NULL
+              GROUP BY o.staff_id) x
+        LEFT JOIN ROLLUP_STAFF_SALES rs ON rs.staff_id = x.staff_id
+        WHERE rs.staff_id IS NULL OR rs.total_revenue <> x.revenue
+    """,
+}
+
+
+def find_rollup_drift():
+    """Ciro özetlerinin canlı veriden saptığı satırlar: [(tablo, id, beklenen, özet)]"""
+    drift = []
+    with transaction() as cursor:
+        for table, query in DRIFT_SQL.items():
+            cursor.execute(query)
+            drift += [(table, row['id'], row['expected'], row['actual']) for row in cursor.fetchall()]
+    return drift
+
+
+# --- ARTIMLI GÜNCELLEMELER ---
+# Hepsi çağıranın transaction cursor'ını alır; yazma ile özet güncellemesi birlikte commit olur.
+
+def on_reservation_created(cursor, table_id):
+    """Yeni rezervasyon: masa rezervasyon sayısı +1"""
+    if table_id is None:
+        return
+    cursor.execute("""
+        INSERT INTO ROLLUP_TABLE_STATS (table_id, total_bookings) VALUES (%s, 1)
+        ON DUPLICATE KEY UPDATE total_bookings = total_bookings + 1
+    """, (table_id,))
+
+
+def on_session_created(cursor, session_id):
+    """Yeni dining session: gün ve masa özetlerine ekle"""
+    cursor.execute("""
+        SELECT DATE(ds.start_time) AS day, COALESCE(ds.total_amount, 0) AS amount, r.table_id
+        FROM DININGSESSIONS ds
+        LEFT JOIN RESERVATIONS r ON ds.reservation_id = r.reservation_id
+        WHERE ds.session_id = %s
+    """, (session_id,))
+    row = cursor.fetchone()
+    if not row:
+        return
+    if row['day'] is not None:
+        cursor.execute("""
+            INSERT INTO ROLLUP_DAILY_REVENUE (day, total_sessions, daily_revenue) VALUES (%s, 1, %s)
+            ON DUPLICATE KEY UPDATE total_sessions = total_sessions + 1,
+                                    daily_revenue = daily_revenue + VALUES(daily_revenue)
+        """, (row['day'], row['amount']))
+    if row['table_id'] is not None:
+        cursor.execute("""
+            INSERT INTO ROLLUP_TABLE_STATS (table_id, completed_sessions, total_revenue) VALUES (%s, 1, %s)
+            ON DUPLICATE KEY UPDATE completed_sessions = completed_sessions + 1,
+                                    total_revenue = total_revenue + VALUES(total_revenue)
+        """, (row['table_id'], row['amount']))
+
+
+def on_session_amount_changed(cursor, session_id, delta):
+    """
+    Session total_amount delta kadar değişti: gün, masa ve personel cirolarını güncelle.
+    Upsert: session API dışından oluşturulduysa (on_session_created çağrılmadı) günün / masanın
+    özet satırı henüz olmayabilir; ciro kaybolmasın diye satır 0 session ile açılır.
+    """
+    if not delta:
+        return
+    cursor.execute("""
+        INSERT INTO ROLLUP_DAILY_REVENUE (day, total_sessions, daily_revenue)
+        SELECT DATE(ds.start_time), 0, %s
+        FROM DININGSESSIONS ds
+        WHERE ds.session_id = %s AND ds.start_time IS NOT NULL
+        ON DUPLICATE KEY UPDATE daily_revenue = daily_revenue + VALUES(daily_revenue)
+    """, (delta, session_id))
+    cursor.execute("""
+        INSERT INTO ROLLUP_TABLE_STATS (table_id, total_bookings, completed_sessions, total_revenue)
+        SELECT r.table_id, 0, 0, %s
+        FROM DININGSESSIONS ds
+        JOIN RESERVATIONS r ON ds.reservation_id = r.reservation_id
+        WHERE ds.session_id = %s AND r.table_id IS NOT NULL
+        ON DUPLICATE KEY UPDATE total_revenue = total_revenue + VALUES(total_revenue)
+    """, (delta, session_id))
+    # Personel cirosu sipariş başına session tutarı olarak sayılıyor
+    cursor.execute("""
+        INSERT INTO ROLLUP_STAFF_SALES (staff_id, total_orders, total_revenue)
+        SELECT staff_id, 0, %s * COUNT(*) FROM ORDERS
+        WHERE session_id = %s AND staff_id IS NOT NULL
+        GROUP BY staff_id
+        ON DUPLICATE KEY UPDATE total_revenue = total_revenue + VALUES(total_revenue)
+    """, (delta, session_id))
+
+
+def on_order_created(cursor, order_id):
+    """Yeni sipariş: personelin sipariş sayısı +1, cirosuna session tutarı eklenir"""
+    cursor.execute("""
+        INSERT INTO ROLLUP_STAFF_SALES (staff_id, total_orders, total_revenue)
+        SELECT o.staff_id, 1, COALESCE(ds.total_amount, 0)
+        FROM ORDERS o
+        LEFT JOIN DININGSESSIONS ds ON o.session_id = ds.session_id
+        WHERE o.order_id = %s AND o.staff_id IS NOT NULL
+        ON DUPLICATE KEY UPDATE total_orders = total_orders + 1,
+                                total_revenue = total_revenue + VALUES(total_revenue)
+    """, (order_id,))
+
+
+def on_order_details_added(cursor, order_id, items):
+    """
+    ORDERDETAILS satırları eklendikten sonra çağrılır.
+    items: [(item_id, quantity), ...] - bu işlemde eklenen satırlar
+    """
+    added = {}
+    for item_id, quantity in items:
+        qty, rows = added.get(item_id, (0, 0))
+        added[item_id] = (qty + (quantity or 0), rows + 1)
+    if not added:
+        return
+
+    # Ürün bu siparişte ilk kez geçiyorsa order_count artar (COUNT(DISTINCT order_id))
+    placeholders = ", ".join(["%s"] * len(added))
+    cursor.execute(f"""
+        SELECT item_id, COUNT(*) AS n FROM ORDERDETAILS
+        WHERE order_id = %s AND item_id IN ({placeholders})
+        GROUP BY item_id
+    """, (order_id, *added))
+    existing = {row['item_id']: row['n'] for row in cursor.fetchall()}
+
+    cursor.executemany("""
+        INSERT INTO ROLLUP_ITEM_SALES (item_id, total_quantity, order_count) VALUES (%s, %s, %s)
+        ON DUPLICATE KEY UPDATE total_quantity = total_quantity + VALUES(total_quantity),
+                                order_count = order_count + VALUES(order_count)
+    """, [
+        (item_id, qty, 1 if existing.get(item_id, rows) == rows else 0)
+        for item_id, (qty, rows) in added.items()
+    ])
+
+
+def on_feedback_created(cursor, feedback_id):
+    """
+    Yeni feedback: gün, masa ve personel puan sayaçlarına ekle.
+    Feedback'ten sonra session'a sipariş alan yeni bir personel rebuild-rollups'a kadar sayılmaz.
+    """
+    cursor.execute("""
+        INSERT INTO ROLLUP_FEEDBACK_RATINGS (dimension, dimension_id, day, feedback_count, rating_sum,
+                                             one_star, two_star, three_star, four_star, five_star)
+        """ + _feedback_counts("f.feedback_id = %s") + """
+        ON DUPLICATE KEY UPDATE feedback_count = feedback_count + VALUES(feedback_count),
+                                rating_sum = rating_sum + VALUES(rating_sum),
+                                one_star = one_star + VALUES(one_star),
+                                two_star = two_star + VALUES(two_star),
+                                three_star = three_star + VALUES(three_star),
+                                four_star = four_star + VALUES(four_star),
+                                five_star = five_star + VALUES(five_star)
+    """, (feedback_id,) * 3)
+
+
+def _forget_feedback(cursor, where, params):
+    cursor.execute("""
+        UPDATE ROLLUP_FEEDBACK_RATINGS rf
+        JOIN (""" + _feedback_counts(where) + """) x
+            ON rf.dimension = x.dimension AND rf.dimension_id = x.dimension_id AND rf.day = x.day
+        SET rf.feedback_count = rf.feedback_count - x.n,
+            rf.rating_sum = rf.rating_sum - x.rating_sum,
+            rf.one_star = rf.one_star - x.one_star,
+            rf.two_star = rf.two_star - x.two_star,
+            rf.three_star = rf.three_star - x.three_star,
+            rf.four_star = rf.four_star - x.four_star,
+            rf.five_star = rf.five_star - x.five_star
+    """, tuple(params) * 3)
+
+
+def forget_feedback(cursor, feedback_ids):
+    """Feedback satırları silinmeden ÖNCE çağrılır; puan sayaçlarından düşer"""
+    feedback_ids = list(feedback_ids)
+    if feedback_ids:
+        _forget_feedback(cursor, f"f.feedback_id IN ({', '.join(['%s'] * len(feedback_ids))})",
+                         feedback_ids)
+
+
+# Müşteri silinmeden önce cascade ile silinecek kayıtların katkısı özetlerden düşülür
+_FORGET_CUSTOMERS_SQL = [
+    """
+    UPDATE ROLLUP_DAILY_REVENUE rd
+    JOIN (SELECT DATE(ds.start_time) AS day, COUNT(*) AS n,
+                 COALESCE(SUM(ds.total_amount), 0) AS amount
+          FROM DININGSESSIONS ds
+          JOIN RESERVATIONS r ON ds.reservation_id = r.reservation_id
+          WHERE r.customer_id IN ({ids})
+          GROUP BY DATE(ds.start_time)) x ON rd.day = x.day
+    SET rd.total_sessions = rd.total_sessions - x.n,
+        rd.daily_revenue = rd.daily_revenue - x.amount
+    """,
+    """
+    UPDATE ROLLUP_ITEM_SALES ri
+    JOIN (SELECT od.item_id, COALESCE(SUM(od.quantity), 0) AS qty,
+                 COUNT(DISTINCT od.order_id) AS n
+          FROM ORDERDETAILS od
+          JOIN ORDERS o ON od.order_id = o.order_id
+          JOIN DININGSESSIONS ds ON o.session_id = ds.session_id
+          JOIN RESERVATIONS r ON ds.reservation_id = r.reservation_id
+          WHERE r.customer_id IN ({ids})
+          GROUP BY od.item_id) x ON ri.item_id = x.item_id
+    SET ri.total_quantity = ri.total_quantity - x.qty,
+        ri.order_count = ri.order_count - x.n
+    """,
+    """
+    UPDATE ROLLUP_STAFF_SALES rs
+    JOIN (SELECT o.staff_id, COUNT(*) AS n, COALESCE(SUM(ds.total_amount), 0) AS amount
+          FROM ORDERS o
+          JOIN DININGSESSIONS ds ON o.session_id = ds.session_id
+          JOIN RESERVATIONS r ON ds.reservation_id = r.reservation_id
+          WHERE r.customer_id IN ({ids})
+          GROUP BY o.staff_id) x ON rs.staff_id = x.staff_id
+    SET rs.total_orders = rs.total_orders - x.n,
+        rs.total_revenue = rs.total_revenue - x.amount
+    """,
+    """
+    UPDATE ROLLUP_TABLE_STATS rt
+    JOIN (SELECT r.table_id, COUNT(DISTINCT r.reservation_id) AS bookings,
+                 COUNT(ds.session_id) AS sessions, COALESCE(SUM(ds.total_amount), 0) AS amount
+          FROM RESERVATIONS r
+          LEFT JOIN DININGSESSIONS ds ON r.reservation_id = ds.reservation_id
+          WHERE r.customer_id IN ({ids})
+          GROUP BY r.table_id) x ON rt.table_id = x.table_id
+    SET rt.total_bookings = rt.total_bookings - x.bookings,
+        rt.completed_sessions = rt.completed_sessions - x.sessions,
+        rt.total_revenue = rt.total_revenue - x.amount
+    """,
+]
+
+
+def forget_customers(cursor, customer_ids):
+    """Müşteri(ler) silinmeden ÖNCE çağrılır; rezervasyon/oturum/sipariş katkılarını düşer"""
+    customer_ids = list(customer_ids)
+    if not customer_ids:
+        return
+    ids = ", ".join(["%s"] * len(customer_ids))
+    for statement in _FORGET_CUSTOMERS_SQL:
+        cursor.execute(statement.format(ids=ids), customer_ids)
+    _forget_feedback(cursor, f"r.customer_id IN ({ids})", customer_ids)
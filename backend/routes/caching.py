@@ -0,0 +1,129 @@
+# HTTP Caching Helpers (ETag / Conditional GET / Cache-Control)
+# ETag, yanıt gövdesi hash'lenmeden endpoint'in okuduğu tabloların versiyon sayaçlarından
+# hesaplanır (models/query_cache.py). Tabloya her yazmada sayaç artar, ETag değişir.
+# If-None-Match eşleşirse view hiç çalışmaz: veritabanına gidilmeden 304 döner.
+# @precomputed: rapor arka planda hesaplanır, istek bellekteki snapshot'ı alır
+# (stale-while-revalidate, bkz. models/report_scheduler.py).
+import hashlib
+import time
+import uuid
+from functools import wraps
+
+from flask import jsonify, make_response, request
+from werkzeug.http import http_date
+from config import (ETAG_MAX_AGE, REPORT_REFRESH_INTERVALS, REPORT_DEFAULT_REFRESH,
+                    REPORT_FIRST_LOAD_TIMEOUT, REPORT_SCHEDULER_ENABLED)
+from models.database import table_versions
+from models.report_scheduler import report_scheduler
+from routes.streaming import ndjson_response, rows_json, wants_columnar, wants_stream
+
+# Sayaçlar process içinde tutulur; restart sonrası eski ETag'ler eşleşmesin
+_PROCESS_TOKEN = uuid.uuid4().hex[:8]
+
+
+def compute_etag(tables):
+    """
+    Tablo versiyonları + istek yolu (query string ve Accept dahil) üzerinden strong ETag.
+    Başka process'lerin yazmalarını göremediğimiz için ETag en fazla ETAG_MAX_AGE
+    saniye geçerli kalır.
+    """
+    epoch = int(time.time() // ETAG_MAX_AGE) if ETAG_MAX_AGE else 0
+    versions = table_versions(tables)
+    raw = f"{_PROCESS_TOKEN}|{epoch}|{versions}|{request.full_path}|{request.headers.get('Accept', '')}"
+    return hashlib.blake2b(raw.encode(), digest_size=12).hexdigest()
+
+
+def conditional(*tables):
+    """
+    Decorator: GET endpoint'ine tablo versiyonlu ETag ekler.
+
+        @menu_bp.route('')
+        @conditional('MENUITEMS', 'CATEGORIES')
+        def get_menu(): ...
+    """
+    tables = tuple(t.upper() for t in tables)
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            etag = compute_etag(tables)
+            if request.if_none_match.contains_weak(etag):
+                response = make_response('', 304)
+                response.set_etag(etag)
+                return response
+
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                response.set_etag(etag)
+                response.vary.add('Accept')
+            return response
+        return wrapper
+    return decorator
+
+
+def _set_freshness_headers(response, snapshot, stale, interval):
+    response.headers['Age'] = str(int(snapshot.age))
+    response.headers['X-Report-Generated-At'] = http_date(snapshot.computed_at)
+    response.headers['X-Report-Stale'] = 'true' if stale else 'false'
+    response.headers['X-Report-Refresh-Interval'] = str(interval)
+    response.headers['X-Report-Compute-Ms'] = f"{snapshot.duration * 1000:.1f}"
+
+
+def precomputed(name, *tables):
+    """
+    Decorator: fonksiyon raporun satırlarını hesaplar (hata olursa None) ve
+    report_scheduler'a kaydedilir. Endpoint sorgu çalıştırmaz, son snapshot'ı döndürür;
+    snapshot eskiyse yenileme arka planda başlar. ETag snapshot'a bağlıdır.
+
+        @reports_bp.route('/customer-spending')
+        @precomputed('customer-spending', 'CUSTOMERS', 'RESERVATIONS', 'DININGSESSIONS')
+        def get_customer_spending():
+            return execute_query("SELECT ...")
+    """
+    interval = REPORT_REFRESH_INTERVALS.get(name, REPORT_DEFAULT_REFRESH)
+
+    def decorator(compute):
+        report_scheduler.register(name, compute, interval, tables)
+
+        @wraps(compute)
+        def wrapper():
+            snapshot, stale = report_scheduler.get(name, REPORT_FIRST_LOAD_TIMEOUT)
+            if snapshot is None:
+                response = make_response(jsonify({"error": "Rapor hazırlanıyor, lütfen tekrar deneyin"}), 503)
+                response.headers['Retry-After'] = '5'
+                return response
+
+            stream = wants_stream()
+            raw = f"{_PROCESS_TOKEN}|{name}|{snapshot.computed_at}|{stream}|{wants_columnar()}"
+            etag = hashlib.blake2b(raw.encode(), digest_size=12).hexdigest()
+            if request.if_none_match.contains_weak(etag):
+                response = make_response('', 304)
+            else:
+                response = make_response(ndjson_response(snapshot.rows) if stream
+                                         else rows_json(snapshot.rows))
+                response.vary.add('Accept')
+            response.set_etag(etag)
+            _set_freshness_headers(response, snapshot, stale, interval)
+            return response
+        return wrapper
+    return decorator
+
+
+def init_report_scheduler(app):
+    """İlk istekte arka plan yenilemesini başlat (CLI komutlarında thread açılmasın)"""
+    app.config.setdefault('REPORT_SCHEDULER_ENABLED', REPORT_SCHEDULER_ENABLED)
+
+    @app.before_request
+    def _start_report_scheduler():
+        if app.config['REPORT_SCHEDULER_ENABLED']:
+            report_scheduler.start()
+
+
+def apply_cache_policy(blueprint, policy):
+    """Blueprint'in GET yanıtlarına Cache-Control ekle (view kendisi set etmediyse)"""
+    @blueprint.after_request
+    def _set_cache_control(response):
+        if (request.method in ('GET', 'HEAD') and response.status_code in (200, 304)
+                and 'Cache-Control' not in response.headers):
+            response.headers['Cache-Control'] = policy
+        return response
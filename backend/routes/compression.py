@@ -0,0 +1,104 @@
+# Response Compression
+# API yanıtları istemcinin Accept-Encoding'ine göre brotli (kuruluysa) veya gzip ile sıkıştırılır.
+#   - COMPRESS_MIN_SIZE'dan küçük gövdeler sıkıştırılmaz (header maliyeti kazançtan büyük)
+#   - Streaming (NDJSON) yanıtlar parça parça sıkıştırılır; her parça flush edilir ki
+#     istemci satırları beklemeden alsın
+#   - text/event-stream (SSE), resimler ve send_file yanıtları sıkıştırılmaz
+# Sıkıştırılan yanıtın ETag'i weak olur (W/"..."): aynı kaynağın farklı encoding'leri
+# byte olarak farklıdır; If-None-Match karşılaştırması zaten weak yapılır.
+import gzip
+import zlib
+
+from flask import request
+from config import COMPRESS_MIN_SIZE, COMPRESS_GZIP_LEVEL, COMPRESS_BROTLI_QUALITY, COMPRESS_MIMETYPES
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def available_encodings():
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def negotiate_encoding(encodings=None):
+    """İstemcinin kabul ettiği en iyi encoding (yoksa None)"""
+    if encodings is None:
+        encodings = available_encodings()
+    accepted = request.accept_encodings
+    best = None
+    best_quality = 0
+    for encoding in encodings:
+        quality = accepted[encoding]   # '*' dahil; listede yoksa 0
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(data, encoding, level=None):
+    if encoding == 'br':
+        return brotli.compress(data, quality=COMPRESS_BROTLI_QUALITY if level is None else level)
+    return gzip.compress(data, COMPRESS_GZIP_LEVEL if level is None else level, mtime=0)
+
+
+def _compress_stream(chunks, encoding):
+    """Streaming gövdeyi parça parça sıkıştır"""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=COMPRESS_BROTLI_QUALITY)
+        process, flush = compressor.process, compressor.flush
+        finish = compressor.finish
+    else:
+        compressor = zlib.compressobj(COMPRESS_GZIP_LEVEL, zlib.DEFLATED, 31)   # 31: gzip header
+        process = compressor.compress
+        flush = lambda: compressor.flush(zlib.Z_SYNC_FLUSH)
+        finish = compressor.flush
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            data = process(chunk) + flush()
+            if data:
+                yield data
+        yield finish()
+    finally:
+        # stream_with_context generator'ı kapanmalı: bağlantı havuza dönsün
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+
+
+def _compressible(response):
+    if request.method == 'HEAD' or response.status_code < 200 or response.status_code in (204, 304):
+        return False
+    if response.direct_passthrough or 'Content-Encoding' in response.headers:
+        return False
+    return response.mimetype in COMPRESS_MIMETYPES
+
+
+def _compress_response(response):
+    if not _compressible(response):
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = negotiate_encoding()
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = _compress_stream(response.response, encoding)
+        response.headers.pop('Content-Length', None)
+    else:
+        body = response.get_data()
+        if len(body) < COMPRESS_MIN_SIZE:
+            return response
+        response.set_data(compress(body, encoding))
+
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_compression(app):
+    app.after_request(_compress_response)
@@ -1,24 +1,56 @@
 # Customer Routes
+import mysql.connector
 from flask import Blueprint, jsonify, request
-from models.database import execute_query, execute_insert_update
+from config import BULK_DELETE_CHUNK_SIZE, BULK_DELETE_MAX_IDS, CUSTOMER_SEARCH_MAX_LIMIT
+from models import rollups
+from models.customer_search import CustomerSearchError, customer_search_index
+from models.database import execute_query, transaction
+from routes.pagination import Page, PaginationError, parse_bool_arg, parse_int_arg
+from routes.streaming import rows_json
 
 customers_bp = Blueprint('customers', __name__, url_prefix='/api/customers')
 
 @customers_bp.route('', methods=['GET'])
 def get_customers():
-    """Get customers, VIPs first"""
+    """
+    Get customers, VIPs first (then by LTV).
+    Filters: vip (true/false), min_ltv, customer_id
+    Paging: limit, cursor (next page token in X-Next-Cursor header); ?stream=1 for NDJSON
+    """
+    # Kolonlar NOT NULL (migration 001); c. öneki SELECT alias'ı yerine kolonu seçer
+    # ve idx_customers_vip_ltv sıralama için kullanılabilir
+    page = Page.from_request([
+        ('c.vip_status', 'vip_status', False),
+        ('c.total_ltv', 'total_ltv', False),
+        ('c.customer_id', 'customer_id', False),
+    ])
     query = """
     SELECT customer_id, full_name, 
            COALESCE(phone, '') as phone, 
            COALESCE(email, '') as email, 
            COALESCE(total_ltv, 0) as total_ltv, 
-           COALESCE(vip_status, FALSE) as vip_status
-    FROM CUSTOMERS
-    ORDER BY vip_status DESC, total_ltv DESC
+           COALESCE(vip_status, FALSE) as vip_status,
+           visit_count, last_visit
+    FROM CUSTOMERS c
     """
-    data = execute_query(query)
-    # Return empty array if no data (not an error)
-    return jsonify(data if data is not None else [])
+    where, params = [], []
+    vip = parse_bool_arg('vip')
+    if vip is not None:
+        where.append("c.vip_status = %s")
+        params.append(vip)
+    min_ltv = request.args.get('min_ltv')
+    if min_ltv:
+        try:
+            params.append(float(min_ltv))
+        except ValueError:
+            raise PaginationError("'min_ltv' must be a number")
+        where.append("c.total_ltv >= %s")
+    customer_id = parse_int_arg('customer_id')
+    if customer_id is not None:
+        where.append("c.customer_id = %s")
+        params.append(customer_id)
+
+    return page.fetch(query, where, params)
 
 # CREATE - Yeni müşteri ekle
 @customers_bp.route('', methods=['POST'])
@@ -37,68 +69,127 @@ def create_customer():
         data.get('full_name'),
         data.get('phone'),
         data.get('email'),
-        data.get('vip_status', False)
+        bool(data.get('vip_status') or False)
     )
     
-    result = execute_insert_update(query, params)
-    if result:
-        return jsonify({"message": "Müşteri başarıyla eklendi", "success": True}), 201
-    else:
+    try:
+        # lastrowid için transaction cursor'ı (arama index'i id ile güncellenir)
+        with transaction() as cursor:
+            cursor.execute(query, params)
+            customer_id = cursor.lastrowid
+    except mysql.connector.Error as e:
+        print(f"Insert error: {e}")
         return jsonify({"error": "Müşteri eklenemedi"}), 500
 
+    customer_search_index.customer_added({
+        "customer_id": customer_id, "full_name": params[0], "phone": params[1],
+        "email": params[2], "vip_status": params[3], "total_ltv": 0,
+    })
+    return jsonify({"message": "Müşteri başarıyla eklendi", "success": True,
+                    "customer_id": customer_id}), 201
+
+# SEARCH - İsim, telefon veya e-posta ile müşteri bul
+@customers_bp.route('/search', methods=['GET'])
+def search_customers():
+    """
+    Müşteri ara: ?q=ayse yil, ?q=0532 123, ?q=mehmt (yazım hatası toleranslı)
+    Bellekteki index'ten döner (models/customer_search.py); limit varsayılan 20.
+    """
+    q = (request.args.get('q') or '').strip()
+    if not q:
+        return jsonify({"error": "q parametresi zorunludur"}), 400
+    limit = parse_int_arg('limit') or 20
+    if not 1 <= limit <= CUSTOMER_SEARCH_MAX_LIMIT:
+        raise PaginationError(f"'limit' must be between 1 and {CUSTOMER_SEARCH_MAX_LIMIT}")
+
+    try:
+        results = customer_search_index.search(q, limit)
+    except CustomerSearchError as e:
+        print(f"Customer search error: {e}")
+        return jsonify({"error": "Müşteri araması geçici olarak kullanılamıyor"}), 503
+    return jsonify(results)
+
+def delete_customers(customer_ids):
+    """
+    Müşterileri ve tüm geçmişlerini tek transaction içinde sil; silinen id'leri döndür.
+    DIETARYRESTRICTIONS, RESERVATIONS -> DININGSESSIONS -> ORDERS/FEEDBACK -> ORDERDETAILS
+    şemadaki ON DELETE CASCADE ile silinir. Hata olursa hiçbir şey silinmez.
+    """
+    customer_ids = list(dict.fromkeys(customer_ids))
+    if not customer_ids:
+        return []
+    placeholders = ", ".join(["%s"] * len(customer_ids))
+    with transaction() as cursor:
+        # FOR UPDATE: silme bitene kadar bu müşterilere yeni rezervasyon eklenemez
+        cursor.execute(
+            f"SELECT customer_id FROM CUSTOMERS WHERE customer_id IN ({placeholders}) FOR UPDATE",
+            customer_ids
+        )
+        existing = [row['customer_id'] for row in cursor.fetchall()]
+        if not existing:
+            return []
+
+        # Rapor özetlerinden cascade ile silinecek kayıtların katkısını düş
+        rollups.forget_customers(cursor, existing)
+
+        placeholders = ", ".join(["%s"] * len(existing))
+        cursor.execute(f"DELETE FROM CUSTOMERS WHERE customer_id IN ({placeholders})", existing)
+    customer_search_index.customers_removed(existing)
+    return existing
+
 # DELETE - Müşteri sil
 @customers_bp.route('/<int:customer_id>', methods=['DELETE'])
 def delete_customer(customer_id):
-    """Müşteri sil (DELETE)"""
+    """Müşteri sil (DELETE) - ilişkili tüm kayıtlarla birlikte, atomik"""
     try:
-        # Önce müşterinin var olduğunu kontrol et
-        check_query = "SELECT customer_id FROM CUSTOMERS WHERE customer_id = %s"
-        exists = execute_query(check_query, (customer_id,))
-        
-        if not exists:
-            return jsonify({"error": "Müşteri bulunamadı"}), 404
-        
-        # 1. Önce diyet kısıtlamalarını sil
-        delete_dietary = "DELETE FROM DIETARYRESTRICTIONS WHERE customer_id = %s"
-        execute_insert_update(delete_dietary, (customer_id,))
-        
-        # 2. Müşterinin rezervasyonlarına bağlı dining sessions'ları bul
-        find_sessions = """
-            SELECT ds.session_id FROM DININGSESSIONS ds
-            JOIN RESERVATIONS r ON ds.reservation_id = r.reservation_id
-            WHERE r.customer_id = %s
-        """
-        sessions = execute_query(find_sessions, (customer_id,))
-        
-        if sessions:
-            session_ids = [s['session_id'] for s in sessions]
-            for sid in session_ids:
-                # Feedback sil
-                execute_insert_update("DELETE FROM FEEDBACK WHERE session_id = %s", (sid,))
-                # Orders ve OrderDetails
-                orders = execute_query("SELECT order_id FROM ORDERS WHERE session_id = %s", (sid,))
-                if orders:
-                    for o in orders:
-                        execute_insert_update("DELETE FROM ORDERDETAILS WHERE order_id = %s", (o['order_id'],))
-                    execute_insert_update("DELETE FROM ORDERS WHERE session_id = %s", (sid,))
-                # Session sil
-                execute_insert_update("DELETE FROM DININGSESSIONS WHERE session_id = %s", (sid,))
-        
-        # 3. Rezervasyonları sil
-        delete_reservations = "DELETE FROM RESERVATIONS WHERE customer_id = %s"
-        execute_insert_update(delete_reservations, (customer_id,))
-        
-        # 4. Son olarak müşteriyi sil
-        delete_query = "DELETE FROM CUSTOMERS WHERE customer_id = %s"
-        result = execute_insert_update(delete_query, (customer_id,))
-        
-        if result:
-            return jsonify({"message": "Müşteri başarıyla silindi", "success": True}), 200
-        else:
-            return jsonify({"error": "Müşteri silinemedi"}), 500
-    except Exception as e:
+        deleted = delete_customers([customer_id])
+    except mysql.connector.Error as e:
         print(f"Delete error: {e}")
-        return jsonify({"error": str(e)}), 500
+        return jsonify({"error": "Müşteri silinemedi"}), 500
+
+    if not deleted:
+        return jsonify({"error": "Müşteri bulunamadı"}), 404
+    return jsonify({"message": "Müşteri başarıyla silindi", "success": True}), 200
+
+# BULK DELETE - GDPR silme partileri
+@customers_bp.route('/bulk-delete', methods=['POST'])
+def bulk_delete_customers():
+    """
+    Birden fazla müşteriyi sil. Body: {"customer_ids": [1, 2, ...]}
+    Kilit süresini sınırlamak için BULK_DELETE_CHUNK_SIZE'lık parçalar halinde,
+    her parça kendi transaction'ında silinir.
+    """
+    data = request.get_json()
+    ids = data.get('customer_ids') if data else None
+    if not isinstance(ids, list) or not ids:
+        return jsonify({"error": "customer_ids listesi zorunludur"}), 400
+    if len(ids) > BULK_DELETE_MAX_IDS:
+        return jsonify({"error": f"En fazla {BULK_DELETE_MAX_IDS} müşteri silinebilir"}), 400
+    try:
+        ids = [int(i) for i in ids]
+    except (TypeError, ValueError):
+        return jsonify({"error": "customer_ids tamsayı olmalıdır"}), 400
+
+    deleted = []
+    for start in range(0, len(ids), BULK_DELETE_CHUNK_SIZE):
+        chunk = ids[start:start + BULK_DELETE_CHUNK_SIZE]
+        try:
+            deleted.extend(delete_customers(chunk))
+        except mysql.connector.Error as e:
+            print(f"Bulk delete error: {e}")
+            # Önceki parçalar commit edildi; istemci kalanları tekrar gönderebilir
+            return jsonify({
+                "error": "Toplu silme yarıda kaldı",
+                "deleted": deleted,
+                "failed": ids[start:],
+            }), 500
+
+    deleted_set = set(deleted)
+    return jsonify({
+        "deleted": deleted,
+        "not_found": [i for i in dict.fromkeys(ids) if i not in deleted_set],
+        "success": True,
+    }), 200
 
 @customers_bp.route('/vip', methods=['GET'])
 def get_vip_customers():
@@ -112,9 +203,9 @@ def get_vip_customers():
     WHERE vip_status = TRUE
     ORDER BY total_ltv DESC
     """
-    data = execute_query(query)
+    data = execute_query(query, cached=True)
     # Return empty array if no VIP customers (not an error)
-    return jsonify(data if data is not None else [])
+    return rows_json(data)
 
 @customers_bp.route('/dietary/<int:customer_id>', methods=['GET'])
 def get_customer_dietary_restrictions(customer_id):
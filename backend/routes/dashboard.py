@@ -0,0 +1,118 @@
+# Dashboard Route
+# Frontend'in açılışta yaptığı ayrı ayrı istekler yerine tek istek:
+#   GET /api/dashboard?widgets=customers,orders,rating_summary,daily_revenue
+# Her widget mevcut bir endpoint'in view fonksiyonudur; widget'lar sınırlı bir thread
+# havuzunda paralel çalışır (her biri havuzdan kendi bağlantısını alır). Toplam süre
+# yaklaşık olarak en yavaş widget kadardır.
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import urlencode
+
+from flask import Blueprint, current_app, g, jsonify, request
+from config import DASHBOARD_MAX_WORKERS, DASHBOARD_TIMEOUT
+from models.database import read_from_primary, reads_from_primary
+
+dashboard_bp = Blueprint('dashboard', __name__, url_prefix='/api/dashboard')
+
+# Widget adı -> (endpoint, query parametreleri)
+WIDGETS = {
+    'menu': ('menu.get_menu', {}),
+    'categories': ('menu.get_categories', {}),
+    'customers': ('customers.get_customers', {}),
+    'vip_customers': ('customers.get_vip_customers', {}),
+    'reservations': ('reservations.get_reservations', {}),
+    'pending_reservations': ('reservations.get_pending_reservations', {}),
+    'confirmed_reservations': ('reservations.get_confirmed_reservations', {}),
+    'orders': ('orders.get_orders', {}),
+    'feedback': ('feedback.get_feedback', {}),
+    'rating_summary': ('feedback.get_rating_summary', {}),
+    'top_customer_orders': ('reports.get_top_customer_orders', {}),
+    'customer_spending': ('reports.get_customer_spending', {}),
+    'customer_classification': ('reports.classify_customers', {}),
+    'table_performance': ('reports.get_table_performance', {}),
+    'customer_first_last_visit': ('reports.get_customer_first_last_visit', {}),
+    'top_menu_items': ('reports.get_top_menu_items', {}),
+    'staff_performance': ('reports.get_staff_performance', {}),
+    'daily_revenue': ('reports.get_daily_revenue', {}),
+    'reservation_status_analysis': ('reports.get_reservation_status_analysis', {}),
+    'peak_day_sessions': ('reports.get_peak_day_sessions', {}),
+}
+
+# Havuz boyutunu (DB_POOL_SIZE) aşmayacak şekilde sınırlı; process genelinde paylaşılır
+_executor = ThreadPoolExecutor(max_workers=DASHBOARD_MAX_WORKERS, thread_name_prefix='dashboard')
+
+
+def _run_widget(app, name, primary=False):
+    """
+    Widget'ın view fonksiyonunu kendi request context'inde çalıştır.
+    primary: dashboard isteği read-your-writes modundaysa widget'lar da primary'den okur
+    """
+    with read_from_primary(primary):
+        return _render_widget(app, name)
+
+
+def _render_widget(app, name):
+    endpoint, args = WIDGETS[name]
+    with app.test_request_context():
+        path = app.url_for(endpoint)
+    started = time.perf_counter()
+    # JSON iste: liste endpoint'leri NDJSON stream'e geçmesin
+    with app.test_request_context(path, query_string=urlencode(args),
+                                  headers={'Accept': 'application/json'}):
+        try:
+            response = app.make_response(app.view_functions[endpoint]())
+        except Exception as e:
+            # Widget hatası diğer widget'ları etkilemesin; errorhandler'lar (ör. 400) uygulanır
+            response = app.make_response(app.handle_user_exception(e))
+        statements = g.get('sql_statements', [])
+    return {
+        "status": response.status_code,
+        "data": response.get_json(silent=True),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        "statements": statements,
+    }
+
+
+@dashboard_bp.route('', methods=['GET'])
+def get_dashboard():
+    """
+    İstenen widget'ları paralel çalıştır ve tek payload döndür.
+    ?widgets=a,b,c (zorunlu). Hatalı/zaman aşımına uğrayan widget'lar "errors" altında döner.
+    """
+    names = [w.strip() for w in request.args.get('widgets', '').split(',') if w.strip()]
+    names = list(dict.fromkeys(names))
+    if not names:
+        return jsonify({"error": "widgets parametresi zorunludur", "available": sorted(WIDGETS)}), 400
+    unknown = [n for n in names if n not in WIDGETS]
+    if unknown:
+        return jsonify({"error": f"Bilinmeyen widget: {', '.join(unknown)}", "available": sorted(WIDGETS)}), 400
+
+    app = current_app._get_current_object()
+    primary = reads_from_primary()
+    futures = {name: _executor.submit(_run_widget, app, name, primary) for name in names}
+    wait(futures.values(), timeout=DASHBOARD_TIMEOUT)
+
+    widgets, errors, timings = {}, {}, {}
+    for name, future in futures.items():
+        if not future.done():
+            future.cancel()
+            errors[name] = {"status": 504, "error": "Zaman aşımı"}
+            continue
+        try:
+            result = future.result()
+        except Exception as e:
+            print(f"Dashboard widget error ({name}): {e}")
+            errors[name] = {"status": 500, "error": "Sunucu hatası"}
+            continue
+        # Widget sorguları bu isteğin SQL sayısına (X-Query-Count, /metrics) eklenir
+        if 'sql_statements' in g:
+            g.sql_statements.extend(result["statements"])
+        timings[name] = result["elapsed_ms"]
+        if result["status"] == 200:
+            widgets[name] = result["data"]
+        else:
+            data = result["data"]
+            errors[name] = {"status": result["status"],
+                            "error": data.get("error") if isinstance(data, dict) else None}
+
+    return jsonify({"widgets": widgets, "errors": errors, "timings_ms": timings})
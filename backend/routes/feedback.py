@@ -1,12 +1,28 @@
 # Feedback Routes
+import re
+from datetime import date, timedelta
+
+import mysql.connector
 from flask import Blueprint, jsonify, request
-from models.database import execute_query, execute_insert_update
+from config import FEEDBACK_SEARCH_MAX_LIMIT
+from models import rollups
+from models.database import execute_query, transaction
+from routes.pagination import Page, PaginationError, parse_datetime_arg, parse_int_arg
+from routes.stream import publish
 
 feedback_bp = Blueprint('feedback', __name__, url_prefix='/api/feedback')
 
 @feedback_bp.route('', methods=['GET'])
 def get_feedback():
-    """Get all feedback with customer info"""
+    """
+    Get feedback with customer info, newest session first.
+    Filters: from, to (half-open, on session start), rating, customer_id, session_id
+    Paging: limit, cursor (next page token in X-Next-Cursor header); ?stream=1 for NDJSON
+    """
+    page = Page.from_request([
+        ('ds.start_time', 'start_time', True),
+        ('f.feedback_id', 'feedback_id', False),
+    ])
     query = """
     SELECT f.feedback_id, 
            COALESCE(c.full_name, 'Anonymous') as full_name, 
@@ -14,27 +30,84 @@ def get_feedback():
            COALESCE(f.comment, '') as comment, 
            ds.start_time
     FROM FEEDBACK f
-    LEFT JOIN DININGSESSIONS ds ON f.session_id = ds.session_id
+    JOIN DININGSESSIONS ds ON f.session_id = ds.session_id
     LEFT JOIN RESERVATIONS r ON ds.reservation_id = r.reservation_id
     LEFT JOIN CUSTOMERS c ON r.customer_id = c.customer_id
-    ORDER BY ds.start_time DESC
     """
-    data = execute_query(query)
-    return jsonify(data if data is not None else [])
+    # Feedback her zaman bir session'a bağlı (POST session'ı doğrular, FK cascade siler).
+    # INNER JOIN sayesinde optimizer idx_sessions_start_time üzerinden sıralı okuyabiliyor.
+    where, params = [], []
+    date_from = parse_datetime_arg('from')
+    if date_from:
+        where.append("ds.start_time >= %s")
+        params.append(date_from)
+    date_to = parse_datetime_arg('to')
+    if date_to:
+        where.append("ds.start_time < %s")
+        params.append(date_to)
+    for arg, column in (('rating', 'f.rating'),
+                        ('customer_id', 'r.customer_id'),
+                        ('session_id', 'f.session_id')):
+        value = parse_int_arg(arg)
+        if value is not None:
+            where.append(f"{column} = %s")
+            params.append(value)
+
+    return page.fetch(query, where, params)
+
+# Puan özetleri ROLLUP_FEEDBACK_RATINGS'ten okunur (models/rollups.py); FEEDBACK taranmaz.
+# Pencere başlangıcı: gün, haftanın pazartesisi, ayın ilk günü
+WINDOWS = {
+    'day': ("rf.day", timedelta(days=30)),
+    'week': ("rf.day - INTERVAL WEEKDAY(rf.day) DAY", timedelta(weeks=12)),
+    'month': ("rf.day - INTERVAL (DAYOFMONTH(rf.day) - 1) DAY", timedelta(days=365)),
+}
+DIMENSIONS = {'all': None, 'table': 'table_id', 'staff': 'staff_id'}
+
+_RATING_COLUMNS = """
+       COALESCE(SUM(rf.feedback_count), 0) as {count},
+       COALESCE(SUM(rf.rating_sum) / NULLIF(SUM(rf.feedback_count), 0), 0) as avg_rating,
+       COALESCE(SUM(rf.five_star), 0) as five_star,
+       COALESCE(SUM(rf.four_star), 0) as four_star,
+       COALESCE(SUM(rf.three_star), 0) as three_star,
+       COALESCE(SUM(rf.one_star + rf.two_star), 0) as low_rating
+"""
+
+def _day_range(where, params):
+    """from/to (yarı açık) gün filtresi; rollup'lar gün bazındadır"""
+    date_from = parse_datetime_arg('from')
+    if date_from:
+        where.append("rf.day >= %s")
+        params.append(date_from.date())
+    date_to = parse_datetime_arg('to')
+    if date_to:
+        where.append("rf.day < %s")
+        params.append(date_to.date())
 
 @feedback_bp.route('/rating-summary', methods=['GET'])
 def get_rating_summary():
-    """Get average rating and statistics"""
-    query = """
-    SELECT COALESCE(COUNT(*), 0) as total_feedback,
-           COALESCE(AVG(rating), 0) as avg_rating,
-           COALESCE(COUNT(CASE WHEN rating = 5 THEN 1 END), 0) as five_star,
-           COALESCE(COUNT(CASE WHEN rating = 4 THEN 1 END), 0) as four_star,
-           COALESCE(COUNT(CASE WHEN rating = 3 THEN 1 END), 0) as three_star,
-           COALESCE(COUNT(CASE WHEN rating <= 2 THEN 1 END), 0) as low_rating
-    FROM FEEDBACK
     """
-    data = execute_query(query)
+    Get average rating and statistics (all time by default).
+    Filters: from, to (session day, half-open), table_id or staff_id
+    """
+    table_id = parse_int_arg('table_id')
+    staff_id = parse_int_arg('staff_id')
+    if table_id is not None and staff_id is not None:
+        raise PaginationError("Use either 'table_id' or 'staff_id'")
+    if table_id is not None:
+        where, params = ["rf.dimension = 'table'", "rf.dimension_id = %s"], [table_id]
+    elif staff_id is not None:
+        where, params = ["rf.dimension = 'staff'", "rf.dimension_id = %s"], [staff_id]
+    else:
+        where, params = ["rf.dimension = 'all'"], []
+    _day_range(where, params)
+
+    query = f"""
+    SELECT {_RATING_COLUMNS.format(count='total_feedback')}
+    FROM ROLLUP_FEEDBACK_RATINGS rf
+    WHERE {" AND ".join(where)}
+    """
+    data = execute_query(query, params or None, cached=True)
     if data and len(data) > 0:
         return jsonify(data[0])
     else:
@@ -48,6 +121,113 @@ def get_rating_summary():
             "low_rating": 0
         })
 
+@feedback_bp.route('/ratings', methods=['GET'])
+def get_ratings():
+    """
+    Rating distribution per time window, optionally per table or staff member.
+    Params: window (day/week/month), by (all/table/staff), id (one table/staff),
+            from, to (session day, half-open; default: last 30 days / 12 weeks / 12 months)
+    """
+    window = request.args.get('window', 'day')
+    by = request.args.get('by', 'all')
+    if window not in WINDOWS:
+        raise PaginationError(f"'window' must be one of: {', '.join(WINDOWS)}")
+    if by not in DIMENSIONS:
+        raise PaginationError(f"'by' must be one of: {', '.join(DIMENSIONS)}")
+    period, default_span = WINDOWS[window]
+    id_column = DIMENSIONS[by]
+
+    date_to = parse_datetime_arg('to')
+    date_to = date_to.date() if date_to else date.today() + timedelta(days=1)
+    date_from = parse_datetime_arg('from')
+    date_from = date_from.date() if date_from else date_to - default_span
+
+    where, params = ["rf.dimension = %s", "rf.day >= %s", "rf.day < %s"], [by, date_from, date_to]
+    dimension_id = parse_int_arg('id')
+    if dimension_id is not None:
+        if id_column is None:
+            raise PaginationError("'id' requires by=table or by=staff")
+        where.append("rf.dimension_id = %s")
+        params.append(dimension_id)
+
+    group = "period, rf.dimension_id" if id_column else "period"
+    id_select = f"rf.dimension_id as {id_column}," if id_column else ""
+    # PRIMARY KEY (dimension, dimension_id, day) üzerinden aralık okuması
+    query = f"""
+    SELECT {period} as period, {id_select}
+           {_RATING_COLUMNS.format(count='feedback_count')}
+    FROM ROLLUP_FEEDBACK_RATINGS rf
+    WHERE {" AND ".join(where)}
+    GROUP BY {group}
+    HAVING feedback_count > 0
+    ORDER BY {group}
+    """
+    data = execute_query(query, params)
+    if data is None:
+        return jsonify({"error": "Failed to load ratings"}), 500
+    return jsonify(data)
+
+# FULLTEXT arama terimleri: boolean mode operatörleri kullanıcıdan alınmaz
+_SEARCH_WORD_RE = re.compile(r'\w+', re.UNICODE)
+_MIN_SEARCH_WORD = 3   # innodb_ft_min_token_size varsayılanı; daha kısa kelimeler index'te yok
+
+@feedback_bp.route('/search', methods=['GET'])
+def search_feedback():
+    """
+    Keyword search over comments (FULLTEXT ft_feedback_comment), best match first.
+    Every word must appear; words match as prefixes ('slow' -> 'slowly').
+    Filters: max_rating (e.g. 2 for complaints), from, to (session start), table_id, staff_id
+    """
+    words = [w for w in _SEARCH_WORD_RE.findall(request.args.get('q', ''))
+             if len(w) >= _MIN_SEARCH_WORD]
+    if not words:
+        return jsonify({"error": f"q must contain a word of at least {_MIN_SEARCH_WORD} letters"}), 400
+    terms = " ".join(f"+{w}*" for w in words)
+    limit = parse_int_arg('limit') or 50
+    if not 1 <= limit <= FEEDBACK_SEARCH_MAX_LIMIT:
+        raise PaginationError(f"'limit' must be between 1 and {FEEDBACK_SEARCH_MAX_LIMIT}")
+
+    where, params = ["MATCH(f.comment) AGAINST (%s IN BOOLEAN MODE)"], [terms]
+    max_rating = parse_int_arg('max_rating')
+    if max_rating is not None:
+        where.append("f.rating <= %s")
+        params.append(max_rating)
+    date_from = parse_datetime_arg('from')
+    if date_from:
+        where.append("ds.start_time >= %s")
+        params.append(date_from)
+    date_to = parse_datetime_arg('to')
+    if date_to:
+        where.append("ds.start_time < %s")
+        params.append(date_to)
+    table_id = parse_int_arg('table_id')
+    if table_id is not None:
+        where.append("r.table_id = %s")
+        params.append(table_id)
+    staff_id = parse_int_arg('staff_id')
+    if staff_id is not None:
+        where.append("EXISTS (SELECT 1 FROM ORDERS o WHERE o.session_id = f.session_id AND o.staff_id = %s)")
+        params.append(staff_id)
+
+    query = f"""
+    SELECT f.feedback_id, f.session_id,
+           COALESCE(c.full_name, 'Anonymous') as full_name,
+           COALESCE(f.rating, 0) as rating,
+           f.comment, ds.start_time, r.table_id,
+           MATCH(f.comment) AGAINST (%s IN BOOLEAN MODE) as relevance
+    FROM FEEDBACK f
+    JOIN DININGSESSIONS ds ON f.session_id = ds.session_id
+    LEFT JOIN RESERVATIONS r ON ds.reservation_id = r.reservation_id
+    LEFT JOIN CUSTOMERS c ON r.customer_id = c.customer_id
+    WHERE {" AND ".join(where)}
+    ORDER BY relevance DESC, f.feedback_id DESC
+    LIMIT %s
+    """
+    data = execute_query(query, (terms, *params, limit))
+    if data is None:
+        return jsonify({"error": "Search failed"}), 500
+    return jsonify(data)
+
 @feedback_bp.route('', methods=['POST'])
 def create_feedback():
     """Create new feedback"""
@@ -80,13 +260,20 @@ def create_feedback():
     INSERT INTO FEEDBACK (session_id, rating, comment)
     VALUES (%s, %s, %s)
     """
-    success = execute_insert_update(query, (
-        data['session_id'],
-        rating,
-        data.get('comment', '')
-    ))
-    
-    if success:
-        return jsonify({"message": "Feedback saved successfully"}), 201
-    else:
+    try:
+        with transaction() as cursor:
+            cursor.execute(query, (
+                data['session_id'],
+                rating,
+                data.get('comment', '')
+            ))
+            feedback_id = cursor.lastrowid
+            rollups.on_feedback_created(cursor, feedback_id)
+    except mysql.connector.Error:
         return jsonify({"error": "Failed to save feedback"}), 500
+
+    publish('feedback', 'feedback.created', {
+        "feedback_id": feedback_id, "session_id": data['session_id'], "rating": rating,
+        "comment": data.get('comment', ''),
+    })
+    return jsonify({"message": "Feedback saved successfully", "feedback_id": feedback_id}), 201
@@ -0,0 +1,176 @@
+# Image Variants
+# frontend/images altındaki orijinal fotoğraflardan boyutlandırılmış WebP varyantlar:
+#   GET /api/images                          -> {"images/menu/Baklava.jpg": {variants, srcset}, ...}
+#   GET /img/<variant>/<digest>/<path>       -> WebP varyant (1 yıl immutable cache)
+# digest orijinal dosyanın içerik hash'idir; dosya değişince URL de değişir, eski digest'li
+# istekler güncel URL'e yönlendirilir. Varyantlar ilk istekte sınırlı bir thread havuzunda
+# (IMAGE_WORKERS) üretilir ve IMAGE_CACHE_DIR altında <digest>-<variant>.webp olarak saklanır;
+# sonraki istekler diskten okunur. Orijinal zaten küçükse ve WebP'ye çevirmek dosyayı
+# büyütüyorsa orijinal dosya kullanılır. Pillow kurulu değilse orijinal dosyaya yönlendirilir.
+import hashlib
+import mimetypes
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from flask import Blueprint, abort, jsonify, make_response, redirect, request, send_file, url_for
+from werkzeug.security import safe_join
+from config import (FRONTEND_DIR, IMAGE_VARIANTS, IMAGE_WEBP_QUALITY, IMAGE_CACHE_DIR,
+                    IMAGE_WORKERS, IMAGE_TIMEOUT, STATIC_MAX_AGE)
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+
+images_bp = Blueprint('images', __name__)
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
+
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMAGE_ROOT = os.path.normpath(os.path.join(_BACKEND_DIR, FRONTEND_DIR, 'images'))
+CACHE_ROOT = os.path.normpath(os.path.join(_BACKEND_DIR, IMAGE_CACHE_DIR))
+
+_sources = {}      # dosya yolu -> (mtime_ns, size, digest, genişlik)
+_inflight = {}     # (digest, varyant) -> Future (aynı varyant iki kez üretilmesin)
+_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=IMAGE_WORKERS, thread_name_prefix='image-variant')
+
+
+def source_info(path):
+    """(içerik hash'i, genişlik) - mtime/boyut değişmedikçe dosya tekrar okunmaz"""
+    stat = os.stat(path)
+    with _lock:
+        cached = _sources.get(path)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2], cached[3]
+    with open(path, 'rb') as f:
+        digest = hashlib.blake2b(f.read(), digest_size=8).hexdigest()
+    width = None
+    if Image is not None:
+        try:
+            with Image.open(path) as img:   # sadece header okunur
+                width = img.width
+        except OSError:
+            pass
+    with _lock:
+        _sources[path] = (stat.st_mtime_ns, stat.st_size, digest, width)
+    return digest, width
+
+
+def _cache_path(digest, variant, ext):
+    return os.path.join(CACHE_ROOT, f"{digest}-{variant}{ext}")
+
+
+def _render(source, digest, variant):
+    """Orijinali varyant genişliğine küçült (büyütme yok) ve WebP olarak atomik yaz"""
+    width = IMAGE_VARIANTS[variant]
+    target = _cache_path(digest, variant, '.webp')
+    tmp = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+    os.makedirs(CACHE_ROOT, exist_ok=True)
+    with Image.open(source) as img:
+        resized = img.width > width
+        img = ImageOps.exif_transpose(img)
+        if img.mode not in ('RGB', 'RGBA'):
+            img = img.convert('RGBA' if 'transparency' in img.info else 'RGB')
+        img.thumbnail((width, width * 10), Image.LANCZOS)
+        img.save(tmp, 'WEBP', quality=IMAGE_WEBP_QUALITY, method=4)
+
+    if not resized and os.path.getsize(tmp) >= os.path.getsize(source):
+        # Yeniden kodlamak küçültmedi: orijinal dosya (kendi formatında) kullanılır
+        os.remove(tmp)
+        target = _cache_path(digest, variant, os.path.splitext(source)[1].lower())
+        tmp = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+        shutil.copyfile(source, tmp)
+    os.replace(tmp, target)
+    return target
+
+
+def _variant_file(source, digest, variant):
+    """Varyantın cache dosyası; yoksa havuzda üret ve bekle"""
+    for ext in ('.webp', os.path.splitext(source)[1].lower()):
+        path = _cache_path(digest, variant, ext)
+        if os.path.exists(path):
+            return path
+    key = (digest, variant)
+    with _lock:
+        future = _inflight.get(key)
+        if future is None:
+            future = _executor.submit(_render, source, digest, variant)
+            _inflight[key] = future
+            future.add_done_callback(lambda _: _inflight.pop(key, None))
+    return future.result(timeout=IMAGE_TIMEOUT)
+
+
+def variant_urls(filename, digest):
+    return {
+        variant: url_for('images.get_variant', variant=variant, digest=digest,
+                         filename=filename, _external=True)
+        for variant in IMAGE_VARIANTS
+    }
+
+
+def srcset(urls, width):
+    """Gerçek genişliklerle srcset; orijinalden geniş varyantlar tek adayda birleşir"""
+    candidates = {}
+    for variant, max_width in sorted(IMAGE_VARIANTS.items(), key=lambda v: v[1]):
+        effective = min(max_width, width) if width else max_width
+        candidates.setdefault(effective, urls[variant])
+    return ", ".join(f"{url} {w}w" for w, url in candidates.items())
+
+
+@images_bp.route('/api/images', methods=['GET'])
+def get_image_manifest():
+    """Frontend'in kullandığı yol -> varyant URL'leri ve srcset"""
+    manifest = {}
+    if os.path.isdir(IMAGE_ROOT):
+        for directory, _, files in os.walk(IMAGE_ROOT):
+            for name in sorted(files):
+                if not name.lower().endswith(IMAGE_EXTENSIONS):
+                    continue
+                path = os.path.join(directory, name)
+                filename = os.path.relpath(path, IMAGE_ROOT).replace(os.sep, '/')
+                digest, width = source_info(path)
+                urls = variant_urls(filename, digest)
+                manifest[f"images/{filename}"] = {
+                    "width": width,
+                    "variants": urls,
+                    "srcset": srcset(urls, width),
+                }
+
+    response = make_response(jsonify(manifest))
+    response.set_etag(hashlib.blake2b(response.get_data(), digest_size=12).hexdigest())
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+
+@images_bp.route('/img/<variant>/<digest>/<path:filename>', methods=['GET'])
+def get_variant(variant, digest, filename):
+    if variant not in IMAGE_VARIANTS or not filename.lower().endswith(IMAGE_EXTENSIONS):
+        abort(404)
+    source = safe_join(IMAGE_ROOT, filename)
+    if source is None or not os.path.isfile(source):
+        abort(404)
+    if Image is None:
+        return redirect(url_for('static_assets.serve_asset', filename=f"images/{filename}"))
+
+    current, _ = source_info(source)
+    if digest != current:
+        # Orijinal değişmiş: güncel (immutable) URL'e yönlendir
+        return redirect(url_for('images.get_variant', variant=variant, digest=current, filename=filename))
+
+    try:
+        target = _variant_file(source, current, variant)
+    except TimeoutError:
+        response = make_response(jsonify({"error": "Resim hazırlanıyor, lütfen tekrar deneyin"}), 503)
+        response.headers['Retry-After'] = '2'
+        return response
+    except OSError as e:
+        print(f"Image variant error ({filename}, {variant}): {e}")
+        return jsonify({"error": "Resim işlenemedi"}), 500
+
+    mimetype = mimetypes.guess_type(target)[0] or 'application/octet-stream'
+    response = send_file(target, mimetype=mimetype, etag=f"{current}-{variant}", conditional=True)
+    response.headers['Cache-Control'] = f'public, max-age={STATIC_MAX_AGE}, immutable'
+    return response
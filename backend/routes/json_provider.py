@@ -0,0 +1,72 @@
+# Fast JSON Provider
+# Flask 2.3 app.json_encoder'ı yok sayar; tüm serileştirme app.json (JSONProvider) üzerinden
+# yapılır (jsonify, NDJSON stream, request.json). orjson kuruluysa o kullanılır, yoksa stdlib json.
+# MySQL cursor'ından gelen tipler her iki yolda da aynı çıktıyı verir:
+#   Decimal   -> sayı (float)
+#   datetime  -> "2025-12-15T19:30:00" (ISO 8601, timezone'suz sunucu saati)
+#   date      -> "2025-12-15"
+#   timedelta -> "19:30:00" (MySQL TIME kolonları)
+import json
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _format_timedelta(value):
+    seconds = int(value.total_seconds())
+    sign = '-' if seconds < 0 else ''
+    seconds = abs(seconds)
+    return f"{sign}{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def _default(obj):
+    """orjson/json'un kendisinin bilmediği tipler"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, timedelta):
+        return _format_timedelta(obj)
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, (bytes, bytearray)):
+        return obj.decode('utf-8', errors='replace')
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    ensure_ascii = False   # Türkçe karakterler \u escape edilmez (orjson ile aynı çıktı)
+    sort_keys = False      # Kolon sırası SELECT'teki gibi kalır
+    compact = True         # Debug modunda da girintisiz
+
+    def dumps(self, obj, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS).decode()
+        kwargs.setdefault('default', _default)
+        kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+        kwargs.setdefault('sort_keys', self.sort_keys)
+        return json.dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        if orjson is not None:
+            # str'e çevirmeden doğrudan bytes gövde
+            body = orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+        else:
+            body = self.dumps(obj, separators=(',', ':'))
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def backend_name():
+    return 'orjson' if orjson is not None else 'json'
@@ -1,10 +1,14 @@
 # Menu Routes
-from flask import Blueprint, jsonify
+# Katalog verisi nadiren değişir; sorgular query cache'ten okunur (bkz. models/query_cache.py)
+from flask import Blueprint
 from models.database import execute_query
+from routes.caching import conditional
+from routes.streaming import rows_json
 
 menu_bp = Blueprint('menu', __name__, url_prefix='/api/menu')
 
 @menu_bp.route('', methods=['GET'])
+@conditional('MENUITEMS', 'CATEGORIES')
 def get_menu():
     """Get menu with category names"""
     query = """
@@ -17,11 +21,12 @@ def get_menu():
     LEFT JOIN CATEGORIES c ON m.category_id = c.category_id
     ORDER BY m.price DESC
     """
-    data = execute_query(query)
+    data = execute_query(query, cached=True)
     # Return empty array if no menu items (not an error)
-    return jsonify(data if data is not None else [])
+    return rows_json(data)
 
 @menu_bp.route('/category/<int:category_id>', methods=['GET'])
+@conditional('MENUITEMS', 'CATEGORIES')
 def get_menu_by_category(category_id):
     """Get menu items for a specific category"""
     query = """
@@ -34,11 +39,12 @@ def get_menu_by_category(category_id):
     WHERE m.category_id = %s
     ORDER BY m.price ASC
     """
-    data = execute_query(query, (category_id,))
+    data = execute_query(query, (category_id,), cached=True)
     # Return empty array if no items in category (not necessarily an error)
-    return jsonify(data if data is not None else [])
+    return rows_json(data)
 
 @menu_bp.route('/categories', methods=['GET'])
+@conditional('CATEGORIES')
 def get_categories():
     """Get all menu categories"""
     query = """
@@ -48,5 +54,5 @@ def get_categories():
     FROM CATEGORIES
     ORDER BY category_id
     """
-    data = execute_query(query)
-    return jsonify(data if data is not None else [])
+    data = execute_query(query, cached=True)
+    return rows_json(data)
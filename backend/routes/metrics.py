@@ -0,0 +1,251 @@
+# Request/SQL Instrumentation + Prometheus /metrics
+# models/database.py her statement'tan sonra bir StatementEvent yayınlar; burada o event'ler
+# aktif Flask isteğine (flask.g) bağlanır. İstek bitince:
+#   - yanıta X-Query-Count ve Server-Timing header'ları eklenir
+#   - SLOW_QUERY_MS'i aşan statement'lar loglanır
+#   - aynı statement bir istekte SQL_REPEAT_WARN kez çalıştıysa N+1 uyarısı verilir
+#   - endpoint başına histogramlar güncellenir (GET /metrics, Prometheus text formatı)
+import re
+import threading
+import time
+
+from flask import Blueprint, Response, g, has_request_context, request
+from config import SLOW_QUERY_MS, SQL_REPEAT_WARN
+from models.database import add_statement_observer, cache_stats, pool_stats, replica_stats
+from models.events import event_bus
+
+metrics_bp = Blueprint('metrics', __name__)
+
+# Saniye cinsinden süre bucket'ları ve istek başına sorgu sayısı bucket'ları
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+_STRING_RE = re.compile(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.|\"\")*\"")
+_NUMBER_RE = re.compile(r'(?<![\w.])-?\d+(?:\.\d+)?\b')
+_PLACEHOLDER_RE = re.compile(r'%\(\w+\)s|%s')
+_IN_LIST_RE = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_WS_RE = re.compile(r'\s+')
+
+
+def normalize_sql(query):
+    """Literal ve placeholder'ları '?' yap, IN listelerini daralt, boşlukları tekleştir"""
+    query = _STRING_RE.sub('?', query)
+    query = _PLACEHOLDER_RE.sub('?', query)
+    query = _NUMBER_RE.sub('?', query)
+    query = _IN_LIST_RE.sub('(...)', query)
+    return _WS_RE.sub(' ', query).strip()
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values, extra=''):
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+class Counter:
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for values, total in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labels, values)} {total}")
+        return lines
+
+
+class Histogram:
+    """Kümülatif bucket'lı Prometheus histogramı"""
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self._series = {}   # label değerleri -> [bucket sayaçları..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for values, series in sorted(self._series.items()):
+                for bound, count in zip(self.buckets, series):
+                    labels = _format_labels(self.labels, values, f'le="{bound}"')
+                    lines.append(f"{self.name}_bucket{labels} {count}")
+                labels = _format_labels(self.labels, values, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{labels} {series[-1]}")
+                labels = _format_labels(self.labels, values)
+                lines.append(f"{self.name}_sum{labels} {round(series[-2], 6)}")
+                lines.append(f"{self.name}_count{labels} {series[-1]}")
+        return lines
+
+
+REQUEST_LATENCY = Histogram(
+    'gastromind_http_request_duration_seconds', 'HTTP request latency by endpoint',
+    labels=('endpoint', 'method'))
+REQUESTS = Counter(
+    'gastromind_http_requests_total', 'HTTP requests by endpoint and status',
+    labels=('endpoint', 'method', 'status'))
+QUERIES_PER_REQUEST = Histogram(
+    'gastromind_db_queries_per_request', 'SQL statements executed per request',
+    labels=('endpoint',), buckets=QUERY_COUNT_BUCKETS)
+QUERY_LATENCY = Histogram(
+    'gastromind_db_query_duration_seconds', 'SQL statement latency by endpoint (excluding pool wait)',
+    labels=('endpoint',))
+POOL_WAIT = Histogram(
+    'gastromind_db_pool_wait_seconds', 'Time spent waiting for a pooled connection',
+    labels=('endpoint',))
+SLOW_QUERIES = Counter(
+    'gastromind_db_slow_queries_total', f'SQL statements slower than {SLOW_QUERY_MS} ms',
+    labels=('endpoint',))
+REPEATED_STATEMENTS = Counter(
+    'gastromind_db_repeated_statement_requests_total',
+    f'Requests that ran one statement at least {SQL_REPEAT_WARN} times (possible N+1)',
+    labels=('endpoint',))
+
+_METRICS = (REQUEST_LATENCY, REQUESTS, QUERIES_PER_REQUEST, QUERY_LATENCY, POOL_WAIT,
+            SLOW_QUERIES, REPEATED_STATEMENTS)
+
+
+def _endpoint():
+    return request.endpoint or 'unmatched'
+
+
+def _on_statement(event):
+    """models.database gözlemcisi: event'i isteğe bağla, yavaşsa logla"""
+    in_request = has_request_context()
+    endpoint = _endpoint() if in_request else 'none'
+    if event.duration * 1000 >= SLOW_QUERY_MS:
+        SLOW_QUERIES.inc(endpoint)
+        print(f"SLOW QUERY {event.duration * 1000:.1f} ms rows={event.rows} "
+              f"[{endpoint}] {normalize_sql(event.query)}")
+    if not in_request:
+        return
+    statements = g.setdefault('sql_statements', [])
+    statements.append(event)
+
+
+def _before_request():
+    g.request_started = time.perf_counter()
+    g.sql_statements = []
+
+
+def _after_request(response):
+    g.response_status = response.status_code
+    # SSE bağlantısının süresi istemci kalana kadar sürer; gecikme histogramını bozmasın
+    g.long_lived = response.mimetype == 'text/event-stream'
+    if response.is_streamed:
+        # Streaming sorguları gövde gönderilirken çalışır; sayı teardown'da ölçülür
+        return response
+    statements = g.get('sql_statements', [])
+    db_time = sum(e.duration for e in statements)
+    response.headers['X-Query-Count'] = str(len(statements))
+    response.headers.add('Server-Timing', f'db;dur={db_time * 1000:.1f};desc="{len(statements)} queries"')
+    return response
+
+
+def _teardown_request(exc):
+    """Streaming yanıtlarda da tüm satırlar gönderildikten sonra çalışır"""
+    started = g.get('request_started')
+    if started is None:
+        return
+    endpoint = _endpoint()
+    statements = g.get('sql_statements', [])
+
+    if not g.get('long_lived'):
+        REQUEST_LATENCY.observe(time.perf_counter() - started, endpoint, request.method)
+    status = g.get('response_status', 500 if exc else 200)
+    REQUESTS.inc(endpoint, request.method, str(status))
+    QUERIES_PER_REQUEST.observe(len(statements), endpoint)
+
+    repeats = {}
+    for event in statements:
+        QUERY_LATENCY.observe(event.duration, endpoint)
+        if event.wait_time:
+            POOL_WAIT.observe(event.wait_time, endpoint)
+        if not event.cached:
+            key = normalize_sql(event.query)
+            repeats[key] = repeats.get(key, 0) + 1
+
+    worst = max(repeats.items(), key=lambda item: item[1], default=None)
+    if worst and worst[1] >= SQL_REPEAT_WARN:
+        REPEATED_STATEMENTS.inc(endpoint)
+        print(f"N+1 WARNING [{endpoint}] {worst[1]}x {worst[0]}")
+
+
+def init_instrumentation(app):
+    """İstek hook'larını ve SQL gözlemcisini uygulamaya bağla"""
+    add_statement_observer(_on_statement)
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+
+
+def _sample(name, help_text, kind, value):
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {value}"]
+
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus text exposition formatında metrikler"""
+    lines = []
+    for metric in _METRICS:
+        lines.extend(metric.render())
+
+    stats = pool_stats()
+    if stats:
+        lines += _sample('gastromind_db_pool_in_use', 'Connections checked out', 'gauge', stats['in_use'])
+        lines += _sample('gastromind_db_pool_idle', 'Idle pooled connections', 'gauge', stats['idle'])
+        lines += _sample('gastromind_db_pool_waiters', 'Threads waiting for a connection', 'gauge',
+                         stats['waiters'])
+        lines += _sample('gastromind_db_pool_timeouts_total', 'Connection checkout timeouts', 'counter',
+                         stats['timeouts'])
+    cache = cache_stats()
+    lines += _sample('gastromind_query_cache_hits_total', 'Query cache hits', 'counter', cache['hits'])
+    lines += _sample('gastromind_query_cache_misses_total', 'Query cache misses', 'counter', cache['misses'])
+    lines += _sample('gastromind_query_cache_bytes', 'Query cache memory estimate', 'gauge', cache['bytes'])
+
+    stream = event_bus.stats()
+    lines += _sample('gastromind_stream_subscribers', 'Open /api/stream connections', 'gauge',
+                     stream['subscribers'])
+    lines += _sample('gastromind_stream_events_total', 'Events published to /api/stream', 'counter',
+                     stream['published'])
+
+    replicas = replica_stats()
+    if replicas:
+        lines += ["# HELP gastromind_db_replica_healthy Replica receives reads (1) or is excluded (0)",
+                  "# TYPE gastromind_db_replica_healthy gauge"]
+        lines += [f'gastromind_db_replica_healthy{{replica="{r["name"]}"}} {int(r["healthy"])}'
+                  for r in replicas['replicas']]
+        lines += ["# HELP gastromind_db_replica_lag_seconds Replication lag from the last health check",
+                  "# TYPE gastromind_db_replica_lag_seconds gauge"]
+        lines += [f'gastromind_db_replica_lag_seconds{{replica="{r["name"]}"}} {r["lag_seconds"]}'
+                  for r in replicas['replicas'] if r['lag_seconds'] is not None]
+        lines += _sample('gastromind_db_replica_fallbacks_total', 'Reads sent to primary (no usable replica)',
+                         'counter', replicas['fallbacks_to_primary'])
+
+    return Response("\n".join(lines) + "\n", mimetype='text/plain; version=0.0.4')
@@ -1,32 +1,66 @@
 # Orders Routes
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import mysql.connector
 from flask import Blueprint, jsonify, request
-from models.database import execute_query, execute_insert_update
+from models import customer_stats, rollups
+from models.customer_search import customer_search_index
+from models.database import execute_query, transaction
+from routes.pagination import Page, PaginationError, parse_datetime_arg, parse_int_arg
+from routes.stream import publish
 
 orders_bp = Blueprint('orders', __name__, url_prefix='/api/orders')
 
 @orders_bp.route('', methods=['GET'])
 def get_orders():
-    """Tüm siparişleri getir, opsiyonel tarih filtresi"""
-    date_filter = request.args.get('date')
+    """
+    Siparişleri (order_time, order_id) keyset sayfalarıyla getir.
+    Filtreler: date, from, to (yarı açık aralık), customer_id, session_id, staff_id
+    Sayfalama: limit, cursor (sonraki sayfa X-Next-Cursor header'ında); ?stream=1 ile NDJSON
+    """
+    page = Page.from_request([
+        ('o.order_time', 'order_time', True),
+        ('o.order_id', 'order_id', False),
+    ])
+    # item_count korelasyonlu alt sorgu ile sayılıyor; GROUP BY olmadığı için
+    # MySQL sıralı okumayı LIMIT'te durdurabiliyor
     query = """
     SELECT o.order_id, ds.session_id, c.full_name as customer_name,
-           o.order_time, COUNT(od.detail_id) as item_count
+           o.order_time,
+           (SELECT COUNT(*) FROM ORDERDETAILS od WHERE od.order_id = o.order_id) as item_count
     FROM ORDERS o
     JOIN DININGSESSIONS ds ON o.session_id = ds.session_id
     JOIN RESERVATIONS r ON ds.reservation_id = r.reservation_id
     JOIN CUSTOMERS c ON r.customer_id = c.customer_id
-    LEFT JOIN ORDERDETAILS od ON o.order_id = od.order_id
     """
-    params = []
+    where, params = [], []
+    date_filter = request.args.get('date')
     if date_filter:
-        query += " WHERE DATE(o.order_time) = %s"
-        params.append(date_filter)
-    query += " GROUP BY o.order_id ORDER BY o.order_time DESC"
-    data = execute_query(query, params)
-    if data:
-        return jsonify(data)
-    else:
-        return jsonify([])
+        # DATE(o.order_time) = %s index kullanamaz; yarı açık aralık kullanılıyor
+        try:
+            day = datetime.strptime(date_filter, '%Y-%m-%d')
+        except ValueError:
+            raise PaginationError("'date' must be YYYY-MM-DD")
+        where.append("o.order_time >= %s AND o.order_time < %s")
+        params.extend([day, day + timedelta(days=1)])
+    date_from = parse_datetime_arg('from')
+    if date_from:
+        where.append("o.order_time >= %s")
+        params.append(date_from)
+    date_to = parse_datetime_arg('to')
+    if date_to:
+        where.append("o.order_time < %s")
+        params.append(date_to)
+    for arg, column in (('customer_id', 'r.customer_id'),
+                        ('session_id', 'o.session_id'),
+                        ('staff_id', 'o.staff_id')):
+        value = parse_int_arg(arg)
+        if value is not None:
+            where.append(f"{column} = %s")
+            params.append(value)
+
+    return page.fetch(query, where, params)
 
 @orders_bp.route('/<int:order_id>/details', methods=['GET'])
 def get_order_details(order_id):
@@ -46,18 +80,91 @@ def get_order_details(order_id):
 
 @orders_bp.route('', methods=['POST'])
 def create_order():
-    """Yeni sipariş oluştur"""
-    data = request.json
-    query = """
-    INSERT INTO ORDERS (session_id, staff_id, order_time)
-    VALUES (%s, %s, NOW())
     """
-    success = execute_insert_update(query, (
-        data['session_id'],
-        data['staff_id']
-    ))
-    
-    if success:
-        return jsonify({"message": "Sipariş oluşturuldu"}), 201
-    else:
+    Yeni sipariş oluştur - kalemleriyle birlikte, tek transaction içinde.
+    Body: {"session_id": 1, "staff_id": 4,
+           "items": [{"item_id": 3, "quantity": 2, "special_note": "..."}, ...]}
+    Fiyatlar MENUITEMS'tan tek IN sorgusuyla okunur, kalemler executemany ile eklenir;
+    session total_amount ve müşterinin LTV'si aynı transaction'da güncellenir.
+    """
+    data = request.get_json(silent=True) or {}
+    if data.get('session_id') is None or data.get('staff_id') is None:
+        return jsonify({"error": "session_id ve staff_id zorunludur"}), 400
+
+    items = data.get('items') or []
+    if not isinstance(items, list):
+        return jsonify({"error": "items bir liste olmalıdır"}), 400
+    lines = []
+    for item in items:
+        try:
+            item_id = int(item['item_id'])
+            quantity = int(item.get('quantity', 1))
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return jsonify({"error": "Her kalem için item_id (ve tamsayı quantity) gereklidir"}), 400
+        if quantity < 1:
+            return jsonify({"error": "quantity en az 1 olmalıdır"}), 400
+        lines.append((item_id, quantity, item.get('special_note')))
+
+    customer = None
+    try:
+        with transaction() as cursor:
+            prices = {}
+            if lines:
+                item_ids = list(dict.fromkeys(line[0] for line in lines))
+                placeholders = ", ".join(["%s"] * len(item_ids))
+                cursor.execute(
+                    f"SELECT item_id, price FROM MENUITEMS WHERE item_id IN ({placeholders})",
+                    item_ids
+                )
+                prices = {row['item_id']: row['price'] for row in cursor.fetchall()}
+                missing = [i for i in item_ids if i not in prices]
+                if missing:
+                    # Henüz hiçbir şey yazılmadı; boş transaction commit edilir
+                    return jsonify({"error": "Menüde olmayan ürün", "item_ids": missing}), 400
+
+            cursor.execute("""
+                INSERT INTO ORDERS (session_id, staff_id, order_time)
+                VALUES (%s, %s, NOW())
+            """, (data['session_id'], data['staff_id']))
+            order_id = cursor.lastrowid
+            # Personel cirosu session'ın sipariş öncesi tutarıyla eklenir;
+            # aşağıdaki on_session_amount_changed yeni tutarı tüm siparişlere yansıtır
+            rollups.on_order_created(cursor, order_id)
+
+            total = sum((prices[item_id] * quantity for item_id, quantity, _ in lines), Decimal('0.00'))
+            if lines:
+                cursor.executemany("""
+                    INSERT INTO ORDERDETAILS (order_id, item_id, quantity, special_note)
+                    VALUES (%s, %s, %s, %s)
+                """, [(order_id, item_id, quantity, note) for item_id, quantity, note in lines])
+                rollups.on_order_details_added(
+                    cursor, order_id, [(item_id, quantity) for item_id, quantity, _ in lines]
+                )
+                cursor.execute("""
+                    UPDATE DININGSESSIONS SET total_amount = COALESCE(total_amount, 0) + %s
+                    WHERE session_id = %s
+                """, (total, data['session_id']))
+                rollups.on_session_amount_changed(cursor, data['session_id'], total)
+                customer = customer_stats.on_session_amount_changed(cursor, data['session_id'], total)
+    except mysql.connector.IntegrityError as e:
+        print(f"Order integrity error: {e}")
+        return jsonify({"error": "Geçersiz session_id veya staff_id"}), 400
+    except mysql.connector.Error:
         return jsonify({"error": "Sipariş oluşturulamadı"}), 500
+
+    if customer:
+        customer_search_index.customer_updated(customer)
+    publish('orders', 'order.created', {
+        "order_id": order_id,
+        "session_id": data['session_id'],
+        "staff_id": data['staff_id'],
+        "items": [{"item_id": item_id, "quantity": quantity, "special_note": note}
+                  for item_id, quantity, note in lines],
+        "total": total,
+    })
+    return jsonify({
+        "message": "Sipariş oluşturuldu",
+        "order_id": order_id,
+        "item_count": len(lines),
+        "total": total,
+    }), 201
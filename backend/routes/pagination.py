@@ -0,0 +1,189 @@
+# Keyset (Cursor) Pagination Helpers
+# OFFSET yerine son satırın sıralama anahtarıyla devam edilir; derin sayfalar da sabit maliyetli
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from urllib.parse import urlencode
+
+from flask import request
+from config import PAGE_DEFAULT_LIMIT, PAGE_MAX_LIMIT
+from models.database import execute_query
+from routes.streaming import rows_json, stream_rows, wants_stream
+
+
+class PaginationError(ValueError):
+    """Geçersiz limit/cursor/filtre parametresi (400 döndürülür)"""
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S.%f')
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def encode_cursor(values):
+    """Anahtar değerlerini URL-safe token'a çevir"""
+    raw = json.dumps([_encode_value(v) for v in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token, size):
+    """Token'ı anahtar değerleri listesine çevir"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, UnicodeDecodeError):
+        raise PaginationError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise PaginationError("Invalid cursor")
+    return values
+
+
+def parse_local_datetime(value):
+    """
+    ISO tarih/saat oku (ValueError). Veritabanı ve index'ler yerel saatte naive datetime tutar;
+    '+03:00' gibi offset'li değerler yerel saate çevrilip tzinfo düşürülür (naive/aware
+    karşılaştırması TypeError verir).
+    """
+    parsed = datetime.fromisoformat(str(value))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+
+def parse_datetime_arg(name):
+    """'YYYY-MM-DD' veya 'YYYY-MM-DD HH:MM[:SS]' formatındaki query parametresini oku"""
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        return parse_local_datetime(value)
+    except ValueError:
+        raise PaginationError(f"Invalid datetime for '{name}': {value}")
+
+
+def parse_int_arg(name):
+    value = request.args.get(name)
+    if value is None or value == '':
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise PaginationError(f"'{name}' must be an integer")
+
+
+def parse_bool_arg(name):
+    value = request.args.get(name)
+    if value is None or value == '':
+        return None
+    return value.lower() in ('1', 'true', 'yes')
+
+
+class Page:
+    """
+    Tek bir keyset sayfası.
+
+    keys: [(sql_ifadesi, satırdaki_alan, nullable), ...] - hepsi DESC sıralı.
+    Son anahtar benzersiz olmalıdır (ör. primary key).
+    Streaming modunda (bkz. routes/streaming.py) limit verilmezse tüm sonuç stream edilir.
+    """
+
+    def __init__(self, keys, limit=None, cursor=None, stream=False):
+        self.keys = keys
+        self.stream = stream
+        if limit is None and not stream:
+            limit = PAGE_DEFAULT_LIMIT
+        self.limit = limit
+        self.cursor = cursor
+
+    @classmethod
+    def from_request(cls, keys):
+        limit = parse_int_arg('limit')
+        if limit is not None and not 1 <= limit <= PAGE_MAX_LIMIT:
+            raise PaginationError(f"limit must be between 1 and {PAGE_MAX_LIMIT}")
+        token = request.args.get('cursor')
+        cursor = decode_cursor(token, len(keys)) if token else None
+        return cls(keys, limit, cursor, stream=wants_stream())
+
+    def where_clause(self):
+        """
+        Cursor'dan sonraki satırlar için WHERE parçası.
+        (a, b, c) < (x, y, z) açılımı: a < x OR (a = x AND b < y) OR ...
+        NULL değerler DESC sıralamada en sona düşer; eşitlik için <=> kullanılır.
+        """
+        if self.cursor is None:
+            return None, []
+
+        terms, params = [], []
+        for i, (expr, _, nullable) in enumerate(self.keys):
+            value = self.cursor[i]
+            if value is None:
+                # NULL'dan küçük değer yok; sadece sonraki anahtarlara bakılır
+                continue
+            prefix = [f"{e} <=> %s" for e, _, _ in self.keys[:i]]
+            if nullable:
+                after = f"({expr} < %s OR {expr} IS NULL)"
+            else:
+                after = f"{expr} < %s"
+            terms.append("(" + " AND ".join(prefix + [after]) + ")")
+            params.extend(self.cursor[:i])
+            params.append(value)
+
+        if not terms:
+            return "FALSE", []
+        return "(" + " OR ".join(terms) + ")", params
+
+    def order_by(self):
+        return ", ".join(f"{expr} DESC" for expr, _, _ in self.keys)
+
+    def apply(self, query, where, params):
+        """WHERE + ORDER BY + LIMIT ekleyip (query, params) döndür"""
+        where = list(where)
+        params = list(params)
+        clause, cursor_params = self.where_clause()
+        if clause:
+            where.append(clause)
+            params.extend(cursor_params)
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += f" ORDER BY {self.order_by()}"
+        if self.stream:
+            if self.limit is not None:
+                query += " LIMIT %s"
+                params.append(self.limit)
+        else:
+            # Bir fazla satır çekip sonraki sayfa olup olmadığını anlıyoruz
+            query += " LIMIT %s"
+            params.append(self.limit + 1)
+        return query, params
+
+    def fetch(self, query, where, params):
+        """Sorguyu sayfalayıp çalıştır; JSON sayfa veya NDJSON stream döndür"""
+        query, params = self.apply(query, where, params)
+        if self.stream:
+            return stream_rows(query, params)
+        return self.response(execute_query(query, params))
+
+    def response(self, rows):
+        """Sayfayı JSON array olarak döndür; sonraki sayfa X-Next-Cursor header'ında"""
+        rows = rows if rows is not None else []
+        next_cursor = None
+        if len(rows) > self.limit:
+            rows = rows[:self.limit]
+            last = rows[-1]
+            next_cursor = encode_cursor([last[field] for _, field, _ in self.keys])
+
+        resp = rows_json(rows)
+        if next_cursor:
+            args = request.args.to_dict()
+            args['cursor'] = next_cursor
+            args['limit'] = str(self.limit)
+            resp.headers['X-Next-Cursor'] = next_cursor
+            resp.headers['Link'] = f'<{request.base_url}?{urlencode(args)}>; rel="next"'
+        return resp
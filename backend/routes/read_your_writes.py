@@ -0,0 +1,45 @@
+# Read Your Writes
+# Replica'lar primary'nin birkaç saniye gerisinde olabilir. İstemci yazdıktan hemen sonra
+# okuduğunda kendi yazmasını görsün diye:
+#   - İstek içinde: ilk yazmadan sonraki okumalar primary'ye gider (models/database.py)
+#   - İstekler arası: yazan isteğin yanıtına gm_last_write cookie'si eklenir; bu cookie ile
+#     DB_READ_YOUR_WRITES_SECONDS içinde gelen isteklerin tüm okumaları primary'den yapılır
+# DB_REPLICAS boşsa hook'lar eklenmez (tüm sorgular zaten primary'de).
+import time
+
+from flask import request
+from config import DB_REPLICAS, DB_READ_YOUR_WRITES_SECONDS
+from models.database import begin_read_routing, end_read_routing, wrote_in_context
+
+COOKIE_NAME = 'gm_last_write'
+
+
+def _wrote_recently():
+    try:
+        last_write = float(request.cookies.get(COOKIE_NAME, 0))
+    except ValueError:
+        return False
+    return time.time() - last_write < DB_READ_YOUR_WRITES_SECONDS
+
+
+def _before_request():
+    begin_read_routing(primary=_wrote_recently())
+
+
+def _after_request(response):
+    if wrote_in_context():
+        response.set_cookie(COOKIE_NAME, f"{time.time():.3f}", max_age=DB_READ_YOUR_WRITES_SECONDS,
+                            httponly=True, samesite='Lax')
+    return response
+
+
+def _teardown_request(exc):
+    end_read_routing()
+
+
+def init_read_your_writes(app):
+    if not DB_REPLICAS:
+        return
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
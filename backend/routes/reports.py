@@ -1,12 +1,21 @@
 # Advanced Reports/Queries Routes
 # Sophisticated SQL Queries for Analytics
-from flask import Blueprint, jsonify
+# Tüm raporlar ?stream=1 / Accept: application/x-ndjson ile satır satır stream edilebilir
+# daily-revenue, top-menu-items, staff-performance ve table-performance
+# ROLLUP_* özet tablolarından okur (bkz. models/rollups.py)
+# @conditional: okunan tablolar değişmediyse If-None-Match ile sorgusuz 304 döner
+# @precomputed: ağır raporlar arka planda REPORT_REFRESH_INTERVALS aralıklarıyla hesaplanır,
+# istek bellekteki son sonucu alır (Age / X-Report-* header'ları ile)
+from flask import Blueprint
 from models.database import execute_query
+from routes.caching import conditional, precomputed
+from routes.streaming import rows_response
 
 reports_bp = Blueprint('reports', __name__, url_prefix='/api/reports')
 
 # 1. NESTED QUERY: Get all orders from the highest spending customer
 @reports_bp.route('/top-customer-orders', methods=['GET'])
+@precomputed('top-customer-orders', 'ORDERS', 'DININGSESSIONS', 'RESERVATIONS', 'CUSTOMERS')
 def get_top_customer_orders():
     """Get orders from the customer with highest lifetime value (TRUE nested query)"""
     query = """
@@ -43,11 +52,12 @@ def get_top_customer_orders():
         """
         data = execute_query(query_fallback)
     
-    return jsonify(data if data is not None else [])
+    return data
 
 
 # 2. COMPLEX JOIN + AGGREGATION: Total spending, visits, average per customer
 @reports_bp.route('/customer-spending', methods=['GET'])
+@precomputed('customer-spending', 'CUSTOMERS', 'RESERVATIONS', 'DININGSESSIONS')
 def get_customer_spending():
     """Total spending, visit count, and average per customer"""
     query = """
@@ -63,11 +73,11 @@ def get_customer_spending():
     GROUP BY cust.customer_id, cust.full_name, cust.vip_status
     ORDER BY total_spent DESC
     """
-    data = execute_query(query)
-    return jsonify(data if data else [])
+    return execute_query(query)
 
 # 3. CASE STATEMENT: Customer classification (Platinum, Gold, Regular, Inactive)
 @reports_bp.route('/customer-classification', methods=['GET'])
+@precomputed('customer-classification', 'CUSTOMERS')
 def classify_customers():
     """Müşterileri harcamalarına göre sınıflandır"""
     query = """
@@ -82,34 +92,32 @@ def classify_customers():
     FROM CUSTOMERS
     ORDER BY total_ltv DESC
     """
-    data = execute_query(query)
-    return jsonify(data if data else [])
+    return execute_query(query)
 
-# 4. COMPLEX JOIN: Table performance (capacity, booking count, average revenue)
+# 4. ROLLUP + LEFT JOIN: Table performance (capacity, booking count, average revenue)
 @reports_bp.route('/table-performance', methods=['GET'])
+@precomputed('table-performance', 'TABLES', 'ROLLUP_TABLE_STATS')
 def get_table_performance():
-    """Analyze each table's performance"""
+    """Analyze each table's performance (from ROLLUP_TABLE_STATS)"""
     query = """
     SELECT t.table_id, t.capacity, t.location_zone,
-           COUNT(r.reservation_id) as total_bookings,
-           COUNT(ds.session_id) as completed_sessions,
-           COALESCE(ROUND(AVG(ds.total_amount), 2), 0) as avg_revenue,
-           COALESCE(SUM(ds.total_amount), 0) as total_revenue,
+           COALESCE(rt.total_bookings, 0) as total_bookings,
+           COALESCE(rt.completed_sessions, 0) as completed_sessions,
+           COALESCE(ROUND(rt.total_revenue / NULLIF(rt.completed_sessions, 0), 2), 0) as avg_revenue,
+           COALESCE(rt.total_revenue, 0) as total_revenue,
            CASE 
-               WHEN COUNT(r.reservation_id) = 0 THEN 0
-               ELSE ROUND(COUNT(ds.session_id) * 100.0 / COUNT(r.reservation_id), 1)
+               WHEN COALESCE(rt.total_bookings, 0) = 0 THEN 0
+               ELSE ROUND(rt.completed_sessions * 100.0 / rt.total_bookings, 1)
            END as completion_rate
     FROM TABLES t
-    LEFT JOIN RESERVATIONS r ON t.table_id = r.table_id
-    LEFT JOIN DININGSESSIONS ds ON r.reservation_id = ds.reservation_id
-    GROUP BY t.table_id, t.capacity, t.location_zone
+    LEFT JOIN ROLLUP_TABLE_STATS rt ON t.table_id = rt.table_id
     ORDER BY total_revenue DESC
     """
-    data = execute_query(query)
-    return jsonify(data if data is not None else [])
+    return execute_query(query)
 
 # 5. GROUP BY + DATE FUNCTIONS: Customer lifetime duration
 @reports_bp.route('/customer-first-last-visit', methods=['GET'])
+@precomputed('customer-first-last-visit', 'CUSTOMERS', 'RESERVATIONS', 'DININGSESSIONS')
 def get_customer_first_last_visit():
     """Get first visit, last visit, and customer lifetime days for each customer"""
     query = """
@@ -124,68 +132,63 @@ def get_customer_first_last_visit():
     GROUP BY cust.customer_id, cust.full_name;
 
     """
-    data = execute_query(query)
-    return jsonify(data if data else [])
+    return execute_query(query)
 
-# 6. GROUP BY - HAVING: Top menu items (Top 10)
+# 6. ROLLUP + JOIN: Top menu items (Top 10)
 @reports_bp.route('/top-menu-items', methods=['GET'])
+@conditional('ROLLUP_ITEM_SALES', 'MENUITEMS', 'CATEGORIES')
 def get_top_menu_items():
-    """En çok sipariş edilen menü öğelerini getir (top 10)"""
+    """En çok sipariş edilen menü öğelerini getir (top 10, ROLLUP_ITEM_SALES)"""
     query = """
     SELECT m.name AS item_name,
            c.category_name,
-           SUM(od.quantity) AS total_quantity,
-           COUNT(DISTINCT o.order_id) AS order_count,
-           ROUND(AVG(m.price), 2) AS avg_price
-    FROM ORDERDETAILS od
-    JOIN MENUITEMS m ON od.item_id = m.item_id
+           ri.total_quantity,
+           ri.order_count,
+           ROUND(m.price, 2) AS avg_price
+    FROM ROLLUP_ITEM_SALES ri
+    JOIN MENUITEMS m ON ri.item_id = m.item_id
     JOIN CATEGORIES c ON m.category_id = c.category_id
-    JOIN ORDERS o ON od.order_id = o.order_id
-    GROUP BY m.item_id, m.name, c.category_name
-    HAVING SUM(od.quantity) > 0
-    ORDER BY total_quantity DESC
+    WHERE ri.total_quantity > 0
+    ORDER BY ri.total_quantity DESC
     LIMIT 10
     """
-    data = execute_query(query)
-    return jsonify(data if data else [])
+    return rows_response(query)
 
-# 7. LEFT JOIN + GROUP BY + COALESCE: Staff sales performance
+# 7. ROLLUP + LEFT JOIN + COALESCE: Staff sales performance
 @reports_bp.route('/staff-performance', methods=['GET'])
+@conditional('STAFF', 'ROLLUP_STAFF_SALES')
 def get_staff_performance():
-    """Her personelin toplam sipariş sayısı ve cirosu"""
+    """Her personelin toplam sipariş sayısı ve cirosu (ROLLUP_STAFF_SALES)"""
     query = """
     SELECT s.staff_id, s.name, s.role,
-           COALESCE(COUNT(DISTINCT o.order_id), 0) AS total_orders,
-           COALESCE(SUM(ds.total_amount), 0) AS total_revenue,
-           COALESCE(ROUND(AVG(ds.total_amount), 2), 0) AS avg_order_value
+           COALESCE(rs.total_orders, 0) AS total_orders,
+           COALESCE(rs.total_revenue, 0) AS total_revenue,
+           COALESCE(ROUND(rs.total_revenue / NULLIF(rs.total_orders, 0), 2), 0) AS avg_order_value
     FROM STAFF s
-    LEFT JOIN ORDERS o ON s.staff_id = o.staff_id
-    LEFT JOIN DININGSESSIONS ds ON o.session_id = ds.session_id
-    GROUP BY s.staff_id, s.name, s.role
+    LEFT JOIN ROLLUP_STAFF_SALES rs ON s.staff_id = rs.staff_id
     ORDER BY total_revenue DESC, s.name ASC
     """
-    data = execute_query(query)
-    return jsonify(data if data else [])
+    return rows_response(query)
 
-# 8. GROUP BY - HAVING: Daily revenue report
+# 8. ROLLUP: Daily revenue report
 @reports_bp.route('/daily-revenue', methods=['GET'])
+@conditional('ROLLUP_DAILY_REVENUE')
 def get_daily_revenue():
-    """Tarihe göre günlük toplam ciro"""
+    """Tarihe göre günlük toplam ciro (ROLLUP_DAILY_REVENUE)"""
     query = """
-    SELECT DATE(ds.start_time) AS date,
-           COUNT(DISTINCT ds.session_id) AS total_sessions,
-           SUM(ds.total_amount) AS daily_revenue,
-           ROUND(AVG(ds.total_amount), 2) AS avg_session_revenue
-    FROM DININGSESSIONS ds
-    GROUP BY DATE(ds.start_time)
-    HAVING SUM(ds.total_amount) > 0
-    ORDER BY date DESC
+    SELECT rd.day AS date,
+           rd.total_sessions,
+           rd.daily_revenue,
+           ROUND(rd.daily_revenue / NULLIF(rd.total_sessions, 0), 2) AS avg_session_revenue
+    FROM ROLLUP_DAILY_REVENUE rd
+    WHERE rd.daily_revenue > 0
+    ORDER BY rd.day DESC
     """
-    data = execute_query(query)
-    return jsonify(data if data else [])
+    return rows_response(query)
 
 # 9. NESTED QUERY: Reservation status analysis
 @reports_bp.route('/reservation-status-analysis', methods=['GET'])
+@precomputed('reservation-status-analysis', 'RESERVATIONS')
 def get_reservation_status_analysis():
     """Rezervasyon durumlarına göre analiz"""
     query = """
@@ -197,13 +200,17 @@ def get_reservation_status_analysis():
     GROUP BY r.status
     ORDER BY total_reservations DESC
     """
-    data = execute_query(query)
-    return jsonify(data if data else [])
+    return execute_query(query)
 
 # 10. NESTED QUERY: Peak day sessions - All sessions from the highest revenue day
 @reports_bp.route('/peak-day-sessions', methods=['GET'])
+@precomputed('peak-day-sessions', 'ROLLUP_DAILY_REVENUE', 'DININGSESSIONS', 'RESERVATIONS', 'CUSTOMERS', 'TABLES', 'ORDERS')
 def get_peak_day_sessions():
-    """Get all sessions from the day with highest total revenue (nested query)"""
+    """
+    Get all sessions from the day with highest total revenue (nested query).
+    Peak day comes from ROLLUP_DAILY_REVENUE; sessions are fetched with a
+    half-open start_time range so idx_sessions_start_time can be used.
+    """
     query = """
     SELECT DATE(ds.start_time) as session_date,
            r.party_size,
@@ -214,19 +221,17 @@ def get_peak_day_sessions():
            ds.start_time,
            ds.end_time,
            (SELECT COUNT(*) FROM ORDERS WHERE session_id = ds.session_id) as order_count
-    FROM DININGSESSIONS ds
+    FROM (
+        SELECT day FROM ROLLUP_DAILY_REVENUE
+        ORDER BY daily_revenue DESC LIMIT 1
+    ) peak
+    JOIN DININGSESSIONS ds
+      ON ds.start_time >= peak.day AND ds.start_time < peak.day + INTERVAL 1 DAY
     LEFT JOIN RESERVATIONS r ON ds.reservation_id = r.reservation_id
     LEFT JOIN CUSTOMERS c ON r.customer_id = c.customer_id
     LEFT JOIN TABLES t ON r.table_id = t.table_id
-    WHERE DATE(ds.start_time) = (
-        SELECT DATE(start_time)
-        FROM DININGSESSIONS
-        GROUP BY DATE(start_time)
-        ORDER BY SUM(total_amount) DESC LIMIT 1
-    )
     ORDER BY ds.start_time DESC
     """
-    data = execute_query(query)
-    return jsonify(data if data is not None else [])
+    return execute_query(query)
 
 
@@ -1,12 +1,28 @@
 # Reservation Routes
+import mysql.connector
 from flask import Blueprint, jsonify, request
-from models.database import execute_query, execute_insert_update
+from config import AVAILABILITY_ACTIVE_STATUSES, RESERVATION_DURATION_MINUTES
+from models import rollups
+from models.availability import AvailabilityError, availability_index
+from models.database import execute_query, transaction
+from routes.pagination import (Page, PaginationError, parse_datetime_arg, parse_int_arg,
+                               parse_local_datetime)
+from routes.stream import publish
+from routes.streaming import rows_json
 
 reservations_bp = Blueprint('reservations', __name__, url_prefix='/api/reservations')
 
 @reservations_bp.route('', methods=['GET'])
 def get_reservations():
-    """Get all reservations with customer and table info"""
+    """
+    Get reservations with customer and table info, newest first.
+    Filters: from, to (half-open), status, customer_id, table_id
+    Paging: limit, cursor (next page token in X-Next-Cursor header); ?stream=1 for NDJSON
+    """
+    page = Page.from_request([
+        ('r.reservation_time', 'reservation_time', False),
+        ('r.reservation_id', 'reservation_id', False),
+    ])
     query = """
     SELECT r.reservation_id, 
            COALESCE(c.full_name, 'Unknown') as customer_name, 
@@ -16,12 +32,27 @@ def get_reservations():
            COALESCE(r.status, 'Pending') as status
     FROM RESERVATIONS r
     LEFT JOIN CUSTOMERS c ON r.customer_id = c.customer_id
-    LEFT JOIN TABLES t ON r.table_id = t.table_id
-    ORDER BY r.reservation_time DESC
     """
-    data = execute_query(query)
-    # Return empty array if no data (not an error)
-    return jsonify(data if data is not None else [])
+    where, params = [], []
+    date_from = parse_datetime_arg('from')
+    if date_from:
+        where.append("r.reservation_time >= %s")
+        params.append(date_from)
+    date_to = parse_datetime_arg('to')
+    if date_to:
+        where.append("r.reservation_time < %s")
+        params.append(date_to)
+    status = request.args.get('status')
+    if status:
+        where.append("r.status = %s")
+        params.append(status)
+    for arg, column in (('customer_id', 'r.customer_id'), ('table_id', 'r.table_id')):
+        value = parse_int_arg(arg)
+        if value is not None:
+            where.append(f"{column} = %s")
+            params.append(value)
+
+    return page.fetch(query, where, params)
 
 @reservations_bp.route('/pending', methods=['GET'])
 def get_pending_reservations():
@@ -39,7 +70,7 @@ def get_pending_reservations():
     ORDER BY r.reservation_time ASC
     """
     data = execute_query(query)
-    return jsonify(data if data is not None else [])
+    return rows_json(data)
 
 @reservations_bp.route('/confirmed', methods=['GET'])
 def get_confirmed_reservations():
@@ -56,15 +87,70 @@ def get_confirmed_reservations():
     ORDER BY r.reservation_time ASC
     """
     data = execute_query(query)
-    return jsonify(data if data is not None else [])
+    return rows_json(data)
+
+@reservations_bp.route('/availability', methods=['GET'])
+def get_availability():
+    """
+    Free tables for party_size guests at time (YYYY-MM-DD HH:MM).
+    Served from the in-memory availability index, not a RESERVATIONS scan.
+    """
+    party_size = parse_int_arg('party_size')
+    start = parse_datetime_arg('time')
+    if party_size is None or start is None:
+        raise PaginationError("'party_size' and 'time' are required")
+    if party_size < 1:
+        raise PaginationError("'party_size' must be at least 1")
+
+    try:
+        tables, combinations = availability_index.free_tables(party_size, start)
+    except AvailabilityError as e:
+        return _unavailable(e)
+
+    return jsonify({
+        "time": start,
+        "party_size": party_size,
+        "duration_minutes": RESERVATION_DURATION_MINUTES,
+        "tables": tables,
+        "combinations": combinations,
+    })
+
+def _conflict_response(conflicts):
+    return jsonify({
+        "error": "Table is already booked for this time",
+        "conflicting_reservations": conflicts,
+    }), 409
+
+def _unavailable(error):
+    print(f"Availability error: {error}")
+    return jsonify({"error": "Availability is temporarily unavailable"}), 503
+
+def _check_slot(table_id, start, party_size):
+    """
+    Fast in-memory pre-check: return an error response if the table cannot take
+    this booking, else None. The authoritative check is availability_index.claim().
+    """
+    capacity = availability_index.capacity_for(table_id, party_size)
+    if capacity is None:
+        return jsonify({"error": "Table not found"}), 400
+    if party_size > capacity:
+        return jsonify({"error": f"Party size exceeds table capacity ({capacity})"}), 400
+    conflicts = availability_index.conflicts(table_id, start, party_size)
+    if conflicts:
+        return _conflict_response(conflicts)
+    return None
 
 @reservations_bp.route('', methods=['POST'])
 def create_reservation():
-    """Create a new reservation"""
+    """
+    Create a new reservation.
+    Concurrent bookings for the same table are serialized by a row lock on TABLES
+    (availability_index.claim); bookings for different tables do not wait on each other.
+    """
     data = request.json
     
     # Validate required fields
-    if not data:
+    if not data or not isinstance(data, dict):
         return jsonify({"error": "No data provided"}), 400
     
     required_fields = ['customer_id', 'table_id', 'reservation_time', 'party_size']
@@ -73,25 +159,51 @@ def create_reservation():
             return jsonify({"error": f"Missing required field: {field}"}), 400
     
     # Validate party_size is positive
-    if int(data['party_size']) < 1:
+    try:
+        customer_id = int(data['customer_id'])
+        party_size = int(data['party_size'])
+        table_id = int(data['table_id'])
+        start = parse_local_datetime(data['reservation_time'])
+    except (TypeError, ValueError):
+        return jsonify({"error": "Invalid customer_id, table_id, party_size or reservation_time"}), 400
+    if party_size < 1:
         return jsonify({"error": "Party size must be at least 1"}), 400
-    
-    query = """
-    INSERT INTO RESERVATIONS (customer_id, table_id, reservation_time, party_size, status)
-    VALUES (%s, %s, %s, %s, 'Pending')
-    """
-    success = execute_insert_update(query, (
-        data['customer_id'],
-        data['table_id'],
-        data['reservation_time'],
-        data['party_size']
-    ))
-    
-    if success:
-        return jsonify({"message": "Reservation created successfully"}), 201
-    else:
+
+    try:
+        # Çoğu çakışma veritabanına gitmeden reddedilir
+        error = _check_slot(table_id, start, party_size)
+        if error:
+            return error
+
+        query = """
+        INSERT INTO RESERVATIONS (customer_id, table_id, reservation_time, party_size, status)
+        VALUES (%s, %s, %s, %s, 'Pending')
+        """
+        with transaction() as cursor:
+            conflicts = availability_index.claim(cursor, table_id, start, party_size)
+            if conflicts:
+                # Henüz yazma yok; kilitler commit ile bırakılır
+                return _conflict_response(conflicts)
+            cursor.execute(query, (
+                customer_id,
+                table_id,
+                start,
+                party_size
+            ))
+            reservation_id = cursor.lastrowid
+            rollups.on_reservation_created(cursor, table_id)
+    except AvailabilityError as e:
+        return _unavailable(e)
+    except mysql.connector.Error:
         return jsonify({"error": "Failed to create reservation"}), 500
 
+    availability_index.reservation_added(reservation_id, table_id, party_size, start)
+    publish('reservations', 'reservation.created', {
+        "reservation_id": reservation_id, "customer_id": customer_id, "table_id": table_id,
+        "reservation_time": start, "party_size": party_size, "status": 'Pending',
+    })
+    return jsonify({"message": "Reservation created successfully", "reservation_id": reservation_id}), 201
+
 @reservations_bp.route('/<int:reservation_id>', methods=['PUT'])
 def update_reservation_status(reservation_id):
     """Update reservation status"""
@@ -105,9 +217,30 @@ def update_reservation_status(reservation_id):
         return jsonify({"error": f"Invalid status. Must be one of: {', '.join(valid_statuses)}"}), 400
     
     query = "UPDATE RESERVATIONS SET status = %s WHERE reservation_id = %s"
-    success = execute_insert_update(query, (data['status'], reservation_id))
-    
-    if success:
-        return jsonify({"message": "Reservation updated successfully"})
-    else:
+    try:
+        with transaction() as cursor:
+            if data['status'] in AVAILABILITY_ACTIVE_STATUSES:
+                # Cancelled/No-Show bir rezervasyon tekrar aktif olursa slot hâlâ boş olmalı
+                cursor.execute(
+                    "SELECT table_id, reservation_time, party_size FROM RESERVATIONS WHERE reservation_id = %s",
+                    (reservation_id,)
+                )
+                row = cursor.fetchone()
+                if row and row['table_id'] is not None:
+                    conflicts = availability_index.claim(
+                        cursor, row['table_id'], row['reservation_time'], row['party_size'] or 1,
+                        reservation_id
+                    )
+                    if conflicts:
+                        return _conflict_response(conflicts)
+            cursor.execute(query, (data['status'], reservation_id))
+            changed = cursor.rowcount
+    except AvailabilityError as e:
+        return _unavailable(e)
+    except mysql.connector.Error:
         return jsonify({"error": "Failed to update reservation"}), 500
+
+    availability_index.refresh_reservation(reservation_id)
+    if changed:   # aynı status tekrar yazıldıysa (0 satır) olay yok
+        publish('reservations', 'reservation.updated', {"reservation_id": reservation_id, "status": data['status']})
+    return jsonify({"message": "Reservation updated successfully"})
@@ -0,0 +1,61 @@
+# Dining Session Routes
+from datetime import datetime
+
+import mysql.connector
+from flask import Blueprint, jsonify, request
+from models import customer_stats
+from models.customer_search import customer_search_index
+from models.database import transaction
+from routes.pagination import parse_local_datetime
+from routes.stream import publish
+
+sessions_bp = Blueprint('sessions', __name__, url_prefix='/api/sessions')
+
+@sessions_bp.route('/<int:session_id>/close', methods=['POST'])
+def close_session(session_id):
+    """
+    Session'ı kapat: end_time = şimdi (veya body'deki end_time).
+    Müşterinin ziyaret sayısı ve son ziyaret tarihi aynı transaction'da güncellenir
+    (LTV siparişlerle zaten güncel).
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        end_time = parse_local_datetime(data['end_time']) if data.get('end_time') else datetime.now()
+    except ValueError:
+        return jsonify({"error": "Geçersiz end_time"}), 400
+
+    try:
+        with transaction() as cursor:
+            # FOR UPDATE: aynı session iki kez kapatılıp ziyaret iki kez sayılmasın
+            cursor.execute("""
+                SELECT session_id, start_time, end_time, total_amount
+                FROM DININGSESSIONS WHERE session_id = %s FOR UPDATE
+            """, (session_id,))
+            session = cursor.fetchone()
+            if not session:
+                return jsonify({"error": "Session bulunamadı"}), 404
+            if session['end_time'] is not None:
+                return jsonify({"error": "Session zaten kapatılmış", "end_time": session['end_time']}), 409
+            if session['start_time'] and end_time < session['start_time']:
+                return jsonify({"error": "end_time session başlangıcından önce olamaz"}), 400
+
+            cursor.execute("UPDATE DININGSESSIONS SET end_time = %s WHERE session_id = %s",
+                           (end_time, session_id))
+            customer = customer_stats.on_session_closed(cursor, session_id)
+    except mysql.connector.Error as e:
+        print(f"Close session error: {e}")
+        return jsonify({"error": "Session kapatılamadı"}), 500
+
+    if customer:
+        customer_search_index.customer_updated(customer)
+    publish('sessions', 'session.closed', {
+        "session_id": session_id, "end_time": end_time, "total_amount": session['total_amount'],
+        "customer_id": customer['customer_id'] if customer else None,
+    })
+    return jsonify({
+        "message": "Session kapatıldı",
+        "session_id": session_id,
+        "end_time": end_time,
+        "total_amount": session['total_amount'],
+        "customer": customer,
+    }), 200
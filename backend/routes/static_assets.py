@@ -0,0 +1,122 @@
+# Frontend Static Assets
+# frontend/ klasörü /app altında servis edilir (http://localhost:5000/app/).
+# Metin dosyaları (html/css/js/svg) process açılırken bir kez okunur ve gzip/brotli ile en
+# yüksek seviyede sıkıştırılır; istek sırasında sıkıştırma yapılmaz.
+# index.html içindeki css/js referanslarına içerik hash'i eklenir (css/style.css?v=1a2b3c4d):
+# hash'li URL'ler 1 yıl immutable cache'lenir, index.html her açılışta ETag ile doğrulanır.
+import hashlib
+import mimetypes
+import os
+import re
+
+from flask import Blueprint, Response, abort, request, send_from_directory
+from config import FRONTEND_DIR, STATIC_MAX_AGE, STATIC_FILE_MAX_AGE, COMPRESS_MIN_SIZE
+from routes.compression import available_encodings, compress, negotiate_encoding
+
+static_bp = Blueprint('static_assets', __name__, url_prefix='/app')
+
+PRECOMPRESS_EXTENSIONS = ('.html', '.css', '.js', '.svg', '.json', '.txt')
+_MAX_LEVEL = {'br': 11, 'gzip': 9}
+_ASSET_REF_RE = re.compile(r'((?:href|src)=")((?:css|js)/[^"?#]+)(")')
+
+mimetypes.add_type('application/javascript', '.js')
+mimetypes.add_type('image/webp', '.webp')
+
+
+class _Asset:
+    __slots__ = ('mimetype', 'data', 'encoded', 'digest')
+
+    def __init__(self, mimetype, data):
+        self.mimetype = mimetype
+        self.data = data
+        self.digest = hashlib.blake2b(data, digest_size=8).hexdigest()
+        self.encoded = {}   # encoding -> sıkıştırılmış gövde
+        if len(data) >= COMPRESS_MIN_SIZE:
+            for encoding in available_encodings():
+                self.encoded[encoding] = compress(data, encoding, _MAX_LEVEL[encoding])
+
+
+class AssetStore:
+    def __init__(self, root):
+        self.root = root
+        self._assets = {}
+
+    def load(self):
+        """Sıkıştırılabilir dosyaları oku ve sıkıştır (process başında bir kez)"""
+        assets = {}
+        if not os.path.isdir(self.root):
+            print(f"Frontend klasörü bulunamadı: {self.root}")
+            return
+        for directory, _, files in os.walk(self.root):
+            for filename in files:
+                if not filename.endswith(PRECOMPRESS_EXTENSIONS):
+                    continue
+                path = os.path.join(directory, filename)
+                name = os.path.relpath(path, self.root).replace(os.sep, '/')
+                with open(path, 'rb') as f:
+                    data = f.read()
+                mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+                assets[name] = _Asset(mimetype, data)
+
+        # index.html en son: css/js referansları içerik hash'leriyle versiyonlanır
+        index = assets.get('index.html')
+        if index is not None:
+            def versioned(match):
+                ref = assets.get(match.group(2))
+                if ref is None:
+                    return match.group(0)
+                return f"{match.group(1)}{match.group(2)}?v={ref.digest}{match.group(3)}"
+
+            html = _ASSET_REF_RE.sub(versioned, index.data.decode('utf-8'))
+            assets['index.html'] = _Asset(index.mimetype, html.encode('utf-8'))
+        self._assets = assets
+
+    def get(self, name):
+        return self._assets.get(name)
+
+    def stats(self):
+        return {
+            "files": len(self._assets),
+            "bytes": sum(len(a.data) for a in self._assets.values()),
+            "encoded_bytes": {
+                encoding: sum(len(a.encoded.get(encoding, a.data)) for a in self._assets.values())
+                for encoding in available_encodings()
+            },
+        }
+
+
+asset_store = AssetStore(os.path.normpath(
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), FRONTEND_DIR)))
+
+
+@static_bp.route('/', defaults={'filename': 'index.html'}, methods=['GET'])
+@static_bp.route('/<path:filename>', methods=['GET'])
+def serve_asset(filename):
+    asset = asset_store.get(filename)
+    if asset is None:
+        # Resimler vb. diskten (send_from_directory path traversal'a izin vermez)
+        if not os.path.isdir(asset_store.root):
+            abort(404)
+        return send_from_directory(asset_store.root, filename, max_age=STATIC_FILE_MAX_AGE)
+
+    if request.args.get('v') == asset.digest:
+        cache_control = f'public, max-age={STATIC_MAX_AGE}, immutable'
+    else:
+        cache_control = 'no-cache'
+
+    encoding = negotiate_encoding(tuple(asset.encoded))
+    if request.if_none_match.contains_weak(asset.digest):
+        response = Response(status=304)
+    else:
+        response = Response(asset.encoded.get(encoding, asset.data), mimetype=asset.mimetype)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.set_etag(asset.digest, weak=encoding is not None)
+    response.headers['Cache-Control'] = cache_control
+    return response
+
+
+def init_static_assets(app):
+    asset_store.load()
+    app.register_blueprint(static_bp)
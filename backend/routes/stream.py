@@ -0,0 +1,69 @@
+# Live Change Feed - Server-Sent Events (models/events.py)
+# GET /api/stream?topics=orders,feedback
+# Ekranlar sipariş/rezervasyon/geri bildirim listelerini polling ile yenilemek yerine buraya
+# bağlanır; yazma yolları commit'ten sonra publish() çağırır ve olay bekleyen tüm bağlantılara
+# hemen gönderilir. Akış veritabanına hiç sorgu atmaz.
+# Bağlantı koptuğunda tarayıcının EventSource'u Last-Event-ID header'ı ile yeniden bağlanır;
+# aradaki olaylar buffer'dan tekrar oynatılır.
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
+from config import EVENT_HEARTBEAT_SECONDS, EVENT_RETRY_MS
+from models.events import TOPICS, StreamFullError, event_bus
+
+stream_bp = Blueprint('stream', __name__, url_prefix='/api/stream')
+
+
+def publish(topic, event_type, data):
+    """Commit edilmiş bir yazmayı aboneler için yayınla (yanıt döndürülmeden önce çağrılır)"""
+    event_bus.publish(topic, event_type, data, current_app.json.dumps)
+
+
+def _parse_topics():
+    raw = request.args.get('topics')
+    if not raw:
+        return TOPICS
+    topics = [t.strip() for t in raw.split(',') if t.strip()]
+    unknown = [t for t in topics if t not in TOPICS]
+    if unknown:
+        return None
+    return topics
+
+
+@stream_bp.route('', methods=['GET'])
+def stream_events():
+    """
+    text/event-stream. Query: topics (virgülle; varsayılan hepsi),
+    last_event_id (Last-Event-ID header'ı gönderemeyen istemciler için).
+    """
+    topics = _parse_topics()
+    if topics is None:
+        return jsonify({"error": f"Geçersiz topics. Seçenekler: {', '.join(TOPICS)}"}), 400
+    # Id yoksa akış bu andan başlar (generate() ilk okunana kadar gelen olaylar da gönderilir)
+    last_event_id = (request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+                     or event_bus.last_event_id())
+    try:
+        event_bus.check_capacity()
+    except StreamFullError as e:
+        print(f"Stream subscriber limit: {e}")
+        return jsonify({"error": "Çok fazla canlı bağlantı, daha sonra tekrar deneyin"}), 503
+
+    def generate():
+        # Abonelik gövde okunmaya başlayınca açılır: yanıt hiç gönderilmezse (HEAD, sonraki bir
+        # after_request hook'unda hata) generator başlamaz ve kapatılacak abonelik de olmaz
+        try:
+            subscription = event_bus.subscribe(topics, last_event_id)
+        except StreamFullError as e:
+            print(f"Stream subscriber limit: {e}")
+            return
+        try:
+            yield f"retry: {EVENT_RETRY_MS}\n\n"
+            while True:
+                frames = subscription.wait(EVENT_HEARTBEAT_SECONDS)
+                # Yorum satırı: proxy'lerin boşta bağlantıyı kapatmasını engeller
+                yield "".join(frames) if frames else ": keepalive\n\n"
+        finally:
+            subscription.close()
+
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'   # nginx: olayları bekletmeden ilet
+    return response
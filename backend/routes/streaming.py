@@ -0,0 +1,72 @@
+# NDJSON Streaming Helpers
+# Büyük sonuçları tek JSON string yerine satır satır (application/x-ndjson) gönderir
+# ?format=columnar: JSON yanıtlar {columns: [...], rows: [[...]]} olarak döner; her satırda
+# tekrarlanan key'ler olmadığı için büyük listelerde payload belirgin şekilde küçülür
+import itertools
+
+import mysql.connector
+from flask import Response, current_app, jsonify, request, stream_with_context
+from models.database import execute_query, stream_query
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+
+def wants_stream():
+    """?stream=1 veya Accept: application/x-ndjson ile streaming modu seçilir"""
+    if request.args.get('stream', '').lower() in ('1', 'true', 'yes'):
+        return True
+    best = request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE])
+    return best == NDJSON_MIMETYPE
+
+
+def wants_columnar():
+    return request.args.get('format', '').lower() == 'columnar'
+
+
+def to_columnar(rows):
+    """[{a: 1, b: 2}, ...] -> {columns: [a, b], rows: [[1, 2], ...]}"""
+    columns = list(rows[0]) if rows else []
+    return {"columns": columns, "rows": [list(row.values()) for row in rows]}
+
+
+def rows_json(rows):
+    """Satır listesini JSON yanıtı yap (?format=columnar destekli)"""
+    rows = rows if rows is not None else []
+    return jsonify(to_columnar(rows) if wants_columnar() else rows)
+
+
+def stream_rows(query, params=None):
+    """Sorgu sonucunu NDJSON olarak stream et (her satır ayrı bir JSON objesi)"""
+    batches = stream_query(query, params)
+    try:
+        # İlk batch'i hemen oku: bağlantı/SQL hataları stream başlamadan 500 olarak dönsün
+        first = next(batches, None)
+    except mysql.connector.Error:
+        return jsonify({"error": "Query failed"}), 500
+
+    def generate():
+        dumps = current_app.json.dumps
+        try:
+            for rows in itertools.chain([first] if first else [], batches):
+                yield "".join(dumps(row) + "\n" for row in rows)
+        except mysql.connector.Error:
+            # Header'lar gönderildi; hatayı son satır olarak bildir
+            yield dumps({"error": "Stream interrupted"}) + "\n"
+        finally:
+            # İstemci erken koparsa bağlantı hemen havuza döner
+            batches.close()
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
+
+
+def rows_response(query, params=None):
+    """Streaming isteniyorsa NDJSON, değilse normal JSON array döndür"""
+    if wants_stream():
+        return stream_rows(query, params)
+    return rows_json(execute_query(query, params))
+
+
+def ndjson_response(rows):
+    """Bellekteki satırları NDJSON olarak döndür (ör. önceden hesaplanmış raporlar)"""
+    dumps = current_app.json.dumps
+    return Response("".join(dumps(row) + "\n" for row in rows), mimetype=NDJSON_MIMETYPE)
@@ -12,8 +12,10 @@ CREATE TABLE CUSTOMERS (
     full_name VARCHAR(100) NOT NULL,
     phone VARCHAR(20),
     email VARCHAR(100),
-    total_ltv DECIMAL(10, 2) DEFAULT 0.00,
-    vip_status BOOLEAN DEFAULT FALSE
+    total_ltv DECIMAL(10, 2) NOT NULL DEFAULT 0.00,
+    vip_status BOOLEAN NOT NULL DEFAULT FALSE,
+    visit_count INT NOT NULL DEFAULT 0,
+    last_visit DATETIME NULL
 );
 
 CREATE TABLE DIETARYRESTRICTIONS (
@@ -117,6 +119,91 @@ CREATE TABLE FEEDBACK (
     FOREIGN KEY (session_id) REFERENCES DININGSESSIONS(session_id) ON DELETE CASCADE
 );
 
+-- ---------------------------------------------------------
+-- SECONDARY INDEXES (database/migrations/001_query_indexes.sql)
+-- ---------------------------------------------------------
+
+CREATE INDEX idx_customers_vip_ltv ON CUSTOMERS (vip_status, total_ltv);
+CREATE INDEX idx_customers_ltv ON CUSTOMERS (total_ltv);
+CREATE INDEX idx_reservations_time ON RESERVATIONS (reservation_time);
+CREATE INDEX idx_reservations_status_time ON RESERVATIONS (status, reservation_time);
+CREATE INDEX idx_reservations_customer_time ON RESERVATIONS (customer_id, reservation_time);
+CREATE INDEX idx_reservations_table_time ON RESERVATIONS (table_id, reservation_time);
+CREATE INDEX idx_sessions_start_time ON DININGSESSIONS (start_time);
+CREATE INDEX idx_orders_order_time ON ORDERS (order_time);
+
+-- database/migrations/002_feedback_search.sql
+ALTER TABLE FEEDBACK ADD FULLTEXT INDEX ft_feedback_comment (comment);
+
+-- Bu dosya tüm migration'ları içerir; `flask --app app migrate` sadece yenilerini uygular
+CREATE TABLE SCHEMA_MIGRATIONS (
+    version VARCHAR(10) PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO SCHEMA_MIGRATIONS (version, name) VALUES
+('001', 'query_indexes'),
+('002', 'feedback_search'),
+('003', 'customer_visit_stats'),
+('004', 'report_rollups');
+
+CREATE TABLE JOB_CHECKPOINTS (
+    job VARCHAR(50) PRIMARY KEY,
+    last_id INT NOT NULL,
+    started_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+-- ---------------------------------------------------------
+-- REPORT ROLLUP TABLES (backend/models/rollups.py)
+-- Mevcut veritabanlarında migrations/002 ve 004 ile oluşturulur.
+-- Backend yazma yolları bu özetleri artımlı günceller;
+-- tam yeniden hesaplama: cd backend && flask --app app rebuild-rollups
+-- ---------------------------------------------------------
+
+CREATE TABLE ROLLUP_DAILY_REVENUE (
+    day DATE PRIMARY KEY,
+    total_sessions INT NOT NULL DEFAULT 0,
+    daily_revenue DECIMAL(14, 2) NOT NULL DEFAULT 0.00
+);
+
+CREATE TABLE ROLLUP_ITEM_SALES (
+    item_id INT PRIMARY KEY,
+    total_quantity INT NOT NULL DEFAULT 0,
+    order_count INT NOT NULL DEFAULT 0,
+    FOREIGN KEY (item_id) REFERENCES MENUITEMS(item_id) ON DELETE CASCADE
+);
+
+CREATE TABLE ROLLUP_STAFF_SALES (
+    staff_id INT PRIMARY KEY,
+    total_orders INT NOT NULL DEFAULT 0,
+    total_revenue DECIMAL(14, 2) NOT NULL DEFAULT 0.00,
+    FOREIGN KEY (staff_id) REFERENCES STAFF(staff_id) ON DELETE CASCADE
+);
+
+CREATE TABLE ROLLUP_TABLE_STATS (
+    table_id INT PRIMARY KEY,
+    total_bookings INT NOT NULL DEFAULT 0,
+    completed_sessions INT NOT NULL DEFAULT 0,
+    total_revenue DECIMAL(14, 2) NOT NULL DEFAULT 0.00,
+    FOREIGN KEY (table_id) REFERENCES TABLES(table_id) ON DELETE CASCADE
+);
+
+CREATE TABLE ROLLUP_FEEDBACK_RATINGS (
+    dimension VARCHAR(8) NOT NULL,
+    dimension_id INT NOT NULL,
+    day DATE NOT NULL,
+    feedback_count INT NOT NULL DEFAULT 0,
+    rating_sum INT NOT NULL DEFAULT 0,
+    one_star INT NOT NULL DEFAULT 0,
+    two_star INT NOT NULL DEFAULT 0,
+    three_star INT NOT NULL DEFAULT 0,
+    four_star INT NOT NULL DEFAULT 0,
+    five_star INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (dimension, dimension_id, day)
+);
+
 -- ---------------------------------------------------------
 -- DATA INSERTS
 -- ---------------------------------------------------------
@@ -811,4 +898,70 @@ INSERT INTO FEEDBACK (session_id, rating, comment) VALUES
 (49, 4, 'Nice lunch break. Fresh salads and quick service. - Ava'),
 (50, 4, 'Good food, nice atmosphere. Would recommend for casual dinners. - Ethan');
 
+-- ---------------------------------------------------------
+-- ROLLUP BACKFILL (seed verisinden özetleri doldur)
+-- ---------------------------------------------------------
 
+INSERT INTO ROLLUP_DAILY_REVENUE (day, total_sessions, daily_revenue)
+SELECT DATE(ds.start_time), COUNT(*), COALESCE(SUM(ds.total_amount), 0)
+FROM DININGSESSIONS ds
+WHERE ds.start_time IS NOT NULL
+GROUP BY DATE(ds.start_time);
+
+INSERT INTO ROLLUP_ITEM_SALES (item_id, total_quantity, order_count)
+SELECT od.item_id, COALESCE(SUM(od.quantity), 0), COUNT(DISTINCT od.order_id)
+FROM ORDERDETAILS od
+WHERE od.item_id IS NOT NULL AND od.order_id IS NOT NULL
+GROUP BY od.item_id;
+
+INSERT INTO ROLLUP_STAFF_SALES (staff_id, total_orders, total_revenue)
+SELECT o.staff_id, COUNT(*), COALESCE(SUM(ds.total_amount), 0)
+FROM ORDERS o
+LEFT JOIN DININGSESSIONS ds ON o.session_id = ds.session_id
+WHERE o.staff_id IS NOT NULL
+GROUP BY o.staff_id;
+
+INSERT INTO ROLLUP_TABLE_STATS (table_id, total_bookings, completed_sessions, total_revenue)
+SELECT r.table_id, COUNT(DISTINCT r.reservation_id), COUNT(ds.session_id),
+       COALESCE(SUM(ds.total_amount), 0)
+FROM RESERVATIONS r
+LEFT JOIN DININGSESSIONS ds ON r.reservation_id = ds.reservation_id
+WHERE r.table_id IS NOT NULL
+GROUP BY r.table_id;
+
+INSERT INTO ROLLUP_FEEDBACK_RATINGS (dimension, dimension_id, day, feedback_count, rating_sum,
+                                     one_star, two_star, three_star, four_star, five_star)
+SELECT b.dimension, b.dimension_id, b.day, COUNT(*), SUM(b.rating),
+       SUM(b.rating = 1), SUM(b.rating = 2), SUM(b.rating = 3), SUM(b.rating = 4), SUM(b.rating = 5)
+FROM (
+    SELECT 'all' AS dimension, 0 AS dimension_id, DATE(ds.start_time) AS day, f.rating
+    FROM FEEDBACK f
+    JOIN DININGSESSIONS ds ON f.session_id = ds.session_id
+    WHERE f.rating IS NOT NULL AND ds.start_time IS NOT NULL
+    UNION ALL
+    SELECT 'table', r.table_id, DATE(ds.start_time), f.rating
+    FROM FEEDBACK f
+    JOIN DININGSESSIONS ds ON f.session_id = ds.session_id
+    JOIN RESERVATIONS r ON ds.reservation_id = r.reservation_id
+    WHERE f.rating IS NOT NULL AND ds.start_time IS NOT NULL AND r.table_id IS NOT NULL
+    UNION ALL
+    SELECT 'staff', s.staff_id, DATE(ds.start_time), f.rating
+    FROM FEEDBACK f
+    JOIN DININGSESSIONS ds ON f.session_id = ds.session_id
+    JOIN STAFF s ON EXISTS (SELECT 1 FROM ORDERS o
+                            WHERE o.session_id = f.session_id AND o.staff_id = s.staff_id)
+    WHERE f.rating IS NOT NULL AND ds.start_time IS NOT NULL
+) b
+GROUP BY b.dimension, b.dimension_id, b.day;
+
+-- Ziyaret istatistikleri (seed LTV değerleri korunur)
+UPDATE CUSTOMERS c
+JOIN (
+    SELECT r.customer_id, COUNT(ds.end_time) AS visits,
+           MAX(CASE WHEN ds.end_time IS NOT NULL THEN ds.start_time END) AS last_visit
+    FROM RESERVATIONS r
+    JOIN DININGSESSIONS ds ON ds.reservation_id = r.reservation_id
+    GROUP BY r.customer_id
+) x ON x.customer_id = c.customer_id
+SET c.visit_count = x.visits,
+    c.last_visit = x.last_visit;
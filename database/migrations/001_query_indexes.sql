@@ -0,0 +1,28 @@
+-- 001: Indexes for the queries in backend/routes/
+-- Uygula: cd backend && flask --app app migrate
+
+-- Liste sıralaması için NOT NULL (COALESCE'siz sıralama index kullanabilsin)
+UPDATE CUSTOMERS SET vip_status = FALSE WHERE vip_status IS NULL;
+UPDATE CUSTOMERS SET total_ltv = 0.00 WHERE total_ltv IS NULL;
+ALTER TABLE CUSTOMERS
+    MODIFY total_ltv DECIMAL(10, 2) NOT NULL DEFAULT 0.00,
+    MODIFY vip_status BOOLEAN NOT NULL DEFAULT FALSE;
+
+-- GET /customers (vip_status DESC, total_ltv DESC), /customers/vip
+CREATE INDEX idx_customers_vip_ltv ON CUSTOMERS (vip_status, total_ltv);
+-- /reports/top-customer-orders alt sorgusu, /reports/customer-classification
+CREATE INDEX idx_customers_ltv ON CUSTOMERS (total_ltv);
+
+-- GET /reservations (reservation_time DESC) + from/to
+CREATE INDEX idx_reservations_time ON RESERVATIONS (reservation_time);
+-- /reservations/pending, /reservations/confirmed, ?status=
+CREATE INDEX idx_reservations_status_time ON RESERVATIONS (status, reservation_time);
+-- ?customer_id= ve ?table_id= filtreleri (FK index'lerinin yerini alır)
+CREATE INDEX idx_reservations_customer_time ON RESERVATIONS (customer_id, reservation_time);
+CREATE INDEX idx_reservations_table_time ON RESERVATIONS (table_id, reservation_time);
+
+-- GET /feedback (start_time DESC), /reports/peak-day-sessions
+CREATE INDEX idx_sessions_start_time ON DININGSESSIONS (start_time);
+
+-- GET /orders (order_time DESC) + date/from/to
+CREATE INDEX idx_orders_order_time ON ORDERS (order_time);
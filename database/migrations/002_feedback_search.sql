@@ -0,0 +1,47 @@
+-- 002: Feedback keyword search + pre-bucketed rating counters
+-- Uygula: cd backend && flask --app app migrate
+
+-- GET /feedback/search (MATCH ... AGAINST ... IN BOOLEAN MODE)
+ALTER TABLE FEEDBACK ADD FULLTEXT INDEX ft_feedback_comment (comment);
+
+-- GET /feedback/rating-summary, /feedback/ratings (backend/models/rollups.py)
+CREATE TABLE IF NOT EXISTS ROLLUP_FEEDBACK_RATINGS (
+    dimension VARCHAR(8) NOT NULL,
+    dimension_id INT NOT NULL,
+    day DATE NOT NULL,
+    feedback_count INT NOT NULL DEFAULT 0,
+    rating_sum INT NOT NULL DEFAULT 0,
+    one_star INT NOT NULL DEFAULT 0,
+    two_star INT NOT NULL DEFAULT 0,
+    three_star INT NOT NULL DEFAULT 0,
+    four_star INT NOT NULL DEFAULT 0,
+    five_star INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (dimension, dimension_id, day)
+);
+
+-- Mevcut feedback'ten doldur (sonrasında yazma yolları artımlı günceller)
+DELETE FROM ROLLUP_FEEDBACK_RATINGS;
+INSERT INTO ROLLUP_FEEDBACK_RATINGS (dimension, dimension_id, day, feedback_count, rating_sum,
+                                     one_star, two_star, three_star, four_star, five_star)
+SELECT b.dimension, b.dimension_id, b.day, COUNT(*), SUM(b.rating),
+       SUM(b.rating = 1), SUM(b.rating = 2), SUM(b.rating = 3), SUM(b.rating = 4), SUM(b.rating = 5)
+FROM (
+    SELECT 'all' AS dimension, 0 AS dimension_id, DATE(ds.start_time) AS day, f.rating
+    FROM FEEDBACK f
+    JOIN DININGSESSIONS ds ON f.session_id = ds.session_id
+    WHERE f.rating IS NOT NULL AND ds.start_time IS NOT NULL
+    UNION ALL
+    SELECT 'table', r.table_id, DATE(ds.start_time), f.rating
+    FROM FEEDBACK f
+    JOIN DININGSESSIONS ds ON f.session_id = ds.session_id
+    JOIN RESERVATIONS r ON ds.reservation_id = r.reservation_id
+    WHERE f.rating IS NOT NULL AND ds.start_time IS NOT NULL AND r.table_id IS NOT NULL
+    UNION ALL
+    SELECT 'staff', s.staff_id, DATE(ds.start_time), f.rating
+    FROM FEEDBACK f
+    JOIN DININGSESSIONS ds ON f.session_id = ds.session_id
+    JOIN STAFF s ON EXISTS (SELECT 1 FROM ORDERS o
+                            WHERE o.session_id = f.session_id AND o.staff_id = s.staff_id)
+    WHERE f.rating IS NOT NULL AND ds.start_time IS NOT NULL
+) b
+GROUP BY b.dimension, b.dimension_id, b.day;
@@ -0,0 +1,28 @@
+-- 003: Customer visit stats (backend/models/customer_stats.py)
+-- Uygula: cd backend && flask --app app migrate
+
+-- Kapanmış session sayısı ve son ziyaret; yazma yolları artımlı günceller
+ALTER TABLE CUSTOMERS
+    ADD COLUMN visit_count INT NOT NULL DEFAULT 0,
+    ADD COLUMN last_visit DATETIME NULL;
+
+-- Yarıda kalan toplu işlerin kaldığı yer (flask recompute-customer-stats)
+CREATE TABLE IF NOT EXISTS JOB_CHECKPOINTS (
+    job VARCHAR(50) PRIMARY KEY,
+    last_id INT NOT NULL,
+    started_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+-- Mevcut session'lardan bir kerelik doldur. total_ltv'ye dokunulmaz;
+-- session'lardan yeniden hesaplamak için: flask --app app recompute-customer-stats
+UPDATE CUSTOMERS c
+JOIN (
+    SELECT r.customer_id, COUNT(ds.end_time) AS visits,
+           MAX(CASE WHEN ds.end_time IS NOT NULL THEN ds.start_time END) AS last_visit
+    FROM RESERVATIONS r
+    JOIN DININGSESSIONS ds ON ds.reservation_id = r.reservation_id
+    GROUP BY r.customer_id
+) x ON x.customer_id = c.customer_id
+SET c.visit_count = x.visits,
+    c.last_visit = x.last_visit;
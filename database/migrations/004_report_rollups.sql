@@ -0,0 +1,69 @@
+-- 004: Report rollup tables (backend/models/rollups.py)
+-- Uygula: cd backend && flask --app app migrate
+-- Sipariş, rezervasyon ve müşteri silme yolları bu tablolara aynı transaction'da yazar;
+-- tablolar yoksa bu yazmalar hata verir. Daha önce rebuild-rollups çalıştırılmış
+-- veritabanlarında tablolar korunur ve özetler yeniden hesaplanır.
+
+-- /reports/daily-revenue
+CREATE TABLE IF NOT EXISTS ROLLUP_DAILY_REVENUE (
+    day DATE PRIMARY KEY,
+    total_sessions INT NOT NULL DEFAULT 0,
+    daily_revenue DECIMAL(14, 2) NOT NULL DEFAULT 0.00
+);
+
+-- /reports/top-menu-items
+CREATE TABLE IF NOT EXISTS ROLLUP_ITEM_SALES (
+    item_id INT PRIMARY KEY,
+    total_quantity INT NOT NULL DEFAULT 0,
+    order_count INT NOT NULL DEFAULT 0,
+    FOREIGN KEY (item_id) REFERENCES MENUITEMS(item_id) ON DELETE CASCADE
+);
+
+-- /reports/staff-performance
+CREATE TABLE IF NOT EXISTS ROLLUP_STAFF_SALES (
+    staff_id INT PRIMARY KEY,
+    total_orders INT NOT NULL DEFAULT 0,
+    total_revenue DECIMAL(14, 2) NOT NULL DEFAULT 0.00,
+    FOREIGN KEY (staff_id) REFERENCES STAFF(staff_id) ON DELETE CASCADE
+);
+
+-- /reports/table-performance
+CREATE TABLE IF NOT EXISTS ROLLUP_TABLE_STATS (
+    table_id INT PRIMARY KEY,
+    total_bookings INT NOT NULL DEFAULT 0,
+    completed_sessions INT NOT NULL DEFAULT 0,
+    total_revenue DECIMAL(14, 2) NOT NULL DEFAULT 0.00,
+    FOREIGN KEY (table_id) REFERENCES TABLES(table_id) ON DELETE CASCADE
+);
+
+-- Mevcut veriden doldur (sonrasında yazma yolları artımlı günceller)
+DELETE FROM ROLLUP_DAILY_REVENUE;
+INSERT INTO ROLLUP_DAILY_REVENUE (day, total_sessions, daily_revenue)
+SELECT DATE(ds.start_time), COUNT(*), COALESCE(SUM(ds.total_amount), 0)
+FROM DININGSESSIONS ds
+WHERE ds.start_time IS NOT NULL
+GROUP BY DATE(ds.start_time);
+
+DELETE FROM ROLLUP_ITEM_SALES;
+INSERT INTO ROLLUP_ITEM_SALES (item_id, total_quantity, order_count)
+SELECT od.item_id, COALESCE(SUM(od.quantity), 0), COUNT(DISTINCT od.order_id)
+FROM ORDERDETAILS od
+WHERE od.item_id IS NOT NULL AND od.order_id IS NOT NULL
+GROUP BY od.item_id;
+
+DELETE FROM ROLLUP_STAFF_SALES;
+INSERT INTO ROLLUP_STAFF_SALES (staff_id, total_orders, total_revenue)
+SELECT o.staff_id, COUNT(*), COALESCE(SUM(ds.total_amount), 0)
+FROM ORDERS o
+LEFT JOIN DININGSESSIONS ds ON o.session_id = ds.session_id
+WHERE o.staff_id IS NOT NULL
+GROUP BY o.staff_id;
+
+DELETE FROM ROLLUP_TABLE_STATS;
+INSERT INTO ROLLUP_TABLE_STATS (table_id, total_bookings, completed_sessions, total_revenue)
+SELECT r.table_id, COUNT(DISTINCT r.reservation_id), COUNT(ds.session_id),
+       COALESCE(SUM(ds.total_amount), 0)
+FROM RESERVATIONS r
+LEFT JOIN DININGSESSIONS ds ON r.reservation_id = ds.reservation_id
+WHERE r.table_id IS NOT NULL
+GROUP BY r.table_id;
@@ -15,14 +15,22 @@ let allOrders = [];
 let allMenuItems = [];
 let notifications = [];
 
+// Resim varyantları (GET /api/images): küçük WebP'ler + srcset. Manifest yoksa orijinaller kullanılır.
+let imageManifest = {};
+const imageManifestReady = fetch(`${API_BASE}/images`)
+    .then(response => response.ok ? response.json() : {})
+    .then(manifest => { imageManifest = manifest; })
+    .catch(() => {});
+
 // =====================================================
 // INITIALIZATION
 // =====================================================
-document.addEventListener('DOMContentLoaded', () => {
+document.addEventListener('DOMContentLoaded', async () => {
     initNavigation();
     initSidebar();
     initModals();
     initRatingInput();
+    await imageManifestReady;
     loadDashboard();
     loadNotifications();
     
@@ -395,15 +403,15 @@ function initSidebar() {
 // =====================================================
 async function loadDashboard() {
     try {
-        // Load all dashboard data in parallel
-        const [customers, reservations, orders, feedback, vipCustomers, pendingRes] = await Promise.all([
-            fetchAPI('/customers'),
-            fetchAPI('/reservations'),
-            fetchAPI('/orders'),
-            fetchAPI('/feedback/rating-summary'),
-            fetchAPI('/customers/vip'),
-            fetchAPI('/reservations/pending')
-        ]);
+        // Load all dashboard data in one request (widgets run in parallel on the server)
+        const dashboard = await fetchAPI('/dashboard?widgets=customers,reservations,orders,rating_summary,vip_customers,pending_reservations');
+        const widgets = dashboard?.widgets || {};
+        const customers = widgets.customers;
+        const reservations = widgets.reservations;
+        const orders = widgets.orders;
+        const feedback = widgets.rating_summary;
+        const vipCustomers = widgets.vip_customers;
+        const pendingRes = widgets.pending_reservations;
         
         // Store globally
         allCustomers = customers || [];
@@ -475,7 +483,7 @@ function renderVipCustomers(customers) {
         <div class="list-item">
             <div class="list-item-info">
                 ${photoUrl 
-                    ? `<img src="${photoUrl}" alt="${customer.full_name}" class="customer-photo" onerror="this.style.display='none'; this.nextElementSibling.style.display='flex'"><div class="list-item-avatar" style="display:none">${getInitials(customer.full_name)}</div>`
+                    ? `<img ${imageAttrs(photoUrl, '40px', 'thumb')} alt="${customer.full_name}" class="customer-photo" onerror="this.style.display='none'; this.nextElementSibling.style.display='flex'"><div class="list-item-avatar" style="display:none">${getInitials(customer.full_name)}</div>`
                     : `<div class="list-item-avatar">${getInitials(customer.full_name)}</div>`
                 }
                 <div class="list-item-text">
@@ -528,7 +536,7 @@ function renderPendingReservations(reservations) {
         <div class="list-item">
             <div class="list-item-info">
                 ${photoUrl 
-                    ? `<img src="${photoUrl}" alt="${res.full_name}" class="customer-photo" onerror="this.style.display='none'; this.nextElementSibling.style.display='flex'"><div class="list-item-avatar" style="display:none">${getInitials(res.full_name)}</div>`
+                    ? `<img ${imageAttrs(photoUrl, '40px', 'thumb')} alt="${res.full_name}" class="customer-photo" onerror="this.style.display='none'; this.nextElementSibling.style.display='flex'"><div class="list-item-avatar" style="display:none">${getInitials(res.full_name)}</div>`
                     : `<div class="list-item-avatar">${getInitials(res.full_name)}</div>`
                 }
                 <div class="list-item-text">
@@ -572,7 +580,7 @@ function renderMenuTable(items) {
         return `
             <div class="menu-card" onclick="showMenuItemImage('${item.Yemek}', '${imageUrl}', '${item.Kategori}', '${formatCurrency(item.Fiyat)}')">
                 <div class="menu-card-image">
-                    <img src="${imageUrl}" alt="${item.Yemek}" onerror="this.src='https://images.unsplash.com/photo-1546069901-ba9599a7e63c?w=400&h=300&fit=crop'">
+                    <img ${imageAttrs(imageUrl, '(max-width: 768px) 100vw, 320px')} alt="${item.Yemek}" onerror="this.src='https://images.unsplash.com/photo-1546069901-ba9599a7e63c?w=400&h=300&fit=crop'">
                     <span class="menu-card-category">${item.Kategori}</span>
                 </div>
                 <div class="menu-card-content">
@@ -600,7 +608,7 @@ function showMenuItemImage(yemekAdi, imageUrl, kategori, fiyat) {
         <div class="table-image-overlay" onclick="closeMenuImageModal()"></div>
         <div class="table-image-content menu-image-content">
             <button class="table-image-close" onclick="closeMenuImageModal()">&times;</button>
-            <img src="${imageUrl}" alt="${yemekAdi}" class="table-image-img" onerror="this.src='https://images.unsplash.com/photo-1546069901-ba9599a7e63c?w=400&h=300&fit=crop'">
+            <img src="${imageVariant(imageUrl, 'full')}" alt="${yemekAdi}" class="table-image-img" onerror="this.src='https://images.unsplash.com/photo-1546069901-ba9599a7e63c?w=400&h=300&fit=crop'">
             <div class="menu-image-info">
                 <h3>${yemekAdi}</h3>
                 <span class="menu-image-category">${kategori}</span>
@@ -739,7 +747,7 @@ function renderCustomersTable(customers) {
             <td>
                 <div style="display: flex; align-items: center; gap: 12px;">
                     ${photoUrl 
-                        ? `<img src="${photoUrl}" alt="${c.full_name}" class="customer-photo" onerror="this.style.display='none'; this.nextElementSibling.style.display='flex'"><div class="list-item-avatar" style="display:none">${getInitials(c.full_name)}</div>`
+                        ? `<img ${imageAttrs(photoUrl, '40px', 'thumb')} alt="${c.full_name}" class="customer-photo" onerror="this.style.display='none'; this.nextElementSibling.style.display='flex'"><div class="list-item-avatar" style="display:none">${getInitials(c.full_name)}</div>`
                         : `<div class="list-item-avatar">${getInitials(c.full_name)}</div>`
                     }
                     <strong>${c.full_name}</strong>
@@ -1108,7 +1116,7 @@ function renderTablesGrid(tables) {
     container.innerHTML = tables.map(t => {
         const bgImage = getTableBackgroundImage(t.location_zone);
         return `
-        <div class="table-card" onclick="showTableImage('${t.location_zone}', '${bgImage}')" style="background-image: linear-gradient(rgba(0,0,0,0.3), rgba(0,0,0,0.4)), url('${bgImage}'); background-size: cover; background-position: center; cursor: pointer;">
+        <div class="table-card" onclick="showTableImage('${t.location_zone}', '${bgImage}')" style="background-image: linear-gradient(rgba(0,0,0,0.3), rgba(0,0,0,0.4)), url('${imageVariant(bgImage, 'card')}'); background-size: cover; background-position: center; cursor: pointer;">
             <div class="table-card-header">
                 <h4>Masa ${t.table_id}</h4>
                 <span class="status-badge ${t.completed_sessions > 0 ? 'active' : 'pending'}">
@@ -1155,7 +1163,7 @@ function showTableImage(locationZone, imageUrl) {
         <div class="table-image-content">
             <button class="table-image-close" onclick="closeTableImageModal()">&times;</button>
             <h3 class="table-image-title">${locationZone}</h3>
-            <img src="${imageUrl}" alt="${locationZone}" class="table-image-img">
+            <img src="${imageVariant(imageUrl, 'full')}" alt="${locationZone}" class="table-image-img">
         </div>
     `;
     document.body.appendChild(modal);
@@ -1307,7 +1315,7 @@ async function loadReport(reportType) {
                     <td>Masa ${item.table_id || 'N/A'}</td>
                     <td>${item.party_size || '-'}</td>
                     <td><strong>${formatCurrency(item.total_amount)}</strong></td>
-                    <td>${item.start_time ? new Date(item.start_time).toLocaleTimeString('tr-TR', {hour: '2-digit', minute: '2-digit'}) : 'N/A'}</td>
+                    <td>${item.start_time ? parseDate(item.start_time).toLocaleTimeString('tr-TR', {hour: '2-digit', minute: '2-digit'}) : 'N/A'}</td>
                     <td>${item.order_count}</td>
                 </tr>
             `
@@ -1447,7 +1455,7 @@ function renderFeedbackGrid(feedbacks) {
             <div class="feedback-card-header">
                 <div class="feedback-user">
                     ${photoUrl 
-                        ? `<img src="${photoUrl}" alt="${fb.full_name}" class="customer-photo feedback-photo" onerror="this.style.display='none'; this.nextElementSibling.style.display='flex'"><div class="feedback-avatar" style="display:none">${getInitials(fb.full_name)}</div>`
+                        ? `<img ${imageAttrs(photoUrl, '48px', 'thumb')} alt="${fb.full_name}" class="customer-photo feedback-photo" onerror="this.style.display='none'; this.nextElementSibling.style.display='flex'"><div class="feedback-avatar" style="display:none">${getInitials(fb.full_name)}</div>`
                         : `<div class="feedback-avatar">${getInitials(fb.full_name)}</div>`
                     }
                     <div class="feedback-user-info">
@@ -1629,14 +1637,22 @@ function formatCurrency(amount) {
     }).format(num);
 }
 
+// API tarihleri ISO 8601 ("2025-12-15" veya "2025-12-15T19:30:00", sunucu saati).
+// Sadece tarih olan string'ler new Date() ile UTC kabul edilir; yerel gün olarak parse et.
+function parseDate(dateStr) {
+    const match = /^(\d{4})-(\d{2})-(\d{2})$/.exec(dateStr);
+    if (match) return new Date(+match[1], +match[2] - 1, +match[3]);
+    return new Date(dateStr);
+}
+
 function formatDate(dateStr) {
     if (!dateStr) return '-';
-    return new Date(dateStr).toLocaleDateString('tr-TR');
+    return parseDate(dateStr).toLocaleDateString('tr-TR');
 }
 
 function formatDateTime(dateStr) {
     if (!dateStr) return '-';
-    return new Date(dateStr).toLocaleString('tr-TR', {
+    return parseDate(dateStr).toLocaleString('tr-TR', {
         day: '2-digit',
         month: '2-digit',
         year: 'numeric',
@@ -1645,6 +1661,18 @@ function formatDateTime(dateStr) {
     });
 }
 
+// images/... yolu için varyant URL'i (manifest'te yoksa yolun kendisi)
+function imageVariant(path, variant) {
+    return imageManifest[path]?.variants[variant] || path;
+}
+
+// <img> için src + srcset + sizes; tarayıcı ekran boyutuna uygun varyantı seçer
+function imageAttrs(path, sizes, variant = 'card') {
+    const entry = imageManifest[path];
+    if (!entry) return `src="${path}" loading="lazy"`;
+    return `src="${entry.variants[variant]}" srcset="${entry.srcset}" sizes="${sizes}" loading="lazy" decoding="async"`;
+}
+
 function getInitials(name) {
     if (!name) return '?';
     return name.split(' ').map(n => n[0]).join('').toUpperCase().slice(0, 2);